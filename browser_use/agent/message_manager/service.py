@@ -7,6 +7,7 @@ from browser_use.agent.message_manager.views import (
 	HistoryItem,
 )
 from browser_use.agent.prompts import AgentMessagePrompt
+from browser_use.agent.screenshot_diff import UNCHANGED_SCREENSHOT_REGION, screenshots_look_same
 from browser_use.agent.views import (
 	ActionResult,
 	AgentHistoryList,
@@ -22,7 +23,7 @@ from browser_use.llm.messages import (
 	SystemMessage,
 )
 from browser_use.observability import observe_debug
-from browser_use.utils import match_url_with_domain_pattern, time_execution_sync
+from browser_use.utils import get_domain_pattern_matcher, time_execution_sync
 
 logger = logging.getLogger(__name__)
 
@@ -106,6 +107,7 @@ class MessageManager:
 		sensitive_data: dict[str, str | dict[str, str]] | None = None,
 		max_history_items: int | None = None,
 		images_per_step: int = 1,
+		unchanged_screenshots: Literal['send', 'reuse', 'omit'] = 'send',
 		include_tool_call_examples: bool = False,
 	):
 		self.task = task
@@ -116,6 +118,7 @@ class MessageManager:
 		self.use_thinking = use_thinking
 		self.max_history_items = max_history_items
 		self.images_per_step = images_per_step
+		self.unchanged_screenshots = unchanged_screenshots
 		self.include_tool_call_examples = include_tool_call_examples
 
 		assert max_history_items is None or max_history_items > 5, 'max_history_items must be None or greater than 5'
@@ -228,10 +231,13 @@ class MessageManager:
 		# Collect placeholders for sensitive data
 		placeholders: set[str] = set()
 
+		domain_patterns = tuple(key for key, value in sensitive_data.items() if isinstance(value, dict))
+		matching_domains = get_domain_pattern_matcher(domain_patterns, log_warnings=True).match(current_page_url)
+
 		for key, value in sensitive_data.items():
 			if isinstance(value, dict):
 				# New format: {domain: {key: value}}
-				if match_url_with_domain_pattern(current_page_url, key, True):
+				if key in matching_domains:
 					placeholders.update(value.keys())
 			else:
 				# Old format: {key: value}
@@ -272,9 +278,25 @@ class MessageManager:
 			raw_screenshots = agent_history_list.screenshots(n_last=self.images_per_step - 1, return_none_if_not_screenshot=False)
 			screenshots = [s for s in raw_screenshots if s is not None]
 
+		# a screenshot that looks like the previous step's (at most a caret-sized change) is either resent, swapped for the
+		# previous (byte-identical) one so deduplication and prompt caching kick in, or omitted with a note to save the
+		# image tokens. Only the message changes, browser_state_summary keeps the real screenshot for history and gifs.
+		current_screenshot = browser_state_summary.screenshot
+		screen_unchanged = False
+		if current_screenshot and agent_history_list and self.unchanged_screenshots != 'send':
+			previous_screenshots = agent_history_list.screenshots(n_last=1, return_none_if_not_screenshot=False)
+			if previous_screenshots and screenshots_look_same(
+				previous_screenshots[-1], current_screenshot, max_changed_region=UNCHANGED_SCREENSHOT_REGION
+			):
+				logger.debug(f'🖼️ Screen unchanged since the previous step, {self.unchanged_screenshots} screenshot')
+				if self.unchanged_screenshots == 'reuse':
+					current_screenshot = previous_screenshots[-1]
+				else:
+					screen_unchanged = True
+
 		# add current screenshot to the end
-		if browser_state_summary.screenshot:
-			screenshots.append(browser_state_summary.screenshot)
+		if current_screenshot and not screen_unchanged:
+			screenshots.append(current_screenshot)
 
 		# otherwise add state message and result to next message (which will not stay in memory)
 		assert browser_state_summary
@@ -290,6 +312,7 @@ class MessageManager:
 			sensitive_data=self.sensitive_data_description,
 			available_file_paths=available_file_paths,
 			screenshots=screenshots,
+			screen_unchanged=screen_unchanged,
 		).get_user_message(use_vision)
 
 		self._add_message_with_type(state_message, 'state')
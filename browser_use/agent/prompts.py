@@ -2,7 +2,15 @@ import importlib.resources
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
-from browser_use.llm.messages import ContentPartImageParam, ContentPartTextParam, ImageURL, SystemMessage, UserMessage
+from browser_use.agent.screenshot_diff import screenshots_look_same
+from browser_use.llm.messages import (
+	ContentPartImageParam,
+	ContentPartTextParam,
+	ImageURL,
+	SystemMessage,
+	UserMessage,
+	get_base64_image_media_type,
+)
 from browser_use.observability import observe_debug
 from browser_use.utils import is_new_tab_page
 
@@ -89,6 +97,7 @@ class AgentMessagePrompt:
 		sensitive_data: str | None = None,
 		available_file_paths: list[str] | None = None,
 		screenshots: list[str] | None = None,
+		screen_unchanged: bool = False,
 	):
 		self.browser_state: 'BrowserStateSummary' = browser_state_summary
 		self.file_system: 'FileSystem | None' = file_system
@@ -102,12 +111,14 @@ class AgentMessagePrompt:
 		self.sensitive_data: str | None = sensitive_data
 		self.available_file_paths: list[str] | None = available_file_paths
 		self.screenshots = screenshots or []
+		self.screen_unchanged = screen_unchanged
 		assert self.browser_state
 
 	@observe_debug(ignore_input=True, ignore_output=True, name='_deduplicate_screenshots')
 	def _deduplicate_screenshots(self, screenshots: list[str]) -> list[str]:
 		"""
 		Remove consecutive duplicate screenshots, keeping only the most recent of each.
+		Screenshots count as duplicates when their pixels match (see screenshot_diff), not only when byte-identical.
 
 		Args:
 			screenshots: List of base64-encoded screenshot strings in chronological order (oldest first)
@@ -129,18 +140,25 @@ class AgentMessagePrompt:
 			if i == len(screenshots) - 1:
 				unique_screenshots.append(screenshots[i])
 			# Only keep screenshot if it's different from the next one
-			elif screenshots[i] != screenshots[i + 1]:
+			elif not screenshots_look_same(screenshots[i], screenshots[i + 1]):
 				unique_screenshots.append(screenshots[i])
 
 		return unique_screenshots
 
 	@observe_debug(ignore_input=True, ignore_output=True, name='_get_browser_state_description')
 	def _get_browser_state_description(self) -> str:
-		elements_text = self.browser_state.element_tree.clickable_elements_to_string(include_attributes=self.include_attributes)
+		# Render only what fits the budget, prioritizing in-viewport, then new, then near-viewport elements
+		elements_text, omitted = self.browser_state.element_tree.clickable_elements_to_string_within_budget(
+			include_attributes=self.include_attributes,
+			max_length=self.max_clickable_elements_length,
+		)
 
-		if len(elements_text) > self.max_clickable_elements_length:
-			elements_text = elements_text[: self.max_clickable_elements_length]
-			truncated_text = f' (truncated to {self.max_clickable_elements_length} characters)'
+		if omitted:
+			truncated_text = (
+				f' (truncated to {self.max_clickable_elements_length} characters, omitted {omitted.elements} elements'
+				f' ({omitted.in_viewport} in viewport, {omitted.new} new) and {omitted.text_lines} text lines'
+				' farthest from the viewport)'
+			)
 		else:
 			truncated_text = ''
 
@@ -204,6 +222,8 @@ Available tabs:
 Interactive elements from top layer of the current page inside the viewport{truncated_text}:
 {elements_text}
 """
+		if self.screen_unchanged:
+			browser_state += 'Screenshot omitted: the screen is visually unchanged since the previous step.\n'
 		return browser_state
 
 	def _get_agent_state_description(self) -> str:
@@ -282,12 +302,13 @@ Interactive elements from top layer of the current page inside the viewport{trun
 				# Add label as text content
 				content_parts.append(ContentPartTextParam(text=label))
 
-				# Add the screenshot
+				# Add the screenshot, in whatever format BrowserProfile.screenshot_format captured it
+				media_type = get_base64_image_media_type(screenshot)
 				content_parts.append(
 					ContentPartImageParam(
 						image_url=ImageURL(
-							url=f'data:image/png;base64,{screenshot}',
-							media_type='image/png',
+							url=f'data:{media_type};base64,{screenshot}',
+							media_type=media_type,
 						),
 					)
 				)
@@ -0,0 +1,78 @@
+"""
+Pixel comparison of consecutive screenshots.
+
+Exact base64 equality almost never holds between two steps (a blinking caret is enough to change the bytes), so the
+screenshots are decoded and compared pixel by pixel with numpy. By default two screenshots are only the same when
+every pixel matches, up to the noise of lossy formats. Callers that opt in can pass a max_changed_region: the
+screenshots then also count as the same when all changed pixels fit inside one region of that size (a caret, a
+spinner). Two changes far apart never do.
+
+numpy and pillow are optional (pip install "browser-use[screenshot-diff]"): without them only byte-identical
+screenshots count as unchanged.
+"""
+
+import base64
+import binascii
+import io
+import logging
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+try:
+	import numpy as np
+	from PIL import Image
+except ImportError:
+	np = None  # type: ignore[assignment]
+	Image = None  # type: ignore[assignment]
+
+SCREENSHOT_PIXEL_TOLERANCE = 8  # per-channel difference (0-255) treated as noise from lossy formats (jpeg, webp)
+UNCHANGED_SCREENSHOT_REGION = (24, 24)  # (width, height) in px a change may cover and still count as unchanged
+
+
+@lru_cache(maxsize=4)
+def _screenshot_pixels(screenshot_b64: str) -> 'np.ndarray | None':
+	"""Decode a base64 screenshot into a (height, width, 3) RGB array (cached: each screenshot is compared twice)."""
+	assert np is not None and Image is not None
+	try:
+		with Image.open(io.BytesIO(base64.b64decode(screenshot_b64))) as image:
+			return np.asarray(image.convert('RGB'), dtype=np.int16)
+	except (OSError, ValueError, binascii.Error) as e:
+		logger.debug(f'Failed to decode screenshot for comparison: {type(e).__name__}: {e}')
+		return None
+
+
+def _changed_pixels(previous: str, current: str) -> 'np.ndarray | None':
+	"""Boolean (height, width) mask of the pixels that changed, None when the screenshots can't be compared."""
+	if np is None or Image is None:
+		return None
+	previous_pixels, current_pixels = _screenshot_pixels(previous), _screenshot_pixels(current)
+	if previous_pixels is None or current_pixels is None:
+		return None
+	if previous_pixels.shape != current_pixels.shape:
+		return np.ones(current_pixels.shape[:2], dtype=bool)  # viewport was resized, every pixel moved
+	return (np.abs(previous_pixels - current_pixels) > SCREENSHOT_PIXEL_TOLERANCE).any(axis=2)
+
+
+def screenshots_look_same(previous: str, current: str, max_changed_region: tuple[int, int] | None = None) -> bool:
+	"""
+	Whether two base64 screenshots are visually unchanged (byte-identical if numpy/pillow are not installed).
+
+	Without max_changed_region every pixel has to match (within SCREENSHOT_PIXEL_TOLERANCE). With it, the changed
+	pixels may cover at most one (width, height) box, e.g. UNCHANGED_SCREENSHOT_REGION to ignore a blinking caret or a
+	spinner. That also ignores real changes of the same size, like a single character, so only use it where that's
+	acceptable.
+	"""
+	if previous == current:
+		return True
+	changed = _changed_pixels(previous, current)
+	if changed is None:
+		return False
+
+	rows, columns = np.nonzero(changed)
+	if not rows.size:
+		return True
+	if max_changed_region is None:
+		return False
+	width, height = int(columns.max() - columns.min()) + 1, int(rows.max() - rows.min()) + 1
+	return width <= max_changed_region[0] and height <= max_changed_region[1]
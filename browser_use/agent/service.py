@@ -9,8 +9,9 @@ import sys
 import tempfile
 import time
 from collections.abc import Awaitable, Callable
+from dataclasses import replace
 from pathlib import Path
-from typing import Any, Generic, TypeVar
+from typing import Any, Generic, Literal, TypeVar
 
 from dotenv import load_dotenv
 
@@ -54,7 +55,7 @@ from browser_use.agent.views import (
 from browser_use.browser import BrowserProfile, BrowserSession
 from browser_use.browser.session import DEFAULT_BROWSER_PROFILE
 from browser_use.browser.types import Browser, BrowserContext, Page
-from browser_use.browser.views import BrowserStateSummary
+from browser_use.browser.views import BrowserStateSummary, StateCaptureSpec
 from browser_use.config import CONFIG
 from browser_use.controller.registry.views import ActionModel
 from browser_use.controller.service import Controller
@@ -168,6 +169,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		flash_mode: bool = False,
 		max_history_items: int = 40,
 		images_per_step: int = 1,
+		unchanged_screenshots: Literal['send', 'reuse', 'omit'] = 'send',
 		page_extraction_llm: BaseChatModel | None = None,
 		planner_llm: BaseChatModel | None = None,  # Deprecated
 		planner_interval: int = 1,  # Deprecated
@@ -251,6 +253,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			flash_mode=flash_mode,
 			max_history_items=max_history_items,
 			images_per_step=images_per_step,
+			unchanged_screenshots=unchanged_screenshots,
 			page_extraction_llm=page_extraction_llm,
 			planner_llm=None,  # Always None now (deprecated)
 			planner_interval=1,  # Always 1 now (deprecated)
@@ -329,6 +332,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			sensitive_data=sensitive_data,
 			max_history_items=self.settings.max_history_items,
 			images_per_step=self.settings.images_per_step,
+			unchanged_screenshots=self.settings.unchanged_screenshots,
 			include_tool_call_examples=self.settings.include_tool_call_examples,
 		)
 
@@ -469,11 +473,11 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		"""Load credentials from environment variables and add to sensitive_data if not already present."""
 		if not hasattr(self, 'sensitive_data') or self.sensitive_data is None:
 			self.sensitive_data = {}
-		
+
 		# Load Google credentials from environment
 		google_email = CONFIG.GOOGLE_EMAIL
 		google_password = CONFIG.GOOGLE_PASSWORD
-		
+
 		if google_email and google_password:
 			self.sensitive_data['google_email'] = google_email
 			self.sensitive_data['google_password'] = google_password
@@ -668,6 +672,12 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			# self.logger.debug('Agent paused after getting state')
 			raise InterruptedError
 
+	@property
+	def _state_capture_spec(self) -> StateCaptureSpec:
+		"""The parts of the browser state this agent consumes, screenshots (and their highlights) only for vision or the gif"""
+		needs_screenshot = self.settings.use_vision or bool(self.settings.generate_gif)
+		return StateCaptureSpec(screenshot=needs_screenshot, highlights=needs_screenshot)
+
 	@observe_debug(ignore_input=True, ignore_output=True, name='get_browser_state_with_recovery')
 	async def _get_browser_state_with_recovery(self, cache_clickable_elements_hashes: bool = True) -> BrowserStateSummary:
 		"""Get browser state with multiple fallback strategies for error recovery"""
@@ -676,7 +686,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 		# Try 1: Full state summary (current implementation) - like main branch
 		try:
-			return await self.browser_session.get_state_summary(cache_clickable_elements_hashes)
+			return await self.browser_session.get_state_summary(cache_clickable_elements_hashes, capture=self._state_capture_spec)
 		except Exception as e:
 			if self.state.last_result is None:
 				self.state.last_result = []
@@ -684,7 +694,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			self.logger.warning(f'Full state retrieval failed: {type(e).__name__}: {e}')
 
 		self.logger.warning('🔄 Falling back to minimal state summary')
-		return await self.browser_session.get_minimal_state_summary()
+		return await self.browser_session.get_minimal_state_summary(capture=self._state_capture_spec)
 
 	@observe(name='agent.step', ignore_output=True, ignore_input=True)
 	@time_execution_async('--step')
@@ -1391,8 +1401,8 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		results: list[ActionResult] = []
 
 		assert self.browser_session is not None, 'BrowserSession is not set up'
-		cached_selector_map = await self.browser_session.get_selector_map()
-		cached_path_hashes = {e.hash.branch_path_hash for e in cached_selector_map.values()}
+		cached_element_hashes = await self.browser_session.get_element_hashes()
+		cached_path_hashes = {h.branch_path_hash for h in cached_element_hashes.values()}
 
 		try:
 			await self.browser_session.remove_highlights()
@@ -1408,14 +1418,18 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 				break
 
 			if action.get_index() is not None and i != 0:
-				new_browser_state_summary = await self.browser_session.get_state_summary(cache_clickable_elements_hashes=False)
-				new_selector_map = new_browser_state_summary.selector_map
+				# only the element hashes are compared, the indices don't depend on the highlights being drawn
+				new_browser_state_summary = await self.browser_session.get_state_summary(
+					cache_clickable_elements_hashes=False,
+					capture=replace(self._state_capture_spec, screenshot=False, tabs=False, page_info=False),
+				)
+				new_element_hashes = new_browser_state_summary.element_hashes
 
 				# Detect index change after previous action
-				orig_target = cached_selector_map.get(action.get_index())  # type: ignore
-				orig_target_hash = orig_target.hash.branch_path_hash if orig_target else None
-				new_target = new_selector_map.get(action.get_index())  # type: ignore
-				new_target_hash = new_target.hash.branch_path_hash if new_target else None
+				orig_target = cached_element_hashes.get(action.get_index())  # type: ignore
+				orig_target_hash = orig_target.branch_path_hash if orig_target else None
+				new_target = new_element_hashes.get(action.get_index())  # type: ignore
+				new_target_hash = new_target.branch_path_hash if new_target else None
 				if orig_target_hash != new_target_hash:
 					msg = f'Element index changed after action {i} / {len(actions)}, because page changed.'
 					logger.info(msg)
@@ -1428,7 +1442,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 					)
 					break
 
-				new_path_hashes = {e.hash.branch_path_hash for e in new_selector_map.values()}
+				new_path_hashes = {h.branch_path_hash for h in new_element_hashes.values()}
 				if check_for_new_elements and not new_path_hashes.issubset(cached_path_hashes):
 					# next action requires index but there are new elements on the page
 					msg = f'Something new appeared after action {i} / {len(actions)}, following actions are NOT executed and should be retried.'
@@ -1488,6 +1502,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		max_retries: int = 3,
 		skip_failures: bool = True,
 		delay_between_actions: float = 2.0,
+		fuzzy_matching: bool = False,
 	) -> list[ActionResult]:
 		"""
 		Rerun a saved history of actions with error handling and retry logic.
@@ -1497,6 +1512,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		                max_retries: Maximum number of retries per action
 		                skip_failures: Whether to skip failed actions or stop execution
 		                delay_between_actions: Delay between actions in seconds
+		                fuzzy_matching: Re-match elements whose hash changed by xpath or stable attributes (id, name, ...)
 
 		Returns:
 		                List of action results
@@ -1524,7 +1540,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			retry_count = 0
 			while retry_count < max_retries:
 				try:
-					result = await self._execute_history_step(history_item, delay_between_actions)
+					result = await self._execute_history_step(history_item, delay_between_actions, fuzzy_matching)
 					results.extend(result)
 					break
 
@@ -1542,10 +1558,15 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 		return results
 
-	async def _execute_history_step(self, history_item: AgentHistory, delay: float) -> list[ActionResult]:
+	async def _execute_history_step(
+		self, history_item: AgentHistory, delay: float, fuzzy_matching: bool = False
+	) -> list[ActionResult]:
 		"""Execute a single step from history with element validation"""
 		assert self.browser_session is not None, 'BrowserSession is not set up'
-		state = await self.browser_session.get_state_summary(cache_clickable_elements_hashes=False)
+		state = await self.browser_session.get_state_summary(
+			cache_clickable_elements_hashes=False,
+			capture=replace(self._state_capture_spec, screenshot=False, tabs=False, page_info=False),
+		)
 		if not state or not history_item.model_output:
 			raise ValueError('Invalid state or model output')
 		updated_actions = []
@@ -1554,6 +1575,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 				history_item.state.interacted_element[i],
 				action,
 				state,
+				fuzzy=fuzzy_matching,
 			)
 			updated_actions.append(updated_action)
 
@@ -1570,16 +1592,22 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		historical_element: DOMHistoryElement | None,
 		action: ActionModel,  # Type this properly based on your action model
 		browser_state_summary: BrowserStateSummary,
+		fuzzy: bool = False,
 	) -> ActionModel | None:
 		"""
 		Update action indices based on current page state.
 		Returns updated action or None if element cannot be found.
+		Only exact hash matches are accepted unless fuzzy, see HistoryElementIndex.find.
 		"""
 		if not historical_element or not browser_state_summary.element_tree:
 			return action
 
+		# the index is built once per snapshot and shared by all actions of the step
 		current_element = HistoryTreeProcessor.find_history_element_in_tree(
-			historical_element, browser_state_summary.element_tree
+			historical_element,
+			browser_state_summary.element_tree,
+			element_index=browser_state_summary.history_index,
+			fuzzy=fuzzy,
 		)
 
 		if not current_element or current_element.highlight_index is None:
@@ -4,7 +4,7 @@ import json
 import traceback
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Generic
+from typing import Any, Generic, Literal
 
 from openai import RateLimitError
 from pydantic import BaseModel, ConfigDict, Field, ValidationError, create_model, model_validator
@@ -56,6 +56,8 @@ class AgentSettings(BaseModel):
 	flash_mode: bool = False  # If enabled, disables evaluation_previous_goal and next_goal, and sets use_thinking = False
 	max_history_items: int = 40
 	images_per_step: int = 1
+	# what to do with a screenshot that differs from the previous one by at most a caret-sized region, see screenshot_diff.py
+	unchanged_screenshots: Literal['send', 'reuse', 'omit'] = 'send'
 
 	page_extraction_llm: BaseChatModel | None = None
 	planner_llm: BaseChatModel | None = None
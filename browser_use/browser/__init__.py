@@ -2,5 +2,14 @@ from .browser import Browser, BrowserConfig
 from .context import BrowserContext, BrowserContextConfig
 from .profile import BrowserProfile
 from .session import BrowserSession
+from .shared import SharedBrowser
 
-__all__ = ['Browser', 'BrowserConfig', 'BrowserContext', 'BrowserContextConfig', 'BrowserSession', 'BrowserProfile']
+__all__ = [
+	'Browser',
+	'BrowserConfig',
+	'BrowserContext',
+	'BrowserContextConfig',
+	'BrowserSession',
+	'BrowserProfile',
+	'SharedBrowser',
+]
@@ -276,6 +276,24 @@ class RecordHarMode(str, Enum):
 	MINIMAL = 'minimal'
 
 
+# request.resource_type values reported by playwright
+ResourceType = Literal[
+	'document',
+	'stylesheet',
+	'image',
+	'media',
+	'font',
+	'script',
+	'texttrack',
+	'xhr',
+	'fetch',
+	'eventsource',
+	'websocket',
+	'manifest',
+	'other',
+]
+
+
 class BrowserChannel(str, Enum):
 	CHROMIUM = 'chromium'
 	CHROME = 'chrome'
@@ -576,11 +594,89 @@ class BrowserProfile(BrowserConnectArgs, BrowserLaunchPersistentContextArgs, Bro
 	wait_for_network_idle_page_load_time: float = Field(default=0.5, description='Time to wait for network idle.')
 	maximum_wait_page_load_time: float = Field(default=5.0, description='Maximum time to wait for page load.')
 	wait_between_actions: float = Field(default=0.5, description='Time to wait between actions.')
+	adaptive_page_load_timing: bool = Field(
+		default=False,
+		description=(
+			'Learn how long each origin takes to settle and derive the minimum/maximum page load waits '
+			'from the p90 of its recent settle times.'
+		),
+	)
+	page_load_timing_path: str | Path | None = Field(
+		default=None,
+		description=(
+			'JSON file to persist the learned per-origin settle times to. '
+			'Kept in memory only by default, the file lists the visited origins.'
+		),
+	)
+	page_health_check_ttl: float = Field(
+		default=2.0,
+		description=(
+			'Seconds a successful page responsiveness check is reused by @require_healthy_browser '
+			'before pinging the page again (0 pings before every call).'
+		),
+	)
 
 	# --- UI/viewport/DOM ---
 	include_dynamic_attributes: bool = Field(default=True, description='Include dynamic attributes in selectors.')
 	highlight_elements: bool = Field(default=True, description='Highlight interactive elements on the page.')
 	viewport_expansion: int = Field(default=500, description='Viewport expansion in pixels for LLM context.')
+	incremental_dom_snapshots: bool = Field(
+		default=False,
+		description='Keep a MutationObserver-backed DOM index in the page and only re-process nodes that changed between steps.',
+	)
+	compact_dom_transport: bool = Field(
+		default=False,
+		description='Transfer full DOM snapshots as a single columnar JSON string instead of one object per node.',
+	)
+	dom_extraction_backend: Literal['js', 'cdp_snapshot'] = Field(
+		default='js',
+		description=(
+			"How the DOM tree is extracted: 'js' walks the DOM with buildDomTree in the page, "
+			"'cdp_snapshot' builds it in Python from DOMSnapshot.captureSnapshot."
+		),
+	)
+	bulk_text_input_threshold: int | None = Field(
+		default=64,
+		ge=0,
+		description='Insert texts at least this long in one go instead of typing them key by key (None always types).',
+	)
+	fast_coordinate_clicks: bool = Field(
+		default=True,
+		description='Click snapshot elements with raw mouse events at their center if an in-page hit-test finds nothing on top.',
+	)
+
+	# --- Screenshots ---
+	screenshot_format: Literal['png', 'jpeg', 'webp'] = Field(
+		default='png', description='Image format of the screenshots sent to the LLM, jpeg/webp are much smaller on HiDPI screens.'
+	)
+	screenshot_quality: int | None = Field(
+		default=None,
+		ge=0,
+		le=100,
+		description='Compression quality (0-100) of jpeg/webp screenshots, None uses the browser default. Ignored for png.',
+	)
+	screenshot_max_dimension: int | None = Field(
+		default=None, gt=0, description='Downscale screenshots so that their longest side is at most this many pixels.'
+	)
+	screenshot_clip_to_viewport: bool = Field(
+		default=False, description='Clip screenshots to the visual viewport, excluding scrollbars and following pinch-zoom.'
+	)
+
+	# --- Resource blocking ---
+	resource_blocking: Literal['off', 'safe', 'lean'] = Field(
+		default='off',
+		description="Request blocking preset: 'safe' blocks known ad/tracker domains, 'lean' also blocks media and web fonts.",
+	)
+	blocked_resource_types: list[ResourceType] = Field(
+		default_factory=list, description='Resource types to block on top of the preset e.g. ["image", "media", "font"].'
+	)
+	blocked_domains: list[str] = Field(
+		default_factory=list, description='Domains to block on top of the preset, subdomains included e.g. ["ads.example.com"].'
+	)
+	blocked_domains_file: str | Path | None = Field(
+		default=None,
+		description='Local blocklist with one domain per line, hosts file format ("0.0.0.0 ads.example.com") is also accepted.',
+	)
 
 	profile_directory: str = 'Default'  # e.g. 'Profile 1', 'Profile 2', 'Custom Profile', etc.
 
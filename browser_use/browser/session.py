@@ -9,10 +9,11 @@ import re
 import shutil
 import tempfile
 import time
-from dataclasses import dataclass
-from functools import wraps
+from collections.abc import Awaitable, Callable, Coroutine
+from dataclasses import dataclass, field
+from functools import partial, wraps
 from pathlib import Path
-from typing import Any, Self
+from typing import Any, Literal, Self
 from urllib.parse import urlparse
 
 import anyio
@@ -33,6 +34,9 @@ from pydantic import AliasChoices, BaseModel, ConfigDict, Field, InstanceOf, Pri
 from uuid_extensions import uuid7str
 
 from browser_use.browser.profile import BROWSERUSE_DEFAULT_CHANNEL, BrowserChannel, BrowserProfile
+from browser_use.browser.resource_blocking import ResourceBlocker, ResourceBlockingStats
+from browser_use.browser.settle_timing import PageSettleStore, get_page_settle_store
+from browser_use.browser.shared import SharedBrowser
 from browser_use.browser.types import (
 	Browser,
 	BrowserContext,
@@ -48,20 +52,23 @@ from browser_use.browser.views import (
 	BrowserError,
 	BrowserStateSummary,
 	PageInfo,
+	StateCaptureSpec,
 	TabInfo,
 	URLNotAllowedError,
 )
-from browser_use.dom.clickable_element_processor.service import ClickableElementProcessor
+from browser_use.dom.history_tree_processor.view import HashedDomElement
 from browser_use.dom.service import DomService
-from browser_use.dom.views import DOMElementNode, SelectorMap
+from browser_use.dom.views import DOMElementNode, DOMState, SelectorMap
 from browser_use.utils import (
+	get_domain_pattern_matcher,
 	is_new_tab_page,
-	match_url_with_domain_pattern,
 	merge_dicts,
 	time_execution_async,
 	time_execution_sync,
 )
 
+logger = logging.getLogger(__name__)
+
 _GLOB_WARNING_SHOWN = False  # used inside _is_url_allowed to avoid spamming the logs with the same warning multiple times
 
 GLOBAL_PLAYWRIGHT_API_OBJECT = None  # never instantiate the playwright API object more than once per thread
@@ -72,6 +79,178 @@ GLOBAL_PATCHRIGHT_EVENT_LOOP = None  # track which event loop the global objects
 MAX_SCREENSHOT_HEIGHT = 2000
 MAX_SCREENSHOT_WIDTH = 1920
 
+# everything _get_updated_state needs from the page besides the DOM tree and the screenshot, in a single round trip:
+# clears the previous step's highlights (they must be gone before the DOM is re-extracted and re-highlighted),
+# then reads the page/viewport dimensions, the scroll position, the title and whether chrome's PDF viewer is showing
+STATE_PROBE_JS = """() => {
+	try {
+		const container = document.getElementById('playwright-highlight-container');
+		if (container) {
+			container.remove();
+		}
+		document.querySelectorAll('[browser-user-highlight-id^="playwright-highlight-"]').forEach(el => {
+			el.removeAttribute('browser-user-highlight-id');
+		});
+	} catch (e) {
+		console.error('Failed to remove highlights:', e);
+	}
+
+	const root = document.documentElement;
+	const body = document.body;
+	const pdfEmbed = document.querySelector('embed[type="application/x-google-chrome-pdf"]') ||
+		document.querySelector('embed[type="application/pdf"]');
+	return {
+		viewport_width: window.innerWidth,
+		viewport_height: window.innerHeight,
+		page_width: Math.max(root ? root.scrollWidth : 0, body ? body.scrollWidth || 0 : 0),
+		page_height: Math.max(root ? root.scrollHeight : 0, body ? body.scrollHeight || 0 : 0),
+		scroll_x: window.scrollX || window.pageXOffset || (root && root.scrollLeft) || 0,
+		scroll_y: window.scrollY || window.pageYOffset || (root && root.scrollTop) || 0,
+		document_height: root ? root.scrollHeight : 0,
+		title: document.title,
+		is_pdf: !!pdfEmbed || window.location.href.toLowerCase().includes('.pdf') || document.contentType === 'application/pdf',
+	};
+}"""
+
+
+# _wait_for_stable_network only waits for the requests that affect what the page looks like
+NETWORK_IDLE_RESOURCE_TYPES = frozenset({'document', 'stylesheet', 'image', 'font', 'script', 'iframe'})
+NETWORK_IDLE_IGNORED_URL_PATTERNS = (
+	# Analytics and tracking
+	'analytics',
+	'tracking',
+	'telemetry',
+	'beacon',
+	'metrics',
+	# Ad-related
+	'doubleclick',
+	'adsystem',
+	'adserver',
+	'advertising',
+	# Social media widgets
+	'facebook.com/plugins',
+	'platform.twitter',
+	'linkedin.com/embed',
+	# Live chat and support
+	'livechat',
+	'zendesk',
+	'intercom',
+	'crisp.chat',
+	'hotjar',
+	# Push notifications
+	'push-notifications',
+	'onesignal',
+	'pushwoosh',
+	# Background sync/heartbeat
+	'heartbeat',
+	'ping',
+	'alive',
+	# WebRTC and streaming
+	'webrtc',
+	'rtmp://',
+	'wss://',
+	# Common CDNs for dynamic content
+	'cloudfront.net',
+	'fastly.net',
+)
+# one regex scan per request instead of one substring scan per pattern
+NETWORK_IDLE_IGNORED_URL_RE = re.compile('|'.join(map(re.escape, NETWORK_IDLE_IGNORED_URL_PATTERNS)), re.IGNORECASE)
+NETWORK_IDLE_STREAMING_CONTENT_RE = re.compile('streaming|video|audio|webm|mp4|event-stream|websocket|protobuf')
+NETWORK_IDLE_RELEVANT_CONTENT_RE = re.compile('text/html|text/css|application/javascript|image/|font/|application/json')
+NETWORK_IDLE_MAX_RESPONSE_SIZE = 5 * 1024 * 1024  # larger responses are likely not essential for the page load
+
+TAB_TITLE_MAX_AGE = 30.0  # seconds a tab title kept up to date from page events is trusted without probing the page again
+TAB_TITLE_PROBE_TIMEOUT = 3.0
+
+# What _is_visible() + scroll_into_view_if_needed() do for the selector based lookup, in a single round trip
+PREPARE_SNAPSHOT_ELEMENT_JS = """(element) => {
+	if (!element.isConnected) return false;
+	const rect = element.getBoundingClientRect();
+	const style = window.getComputedStyle(element);
+	if (rect.width > 0 && rect.height > 0 && style.visibility !== 'hidden' && style.display !== 'none') {
+		const { innerWidth, innerHeight } = window;
+		const inViewport = rect.top >= 0 && rect.left >= 0 && rect.bottom <= innerHeight && rect.right <= innerWidth;
+		// instant: a CSS smooth scroll would still be moving the element when it gets clicked
+		if (!inViewport) element.scrollIntoView({ block: 'center', inline: 'center', behavior: 'instant' });
+	}
+	return true;
+}"""
+# Looks up an element in the registry of highlighted elements buildDomTree publishes for a DOM snapshot token
+RESOLVE_SNAPSHOT_ELEMENT_JS = (
+	"""([token, index, tagName]) => {
+	const registry = window.__browserUseElements;
+	const element = registry && registry.token === token ? registry.elements[index] : null;
+	if (!element || element.tagName.toLowerCase() !== tagName) return null;
+	return ("""
+	+ PREPARE_SNAPSHOT_ELEMENT_JS
+	+ """)(element) ? element : null;
+}"""
+)
+# Center of the element in viewport coordinates if a click there would land on it (or one of its descendants), else null.
+# Also null while the element moves (a transition, an animation, a scroll still running): measured again a frame later
+CLICK_POINT_JS = """async (element) => {
+	if (!element.isConnected || element.disabled) return null;
+	const before = element.getBoundingClientRect();
+	// requestAnimationFrame doesn't fire in background tabs, hence the timeout
+	await new Promise((resolve) => {
+		requestAnimationFrame(() => resolve());
+		setTimeout(resolve, 50);
+	});
+	const rect = element.getBoundingClientRect();
+	if (['left', 'top', 'width', 'height'].some((side) => Math.abs(rect[side] - before[side]) > 0.5)) return null;
+	if (rect.width <= 0 || rect.height <= 0) return null;
+	const x = rect.left + rect.width / 2;
+	const y = rect.top + rect.height / 2;
+	if (x < 0 || y < 0 || x >= window.innerWidth || y >= window.innerHeight) return null;
+	let hit = document.elementFromPoint(x, y);
+	while (hit) {
+		if (hit === element || element.contains(hit)) return [x, y];
+		// the element may live in (or contain) an open shadow root, where elementFromPoint stops at the host
+		const inner = hit.shadowRoot ? hit.shadowRoot.elementFromPoint(x, y) : null;
+		if (!inner || inner === hit) return null;
+		hit = inner;
+	}
+	return null;
+}"""
+# How text can be entered into an element: whether it takes plain text at all and whether it reacts to single keystrokes
+# (autocomplete widgets, comboboxes, key listeners registered on the element itself), which only typing key by key triggers
+INPUT_STRATEGY_PROBE_JS = """(element) => {
+	const attribute = (name) => (element.getAttribute(name) || '').toLowerCase();
+	const tagName = element.tagName.toLowerCase();
+	const textTypes = ['', 'text', 'search', 'email', 'url', 'tel', 'password', 'number'];
+	const takesText =
+		element.isContentEditable || tagName === 'textarea' || (tagName === 'input' && textTypes.includes(attribute('type')));
+
+	const keyEvents = ['keydown', 'keyup', 'keypress'];
+	let keyListeners = keyEvents.some((type) => element.hasAttribute(`on${type}`) || typeof element[`on${type}`] === 'function');
+	// listeners added with addEventListener are tracked by the init script of setup_new_browser_context()
+	const getListeners = element.ownerDocument?.defaultView?.getEventListenersForNode || window.getEventListenersForNode;
+	if (!keyListeners && typeof getListeners === 'function') {
+		keyListeners = getListeners(element).some((listener) => keyEvents.includes(listener.type));
+	}
+	const autocomplete =
+		attribute('role') === 'combobox' ||
+		['list', 'both', 'inline'].includes(attribute('aria-autocomplete')) ||
+		['true', 'listbox', 'menu', 'tree', 'grid'].includes(attribute('aria-haspopup')) ||
+		element.hasAttribute('list');
+	return { takesText, needsKeystrokes: keyListeners || autocomplete };
+}"""
+# Sets an input's or textarea's value through the prototype's setter (so frameworks tracking the value notice the change)
+SET_NATIVE_VALUE_JS = """(element, text) => {
+	const prototype = [HTMLTextAreaElement, HTMLInputElement].find((type) => element instanceof type)?.prototype;
+	if (!prototype) return false;
+	Object.getOwnPropertyDescriptor(prototype, 'value').set.call(element, text);
+	element.dispatchEvent(new Event('input', { bubbles: true }));
+	element.dispatchEvent(new Event('change', { bubbles: true }));
+	return true;
+}"""
+# Runtime.callFunctionOn a node resolved by backendNodeId, adds it to the same registry for the DOMSnapshot backend
+REGISTER_SNAPSHOT_ELEMENT_JS = """function (token, index) {
+	let registry = window.__browserUseElements;
+	if (!registry || registry.token !== token) registry = window.__browserUseElements = { token, elements: [] };
+	registry.elements[index] = this;
+}"""
+
 
 def _log_glob_warning(domain: str, glob: str, logger: logging.Logger):
 	global _GLOB_WARNING_SHOWN
@@ -146,7 +325,7 @@ def require_healthy_browser(usable_page=True, reopen_page=True):
 
 					# Check if page is responsive
 					# self.logger.debug(f'Checking page responsiveness for {func.__name__}...')
-					if await self._is_page_responsive(self.agent_current_page):
+					if await self._check_page_health(self.agent_current_page):
 						# self.logger.debug('✅ Confirmed page is responsive')
 						pass
 					else:
@@ -196,7 +375,475 @@ class CachedClickableElementHashes:
 	"""
 
 	url: str
-	hashes: set[str]
+	hashes: set[HashedDomElement]
+
+
+@dataclass
+class PageHealthMonitor:
+	"""
+	Coalesces the page responsiveness checks done by @require_healthy_browser.
+
+	A successful check is reused for `ttl` seconds (until the page navigates), concurrent checks of the same page
+	share a single ping, and crashes are pushed by CDP (Inspector.targetCrashed / Target.detachedFromTarget) instead
+	of being discovered by the next ping timing out, on the page's pooled CDP session. Pages are keyed by id() and
+	forgotten when they close. clear() unsubscribes from the pages, so watching them again doesn't double the handlers.
+	"""
+
+	healthy_at: dict[int, float] = field(default_factory=dict)
+	crashed: set[int] = field(default_factory=set)
+	pings: dict[int, asyncio.Task[bool]] = field(default_factory=dict)
+	# id(page) -> (page, [(event, handler), ...]) of the pages we are subscribed to
+	watched: dict[int, tuple[Page, list[tuple[str, Any]]]] = field(default_factory=dict)
+	background: set[asyncio.Task[Any]] = field(default_factory=set)
+
+	def is_fresh(self, page: Page, ttl: float) -> bool:
+		checked_at = self.healthy_at.get(id(page))
+		return checked_at is not None and id(page) not in self.crashed and time.monotonic() - checked_at < ttl
+
+	def mark_healthy(self, page: Page) -> None:
+		self.crashed.discard(id(page))
+		self.healthy_at[id(page)] = time.monotonic()
+
+	def mark_unhealthy(self, page: Page) -> None:
+		self.crashed.add(id(page))
+		self.healthy_at.pop(id(page), None)
+
+	def invalidate(self, page: Page) -> None:
+		self.healthy_at.pop(id(page), None)
+
+	def forget(self, page: Page) -> None:
+		self.invalidate(page)
+		self.crashed.discard(id(page))
+		self._unwatch(id(page))
+
+	def clear(self) -> None:
+		self.healthy_at.clear()
+		self.crashed.clear()
+		self.pings.clear()
+		for key in list(self.watched):
+			self._unwatch(key)
+
+	async def check(self, page: Page, ping: Callable[[Page], Awaitable[bool]], ttl: float) -> bool:
+		"""Return whether the page is responsive, pinging it only if there is no fresh result to reuse."""
+		key = id(page)
+		if key in self.crashed:
+			return False
+		if self.is_fresh(page, ttl):
+			return True
+
+		task = self.pings.get(key)
+		if task is None:
+			task = asyncio.create_task(self._ping(page, ping))
+			self.pings[key] = task
+		# shielded so a caller being cancelled doesn't cancel the ping the other callers are waiting on
+		return await asyncio.shield(task)
+
+	async def _ping(self, page: Page, ping: Callable[[Page], Awaitable[bool]]) -> bool:
+		try:
+			responsive = await ping(page)
+		finally:
+			self.pings.pop(id(page), None)
+		if responsive and id(page) not in self.crashed:
+			self.healthy_at[id(page)] = time.monotonic()
+		return responsive
+
+	def watch(self, page: Page, cdp_sessions: CDPSessionPool, logger: logging.Logger) -> None:
+		"""Subscribe to the events that change the page's health, once per page."""
+		key = id(page)
+		if key in self.watched or page.is_closed():
+			return
+
+		listeners: list[tuple[str, Any]] = [
+			('close', lambda _: self.forget(page)),
+			('framenavigated', lambda frame: frame == page.main_frame and self.invalidate(page)),
+		]
+		for event, handler in listeners:
+			page.on(event, handler)
+		self.watched[key] = (page, listeners)
+		# subscribe in the background, attaching a CDP session to a hung page must not block the health check itself
+		self.run_in_background(self._watch_crash_events(page, cdp_sessions, logger))
+
+	def run_in_background(self, coro: Coroutine[Any, Any, Any]) -> None:
+		task = asyncio.create_task(coro)
+		# keep a reference until it's done, the event loop only holds weak references to tasks
+		self.background.add(task)
+		task.add_done_callback(self.background.discard)
+
+	async def _watch_crash_events(self, page: Page, cdp_sessions: CDPSessionPool, logger: logging.Logger) -> None:
+		try:
+			await cdp_sessions.add_attach_hook('page_health', partial(self._subscribe_to_crash_events, logger=logger))
+			await cdp_sessions.get(page)
+		except Exception as e:
+			# polling still works without the push signals
+			logger.debug(f'Failed to subscribe to page health events: {type(e).__name__}: {e}')
+
+	async def _subscribe_to_crash_events(self, page: Page, cdp_session: Any, logger: logging.Logger) -> None:
+		"""CDPSessionPool attach hook: mark the page unhealthy as soon as its renderer crashes or its target goes away."""
+		target_id = (await cdp_session.send('Target.getTargetInfo'))['targetInfo']['targetId']
+
+		def on_crashed(event: dict[str, Any]) -> None:
+			logger.warning(f'💥 Page renderer crashed: {_log_pretty_url(page.url)}')
+			self.mark_unhealthy(page)
+
+		def on_detached(event: dict[str, Any]) -> None:
+			# child targets (workers, OOPIFs) detach all the time, only the page's own target matters
+			if event.get('targetId') == target_id:
+				logger.debug(f'✂️ Page target detached: {_log_pretty_url(page.url)}')
+				self.mark_unhealthy(page)
+
+		cdp_session.on('Inspector.targetCrashed', on_crashed)
+		cdp_session.on('Inspector.targetReloadedAfterCrash', lambda event: self.crashed.discard(id(page)))
+		cdp_session.on('Target.detachedFromTarget', on_detached)
+		await cdp_session.send('Inspector.enable')
+
+	def _unwatch(self, key: int) -> None:
+		page, listeners = self.watched.pop(key, (None, []))
+		for event, handler in listeners:
+			try:
+				page.remove_listener(event, handler)  # type: ignore[union-attr]
+			except Exception:
+				pass  # the connection to the page is gone already
+
+
+@dataclass
+class CDPSessionPool:
+	"""
+	One long-lived CDP session per page, shared by screenshots, scroll gestures, metrics and other CDP probes.
+
+	Attaching and detaching a session on every call is a measurable part of screenshot latency and churns the browser's
+	target bookkeeping on long runs. A page's session lives as long as the page, navigations included. If it goes away
+	underneath us (or is invalidated after a failure) it's re-attached lazily on next use.
+
+	Consumers that need events (the health monitor's crash events, the resource blocker's paused requests, the network
+	idle tracking) register an attach hook instead of opening sessions of their own. Hooks run on every session the
+	pool attaches, so they enable their domains and subscribe to their events again after a re-attach.
+	"""
+
+	sessions: dict[int, asyncio.Task[Any]] = field(default_factory=dict)
+	# id(page) -> (page, [(event, handler), ...]) of the pages we are subscribed to
+	watched: dict[int, tuple[Page, list[tuple[str, Any]]]] = field(default_factory=dict)
+	attach_hooks: dict[str, Callable[[Page, Any], Awaitable[None]]] = field(default_factory=dict)
+	background: set[asyncio.Task[Any]] = field(default_factory=set)
+
+	async def get(self, page: Page) -> Any:
+		key = id(page)
+		if key not in self.watched:
+			listeners: list[tuple[str, Any]] = [('close', lambda _: self.invalidate(page, closed=True))]
+			for event, handler in listeners:
+				page.on(event, handler)
+			self.watched[key] = (page, listeners)
+
+		task = self.sessions.get(key)
+		if task is None:
+			task = asyncio.create_task(self._attach(page))
+			self.sessions[key] = task
+		try:
+			# shielded so a caller being cancelled doesn't cancel the attach the other callers are waiting on
+			return await asyncio.shield(task)
+		except Exception:
+			if self.sessions.get(key) is task:
+				del self.sessions[key]
+			raise
+
+	async def send(self, page: Page, method: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+		"""Send a CDP command on the page's pooled session, re-attaching once if the session went away underneath us."""
+		cdp_session = await self.get(page)
+		try:
+			return await cdp_session.send(method, params or {})
+		except Exception as e:
+			if page.is_closed() or not any(reason in str(e).lower() for reason in ('closed', 'detached')):
+				raise
+			self.invalidate(page)
+			return await (await self.get(page)).send(method, params or {})
+
+	async def add_attach_hook(self, name: str, hook: Callable[[Page, Any], Awaitable[None]]) -> None:
+		"""Run hook(page, cdp_session) on every session attached from now on, and on the ones attached already (once per name)."""
+		if name in self.attach_hooks:
+			return
+		self.attach_hooks[name] = hook
+		for key, task in list(self.sessions.items()):
+			if task.done() and not task.cancelled() and task.exception() is None:
+				await self._run_hook(name, hook, self.watched[key][0], task.result())
+
+	def invalidate(self, page: Page, closed: bool = False) -> None:
+		task = self.sessions.pop(id(page), None)
+		if closed:
+			self._unwatch(id(page))
+		if task is not None and not closed:
+			# detach in the background, the session is dead anyway once the page is closed
+			self.run_in_background(self._detach(task))
+
+	def clear(self) -> None:
+		self.sessions.clear()
+		for key in list(self.watched):
+			self._unwatch(key)
+
+	def run_in_background(self, coro: Coroutine[Any, Any, Any]) -> None:
+		task = asyncio.create_task(coro)
+		# keep a reference until it's done, the event loop only holds weak references to tasks
+		self.background.add(task)
+		task.add_done_callback(self.background.discard)
+
+	async def _attach(self, page: Page) -> Any:
+		cdp_session = await page.context.new_cdp_session(page)  # type: ignore
+		for name, hook in list(self.attach_hooks.items()):
+			await self._run_hook(name, hook, page, cdp_session)
+		return cdp_session
+
+	@staticmethod
+	async def _run_hook(name: str, hook: Callable[[Page, Any], Awaitable[None]], page: Page, cdp_session: Any) -> None:
+		try:
+			await hook(page, cdp_session)
+		except Exception as e:
+			# the session itself is still fine for everyone else
+			logger.debug(f'Failed to set up {name} on the CDP session of {_log_pretty_url(page.url)}: {type(e).__name__}: {e}')
+
+	def _unwatch(self, key: int) -> None:
+		page, listeners = self.watched.pop(key, (None, []))
+		for event, handler in listeners:
+			try:
+				page.remove_listener(event, handler)  # type: ignore[union-attr]
+			except Exception:
+				pass  # the connection to the page is gone already
+
+	@staticmethod
+	async def _detach(task: asyncio.Task[Any]) -> None:
+		try:
+			cdp_session = await task
+			await asyncio.wait_for(cdp_session.detach(), timeout=1.0)
+		except Exception:
+			pass
+
+
+@dataclass
+class TabInfoCache:
+	"""
+	Tab titles for get_tabs_info, maintained from page events instead of re-read from every tab on every step.
+
+	A page's title is re-read in the background when it fires domcontentloaded/load, dropped when its main frame
+	navigates and forgotten when it closes. get_tabs_info only probes the pages whose entry is missing, stale or for
+	another URL, all in parallel, and concurrent probes of the same page share a single page.title() call.
+	Pages are keyed by id(). clear() unsubscribes from the pages, so watching them again doesn't double the handlers.
+	"""
+
+	titles: dict[int, tuple[str, str, float]] = field(default_factory=dict)  # id(page) -> (url, title, updated_at)
+	probes: dict[int, asyncio.Task[str]] = field(default_factory=dict)
+	# id(page) -> page whose title couldn't be read and whose JS engine didn't answer either, closed by the next get_tabs_info
+	unresponsive: dict[int, Page] = field(default_factory=dict)
+	# id(page) -> (page, [(event, handler), ...]) of the pages we are subscribed to
+	watched: dict[int, tuple[Page, list[tuple[str, Any]]]] = field(default_factory=dict)
+	background: set[asyncio.Task[Any]] = field(default_factory=set)
+	probe_timeout: float = TAB_TITLE_PROBE_TIMEOUT
+
+	def watch(self, page: Page) -> None:
+		"""Subscribe to the events that change the page's title, once per page."""
+		key = id(page)
+		if key in self.watched or page.is_closed():
+			return
+
+		listeners: list[tuple[str, Any]] = [
+			('domcontentloaded', lambda _: self.run_in_background(self._refresh_quietly(page))),
+			('load', lambda _: self.run_in_background(self._refresh_quietly(page))),
+			('framenavigated', lambda frame: frame == page.main_frame and self.invalidate(page)),
+			('close', lambda _: self.forget(page)),
+		]
+		for event, handler in listeners:
+			page.on(event, handler)
+		self.watched[key] = (page, listeners)
+
+	def cached_title(self, page: Page, max_age: float) -> str | None:
+		"""Return the page's title if it was read less than max_age seconds ago for the URL the page is on now."""
+		entry = self.titles.get(id(page))
+		if entry is None:
+			return None
+		url, title, updated_at = entry
+		if url != page.url or time.monotonic() - updated_at >= max_age:
+			return None
+		return title
+
+	def update(self, page: Page, title: str) -> None:
+		self.titles[id(page)] = (page.url, title, time.monotonic())
+
+	def invalidate(self, page: Page) -> None:
+		self.titles.pop(id(page), None)
+
+	def forget(self, page: Page) -> None:
+		self.invalidate(page)
+		self.unresponsive.pop(id(page), None)
+		self._unwatch(id(page))
+
+	def clear(self) -> None:
+		self.titles.clear()
+		self.probes.clear()
+		self.unresponsive.clear()
+		for key in list(self.watched):
+			self._unwatch(key)
+
+	def _unwatch(self, key: int) -> None:
+		page, listeners = self.watched.pop(key, (None, []))
+		for event, handler in listeners:
+			try:
+				page.remove_listener(event, handler)  # type: ignore[union-attr]
+			except Exception:
+				pass  # the connection to the page is gone already
+
+	async def refresh(self, page: Page) -> str:
+		"""Read the page's title (page.title() can hang forever on crashed tabs, hence the timeout) and cache it."""
+		key = id(page)
+		task = self.probes.get(key)
+		if task is None:
+			task = asyncio.create_task(self._probe(page))
+			self.probes[key] = task
+		# shielded so a caller being cancelled doesn't cancel the probe the other callers are waiting on
+		return await asyncio.shield(task)
+
+	async def _probe(self, page: Page) -> str:
+		url = page.url
+		try:
+			title = await asyncio.wait_for(page.title(), timeout=self.probe_timeout)
+		finally:
+			self.probes.pop(id(page), None)
+		# a navigation that happened while the title was being read makes it stale already
+		if page.url == url and not page.is_closed():
+			self.titles[id(page)] = (url, title, time.monotonic())
+		return title
+
+	async def _refresh_quietly(self, page: Page) -> None:
+		try:
+			await self.refresh(page)
+		except Exception:
+			pass  # get_tabs_info probes it again (and handles the failure) when it needs the title
+
+	def run_in_background(self, coro: Coroutine[Any, Any, Any]) -> None:
+		task = asyncio.create_task(coro)
+		# keep a reference until it's done, the event loop only holds weak references to tasks
+		self.background.add(task)
+		task.add_done_callback(self.background.discard)
+
+
+@dataclass
+class SnapshotElementHandles:
+	"""
+	ElementHandles of the current DOM snapshot's highlighted elements, keyed by highlight index.
+
+	Every DOM extraction starts a new snapshot token. The js backend publishes the snapshot's highlighted elements in the
+	page under that token and the DOMSnapshot backend records their backendNodeId, so get_locate_element can get a handle
+	in one or two round trips instead of building CSS selectors for the element and each of its iframe ancestors.
+	A stale token, a navigation or a detached element makes the lookup miss, and the selectors are used instead.
+	"""
+
+	token: str | None = None
+	page_key: int | None = None
+	handles: dict[int, ElementHandle] = field(default_factory=dict)
+
+	def reset(self, page: Page) -> str:
+		self.token = uuid7str()
+		self.page_key = id(page)
+		self.handles = {}
+		return self.token
+
+	def clear(self) -> None:
+		self.token = None
+		self.page_key = None
+		self.handles = {}
+
+
+@dataclass
+class NetworkIdleTracker:
+	"""
+	Tracks the in-flight requests that matter for a page settle and sets `idle` the moment none have been pending
+	for `idle_time` seconds.
+
+	Fed from CDP Network events (or Playwright's request/response events as a fallback). Instead of polling, every
+	change of the in-flight set (re)arms a single loop timer for the earliest moment the page could be idle.
+	`saw_activity` tells whether any relevant request happened at all, or the page was idle from the start.
+	The CDP-fed tracker of a page lives as long as its pooled session and is reset at the start of every wait.
+	"""
+
+	idle_time: float
+	pending: dict[Any, str] = field(default_factory=dict)
+	saw_activity: bool = False
+	idle: asyncio.Event = field(default_factory=asyncio.Event)
+	last_activity: float = field(default_factory=lambda: asyncio.get_running_loop().time())
+	_timer: asyncio.TimerHandle | None = field(default=None, repr=False)
+
+	def __post_init__(self) -> None:
+		self._schedule()
+
+	def request_started(self, request_id: Any, resource_type: str, url: str, headers: dict[str, Any]) -> None:
+		if resource_type not in NETWORK_IDLE_RESOURCE_TYPES:
+			return
+		# Filter out data URLs, blob URLs and the known background noise (ads, analytics, chat widgets, ...)
+		if url.startswith(('data:', 'blob:')) or NETWORK_IDLE_IGNORED_URL_RE.search(url):
+			return
+		# Filter out prefetches and media
+		if (headers.get('purpose') or headers.get('Purpose')) == 'prefetch' or (
+			headers.get('sec-fetch-dest') or headers.get('Sec-Fetch-Dest')
+		) in ('video', 'audio'):
+			return
+
+		self.pending[request_id] = url
+		self.saw_activity = True
+		self._mark_activity()
+
+	def response_received(self, request_id: Any, content_type: str, content_length: str | None) -> None:
+		if request_id not in self.pending:
+			return
+		del self.pending[request_id]
+
+		content_type = content_type.lower()
+		if (
+			NETWORK_IDLE_STREAMING_CONTENT_RE.search(content_type)
+			or not NETWORK_IDLE_RELEVANT_CONTENT_RE.search(content_type)
+			or (content_length and content_length.isdigit() and int(content_length) > NETWORK_IDLE_MAX_RESPONSE_SIZE)
+		):
+			# streaming, irrelevant or huge responses don't count as activity
+			self._schedule()
+		else:
+			self._mark_activity()
+
+	def request_failed(self, request_id: Any) -> None:
+		if self.pending.pop(request_id, None) is not None:
+			self._schedule()
+
+	def reset(self) -> None:
+		"""Start a new wait: forget the requests seen so far and count the idle time from now."""
+		self.pending.clear()
+		self.saw_activity = False
+		self.idle.clear()
+		self._mark_activity()
+
+	def close(self) -> None:
+		if self._timer is not None:
+			self._timer.cancel()
+			self._timer = None
+
+	def _mark_activity(self) -> None:
+		self.last_activity = asyncio.get_running_loop().time()
+		self._schedule()
+
+	def _schedule(self) -> None:
+		self.close()
+		if not self.pending:
+			self._timer = asyncio.get_running_loop().call_at(self.last_activity + self.idle_time, self.idle.set)
+		else:
+			self.idle.clear()
+
+	def on_cdp_request(self, event: dict[str, Any]) -> None:
+		request = event.get('request', {})
+		# a redirect re-uses the requestId of the original request, which simply stays pending
+		self.request_started(
+			event.get('requestId'), event.get('type', 'Other').lower(), request.get('url', ''), request.get('headers', {})
+		)
+
+	def on_cdp_response(self, event: dict[str, Any]) -> None:
+		response = event.get('response', {})
+		headers = response.get('headers', {})
+		content_length = headers.get('content-length') or headers.get('Content-Length')
+		self.response_received(event.get('requestId'), response.get('mimeType', ''), content_length)
+
+	def on_cdp_loading_failed(self, event: dict[str, Any]) -> None:
+		self.request_failed(event.get('requestId'))
 
 
 class BrowserSession(BaseModel):
@@ -262,6 +909,11 @@ class BrowserSession(BaseModel):
 		validation_alias=AliasChoices('playwright_browser_context', 'context'),
 		exclude=True,
 	)
+	shared_browser: InstanceOf[SharedBrowser] | None = Field(
+		default=None,
+		description='SharedBrowser pool to open an isolated BrowserContext in, instead of launching a browser for this session',
+		exclude=True,
+	)
 
 	# runtime state: state that changes during the lifecycle of a BrowserSession(), updated by the methods below
 	initialized: bool = Field(
@@ -290,6 +942,13 @@ class BrowserSession(BaseModel):
 	_owns_browser_resources: bool = PrivateAttr(default=True)  # True if this instance owns and should clean up browser resources
 	_auto_download_pdfs: bool = PrivateAttr(default=True)  # Auto-download PDFs when detected
 	_subprocess: Any = PrivateAttr(default=None)  # Chrome subprocess reference for error handling
+	_page_health: PageHealthMonitor = PrivateAttr(default_factory=PageHealthMonitor)
+	_cdp_sessions: CDPSessionPool = PrivateAttr(default_factory=CDPSessionPool)
+	_tab_cache: TabInfoCache = PrivateAttr(default_factory=TabInfoCache)
+	_snapshot_elements: SnapshotElementHandles = PrivateAttr(default_factory=SnapshotElementHandles)
+	_resource_blocker: ResourceBlocker | None = PrivateAttr(default=None)
+	# id(page) -> (page, pooled CDP session, tracker fed by its Network events)
+	_network_trackers: dict[int, tuple[Page, Any, NetworkIdleTracker]] = PrivateAttr(default_factory=dict)
 
 	@model_validator(mode='after')
 	def apply_session_overrides_to_profile(self) -> Self:
@@ -387,6 +1046,7 @@ class BrowserSession(BaseModel):
 			# Configure browser
 			await self._setup_viewports()
 			await self._setup_current_page_change_listeners()
+			await self._setup_resource_blocking()  # after the listeners opened a first tab if there was none
 			await self._start_context_tracing()
 
 			self.initialized = True
@@ -427,6 +1087,17 @@ class BrowserSession(BaseModel):
 			except Exception as e:
 				self.logger.warning(f'⚠️ Failed to save auth storage state before stopping: {type(e).__name__}: {e}')
 
+		# Flush the learned page settle times (saves are throttled while running)
+		settle_store = self._get_page_settle_store()
+		if settle_store is not None:
+			await settle_store.save(force=True)
+
+		if self.resource_blocking_stats and self.resource_blocking_stats.blocked_requests:
+			self.logger.info(
+				f'🚫 Blocked {self.resource_blocking_stats.blocked_requests} requests, '
+				f'~{self.resource_blocking_stats.estimated_bytes_saved / 1024 / 1024:.1f} MB saved'
+			)
+
 		if self.browser_profile.keep_alive:
 			self.logger.info(
 				'🕊️ BrowserSession.stop() called but keep_alive=True, leaving the browser running. Use .kill() to force close.'
@@ -466,7 +1137,9 @@ class BrowserSession(BaseModel):
 			try:
 				# IMPORTANT: Close context first to ensure HAR/video files are saved
 				await self._close_browser_context()
-				await self._close_browser()
+				# a shared browser is closed by its SharedBrowser pool, other sessions still use it
+				if self.shared_browser is None:
+					await self._close_browser()
 			except Exception as e:
 				if 'browser has been closed' not in str(e):
 					self.logger.warning(f'❌ Error closing browser: {type(e).__name__}: {e}')
@@ -760,6 +1433,12 @@ class BrowserSession(BaseModel):
 		if self.browser_context:
 			return
 
+		# Try opening an isolated context in a browser shared with other sessions
+		await self.setup_browser_via_shared_browser()
+		if self.browser_context:
+			await self.setup_new_browser_context()  # installs the init scripts in the new context
+			return
+
 		# Try connecting via browser PID
 		await self.setup_browser_via_browser_pid()
 		if self.browser_context:
@@ -878,6 +1557,16 @@ class BrowserSession(BaseModel):
 			self.logger.info(f'🎭 Connected to existing user-provided browser: {self.browser_context}')
 			self._set_browser_keep_alive(True)  # we connected to an existing browser, dont kill it at the end
 
+	async def setup_browser_via_shared_browser(self) -> None:
+		"""Open a new isolated browser_context in the SharedBrowser pool, if one was passed"""
+		if self.shared_browser is None:
+			return
+		assert self.playwright is not None, 'playwright instance is None'
+		self.browser, self.browser_context = await self.shared_browser.new_context(self.playwright, self.browser_profile)
+		self.logger.info(
+			f'🧩 Opened isolated browser_context #{self.shared_browser.contexts_in_use} in shared browser: {self.browser_context}'
+		)
+
 	async def setup_browser_via_browser_pid(self) -> None:
 		"""if browser_pid is provided, calcuclate its CDP URL by looking for --remote-debugging-port=... in its CLI args, then connect to it"""
 
@@ -1547,6 +2236,51 @@ class BrowserSession(BaseModel):
 					f'⚠️ Failed to add visibility listener to existing tab, is it crashed or ignoring CDP commands?: [{page_idx}]{page.url}: {type(e).__name__}: {e}'
 				)
 
+	async def _setup_resource_blocking(self) -> None:
+		"""Fail the requests matched by the resource_blocking preset and blocked_* options, for every page of the context."""
+		if self._resource_blocker is None:
+			self._resource_blocker = ResourceBlocker.from_profile(
+				self.browser_profile.resource_blocking,
+				resource_types=self.browser_profile.blocked_resource_types,
+				domains=self.browser_profile.blocked_domains,
+				domains_file=self.browser_profile.blocked_domains_file,
+			)
+		if self._resource_blocker is None:
+			return
+
+		assert self.browser_context is not None
+		blocker = self._resource_blocker
+		await self._cdp_sessions.add_attach_hook('resource_blocking', blocker.attach)
+		try:
+			# only the requests that may be blocked are intercepted, on the pooled session of each page (resource_blocking.py)
+			for page in self.browser_context.pages:
+				await self._cdp_sessions.get(page)
+			mechanism = 'CDP Fetch interception'
+		except Exception as e:
+			# no CDP (firefox, webkit): a route sees every request, at the cost of the HTTP cache and a trip through python
+			self.logger.debug(f'Failed to block requests over CDP, routing them through playwright: {type(e).__name__}: {e}')
+			await self.browser_context.route('**/*', blocker.handle_route)
+			mechanism = 'a context-wide route'
+		else:
+
+			async def attach_new_page(page: Page) -> None:
+				try:
+					await self._cdp_sessions.get(page)
+				except Exception as e:
+					self.logger.debug(f'Failed to block requests of new tab {_log_pretty_url(page.url)}: {type(e).__name__}: {e}')
+
+			self.browser_context.on('page', attach_new_page)
+
+		self.logger.debug(
+			f'🚫 Blocking resource types {sorted(blocker.resource_types)} and {len(blocker.domains)} domains '
+			f'with {mechanism} (resource_blocking={self.browser_profile.resource_blocking})'
+		)
+
+	@property
+	def resource_blocking_stats(self) -> ResourceBlockingStats | None:
+		"""Requests blocked and bytes saved (estimated) by the resource blocking options, None if nothing is blocked."""
+		return self._resource_blocker.stats if self._resource_blocker else None
+
 	@observe_debug(
 		ignore_input=True, ignore_output=True, name='setup_viewports', metadata={'browser_profile': '{{browser_profile}}'}
 	)
@@ -1643,9 +2377,9 @@ class BrowserSession(BaseModel):
 
 			# cdp api: https://chromedevtools.github.io/devtools-protocol/tot/Browser/#method-setWindowBounds
 			try:
-				cdp_session = await page.context.new_cdp_session(page)  # type: ignore
-				window_id_result = await cdp_session.send('Browser.getWindowForTarget')
-				await cdp_session.send(
+				window_id_result = await self._cdp_sessions.send(page, 'Browser.getWindowForTarget')
+				await self._cdp_sessions.send(
+					page,
 					'Browser.setWindowBounds',
 					{
 						'windowId': window_id_result['windowId'],
@@ -1655,10 +2389,6 @@ class BrowserSession(BaseModel):
 						},
 					},
 				)
-				try:
-					await asyncio.wait_for(cdp_session.detach(), timeout=1.0)
-				except (TimeoutError, Exception):
-					pass
 			except Exception as e:
 				_log_size = lambda size: f'{size["width"]}x{size["height"]}px'
 				try:
@@ -1749,6 +2479,11 @@ class BrowserSession(BaseModel):
 		self.agent_current_page = None
 		self.human_current_page = None
 		self._cached_clickable_element_hashes = None
+		self._page_health.clear()
+		self._cdp_sessions.clear()
+		self._tab_cache.clear()
+		self._snapshot_elements.clear()
+		self._network_trackers.clear()
 		# Reset CDP connection info when browser is stopped
 		self.cdp_url = None
 		self.browser_pid = None
@@ -1987,6 +2722,18 @@ class BrowserSession(BaseModel):
 
 		return self.agent_current_page
 
+	async def get_cdp_session(self, page: Page | None = None) -> Any:
+		"""Get the long-lived CDP session of a page (default: the current page), attaching it on first use."""
+		page = page or await self.get_current_page()
+		return await self._cdp_sessions.get(page)
+
+	async def get_performance_metrics(self, page: Page | None = None) -> dict[str, float]:
+		"""Get Chrome's Performance.getMetrics counters (JSHeapUsedSize, Nodes, LayoutCount, ...) for a page."""
+		page = page or await self.get_current_page()
+		await self._cdp_sessions.send(page, 'Performance.enable')
+		response = await self._cdp_sessions.send(page, 'Performance.getMetrics')
+		return {metric['name']: metric['value'] for metric in response.get('metrics', [])}
+
 	@property
 	def tabs(self) -> list[Page]:
 		if not self.browser_context:
@@ -2071,6 +2818,8 @@ class BrowserSession(BaseModel):
 			if element_handle is None:
 				raise Exception(f'Element: {repr(element_node)} not found')
 
+			click_point = await self._get_fast_click_point(page, element_node, element_handle)
+
 			async def perform_click(click_func):
 				"""Performs the actual click, handling both download and navigation scenarios."""
 
@@ -2116,6 +2865,23 @@ class BrowserSession(BaseModel):
 						)
 					await self._check_and_handle_navigation(page)
 
+			if click_point is not None:
+				# once the press went out the page may have reacted to it, clicking again could e.g. submit a form twice
+				dispatched: list[str] = []
+				try:
+					result = await perform_click(lambda: self._dispatch_click(page, *click_point, dispatched=dispatched))
+				except URLNotAllowedError as e:
+					raise e
+				except Exception as e:
+					if 'mousePressed' in dispatched:
+						raise
+					self.logger.debug(f'Fast coordinate click failed, using a regular click: {type(e).__name__}: {e}')
+				else:
+					# perform_click swallows click errors while it waits for a download
+					if 'mousePressed' in dispatched:
+						return result
+					self.logger.debug('Fast coordinate click failed, using a regular click')
+
 			try:
 				return await perform_click(lambda: element_handle and element_handle.click(timeout=1_500))
 			except URLNotAllowedError as e:
@@ -2165,45 +2931,103 @@ class BrowserSession(BaseModel):
 		except Exception as e:
 			raise Exception(f'Failed to click element: {repr(element_node)}. Error: {str(e)}')
 
+	async def _get_fast_click_point(
+		self, page: Page, element_node: DOMElementNode, element_handle: ElementHandle
+	) -> tuple[float, float] | None:
+		"""Where to click the element with raw mouse events, None if it needs the regular click with actionability checks."""
+		if not self.browser_profile.fast_coordinate_clicks or element_node.highlight_index is None:
+			return None
+		# only handles resolved from the current snapshot, those are in the main frame and already scrolled into view
+		if self._snapshot_elements.handles.get(element_node.highlight_index) is not element_handle:
+			return None
+		try:
+			await self._cdp_sessions.get(page)  # no CDP (e.g. firefox), no mouse events
+			click_point = await element_handle.evaluate(CLICK_POINT_JS)
+		except Exception:
+			return None
+		return (click_point[0], click_point[1]) if click_point else None
+
+	async def _dispatch_click(self, page: Page, x: float, y: float, dispatched: list[str] | None = None) -> None:
+		"""
+		Left click at viewport coordinates with Input.dispatchMouseEvent, moving the mouse there first for hover handlers.
+
+		The types of the events sent successfully are appended to dispatched, to tell a click that never reached the page
+		from one that failed half way.
+		"""
+		for event_type, button, click_count in (
+			('mouseMoved', 'none', 0),
+			('mousePressed', 'left', 1),
+			('mouseReleased', 'left', 1),
+		):
+			await self._cdp_sessions.send(
+				page,
+				'Input.dispatchMouseEvent',
+				{'type': event_type, 'x': x, 'y': y, 'button': button, 'clickCount': click_count},
+			)
+			if dispatched is not None:
+				dispatched.append(event_type)
+
 	@time_execution_async('--get_tabs_info')
 	@retry(timeout=6, retries=1)
 	@require_healthy_browser(usable_page=False, reopen_page=False)
 	async def get_tabs_info(self) -> list[TabInfo]:
-		"""Get information about all tabs"""
+		"""Get information about all tabs, probing in parallel only the tabs whose cached title is missing or stale"""
 		assert self.browser_context is not None, 'BrowserContext is not set up'
+		# tabs found dead while building the previous list are closed now, before the page_ids of the new list are assigned,
+		# instead of in the background while the LLM may still be using the previous ones
+		for page in list(self._tab_cache.unresponsive.values()):
+			await self._close_unresponsive_tab(page)
+
+		pages = list(self.browser_context.pages)
+		titles: list[str | BaseException | None] = []
+		for page in pages:
+			self._tab_cache.watch(page)
+			titles.append(self._tab_cache.cached_title(page, max_age=TAB_TITLE_MAX_AGE))
+
+		stale = [page_id for page_id, title in enumerate(titles) if title is None]
+		if stale:
+			probed = await asyncio.gather(*(self._tab_cache.refresh(pages[page_id]) for page_id in stale), return_exceptions=True)
+			for page_id, title in zip(stale, probed):
+				titles[page_id] = title
+
 		tabs_info = []
-		for page_id, page in enumerate(self.browser_context.pages):
-			try:
-				title = await asyncio.wait_for(page.title(), timeout=3.0)
-				tab_info = TabInfo(page_id=page_id, url=page.url, title=title)
-			except Exception:
-				# page.title() can hang forever on tabs that are crashed/disappeared/about:blank
-				# but we should preserve the real URL and not mislead the LLM about tab availability
-				self.logger.debug(
-					f'⚠️ Failed to get tab info for tab #{page_id}: {_log_pretty_url(page.url)} (using fallback title)'
-				)
+		for page_id, (page, title) in enumerate(zip(pages, titles)):
+			if isinstance(title, str):
+				tabs_info.append(TabInfo(page_id=page_id, url=page.url, title=title))
+				continue
 
-				# Only mark as unusable if it's actually about:blank, otherwise preserve the real URL
-				if page.url == 'about:blank':
-					tab_info = TabInfo(page_id=page_id, url='about:blank', title='ignore this tab and do not use it')
-				else:
-					# Preserve the real URL and use a descriptive fallback title
-					# fallback_title = '(title unavailable, page possibly crashed / unresponsive)'
-					# tab_info = TabInfo(page_id=page_id, url=page.url, title=fallback_title)
+			# page.title() can hang forever on tabs that are crashed/disappeared/about:blank
+			# but we should preserve the real URL and not mislead the LLM about tab availability
+			self.logger.debug(f'⚠️ Failed to get tab info for tab #{page_id}: {_log_pretty_url(page.url)} (using fallback title)')
+			if page.url == 'about:blank':
+				tabs_info.append(TabInfo(page_id=page_id, url='about:blank', title='ignore this tab and do not use it'))
+			else:
+				tabs_info.append(
+					TabInfo(page_id=page_id, url=page.url, title='(title unavailable, page possibly crashed / unresponsive)')
+				)
+				# find out off the critical path whether it's just slow or actually dead
+				self._tab_cache.run_in_background(self._find_unresponsive_tab(page))
 
-					# harsh but good, just close the page here because if we cant get the title then we certainly cant do anything else useful with it, no point keeping it open
-					try:
-						await page.close()
-						self.logger.debug(
-							f'🪓 Force-closed 🅟 {str(id(page))[-2:]} because its JS engine is unresponsive via CDP: {_log_pretty_url(page.url)}'
-						)
-					except Exception:
-						pass
-					continue
+		return tabs_info
 
-			tabs_info.append(tab_info)
+	async def _find_unresponsive_tab(self, page: Page) -> None:
+		"""Mark a tab whose title couldn't be read for closing if its JS engine doesn't answer either."""
+		try:
+			if not page.is_closed() and not await self._check_page_health(page):
+				self._tab_cache.unresponsive[id(page)] = page
+		except Exception:
+			pass
 
-		return tabs_info
+	async def _close_unresponsive_tab(self, page: Page) -> None:
+		"""Close a tab nothing useful can be done with anymore."""
+		self._tab_cache.unresponsive.pop(id(page), None)
+		try:
+			await page.close()
+			self.logger.debug(
+				f'🪓 Force-closed 🅟 {str(id(page))[-2:]} because its JS engine is unresponsive: {_log_pretty_url(page.url)}'
+			)
+		except Exception:
+			pass
 
 	@retry(timeout=20, retries=1, semaphore_limit=1, semaphore_scope='self')
 	async def _set_viewport_size(self, page: Page, viewport: dict[str, int] | ViewportSize) -> None:
@@ -2619,180 +3443,99 @@ class BrowserSession(BaseModel):
 	# 	"""
 	# 	return list(Path(self.browser_profile.downloads_path).glob('*'))
 
-	async def _wait_for_stable_network(self):
-		pending_requests = set()
-		last_activity = asyncio.get_event_loop().time()
+	async def _wait_for_stable_network(self, maximum_wait: float | None = None) -> tuple[float | None, bool]:
+		"""
+		Wait until the page's relevant network traffic has been idle for wait_for_network_idle_page_load_time.
 
+		Returns the settle time (seconds until the last relevant network activity) and whether the wait timed out.
+		The settle time is None when no relevant request (a navigation included) happened during the wait.
+		"""
+		maximum_wait = maximum_wait or self.browser_profile.maximum_wait_page_load_time
 		page = await self.get_current_page()
+		loop = asyncio.get_running_loop()
+		start_time = loop.time()
 
-		# Define relevant resource types and content types
-		RELEVANT_RESOURCE_TYPES = {
-			'document',
-			'stylesheet',
-			'image',
-			'font',
-			'script',
-			'iframe',
-		}
-
-		RELEVANT_CONTENT_TYPES = {
-			'text/html',
-			'text/css',
-			'application/javascript',
-			'image/',
-			'font/',
-			'application/json',
-		}
-
-		# Additional patterns to filter out
-		IGNORED_URL_PATTERNS = {
-			# Analytics and tracking
-			'analytics',
-			'tracking',
-			'telemetry',
-			'beacon',
-			'metrics',
-			# Ad-related
-			'doubleclick',
-			'adsystem',
-			'adserver',
-			'advertising',
-			# Social media widgets
-			'facebook.com/plugins',
-			'platform.twitter',
-			'linkedin.com/embed',
-			# Live chat and support
-			'livechat',
-			'zendesk',
-			'intercom',
-			'crisp.chat',
-			'hotjar',
-			# Push notifications
-			'push-notifications',
-			'onesignal',
-			'pushwoosh',
-			# Background sync/heartbeat
-			'heartbeat',
-			'ping',
-			'alive',
-			# WebRTC and streaming
-			'webrtc',
-			'rtmp://',
-			'wss://',
-			# Common CDNs for dynamic content
-			'cloudfront.net',
-			'fastly.net',
-		}
-
-		async def on_request(request):
-			# Filter by resource type
-			if request.resource_type not in RELEVANT_RESOURCE_TYPES:
-				return
-
-			# Filter out streaming, websocket, and other real-time requests
-			if request.resource_type in {
-				'websocket',
-				'media',
-				'eventsource',
-				'manifest',
-				'other',
-			}:
-				return
-
-			# Filter out by URL patterns
-			url = request.url.lower()
-			if any(pattern in url for pattern in IGNORED_URL_PATTERNS):
-				return
-
-			# Filter out data URLs and blob URLs
-			if url.startswith(('data:', 'blob:')):
-				return
-
-			# Filter out requests with certain headers
-			headers = request.headers
-			if headers.get('purpose') == 'prefetch' or headers.get('sec-fetch-dest') in [
-				'video',
-				'audio',
-			]:
-				return
-
-			nonlocal last_activity
-			pending_requests.add(request)
-			last_activity = asyncio.get_event_loop().time()
-			# self.logger.debug(f'Request started: {request.url} ({request.resource_type})')
-
-		async def on_response(response):
-			request = response.request
-			if request not in pending_requests:
-				return
+		# the pooled session stays Network-enabled and keeps feeding the page's tracker, a wait only resets it
+		tracker = None
+		try:
+			await self._cdp_sessions.add_attach_hook('network_idle', self._track_network_events)
+			cdp_session = await self._cdp_sessions.get(page)
+			entry = self._network_trackers.get(id(page))
+			if entry is not None and entry[1] is cdp_session:
+				tracker = entry[2]
+		except Exception as e:
+			self.logger.debug(f'Failed to track network idle over CDP, using page events: {type(e).__name__}: {e}')
 
-			# Filter by content type if available
-			content_type = response.headers.get('content-type', '').lower()
-
-			# Skip if content type indicates streaming or real-time data
-			if any(
-				t in content_type
-				for t in [
-					'streaming',
-					'video',
-					'audio',
-					'webm',
-					'mp4',
-					'event-stream',
-					'websocket',
-					'protobuf',
-				]
-			):
-				pending_requests.remove(request)
-				return
+		if tracker is not None:
+			tracker.reset()
+			use_cdp = True
+		else:
+			tracker = NetworkIdleTracker(idle_time=self.browser_profile.wait_for_network_idle_page_load_time)
+			use_cdp = False
 
-			# Only process relevant content types
-			if not any(ct in content_type for ct in RELEVANT_CONTENT_TYPES):
-				pending_requests.remove(request)
-				return
+		def on_request(request) -> None:
+			tracker.request_started(request, request.resource_type, request.url, request.headers)
 
-			# Skip if response is too large (likely not essential for page load)
-			content_length = response.headers.get('content-length')
-			if content_length and int(content_length) > 5 * 1024 * 1024:  # 5MB
-				pending_requests.remove(request)
-				return
+		def on_response(response) -> None:
+			tracker.response_received(
+				response.request, response.headers.get('content-type', ''), response.headers.get('content-length')
+			)
 
-			nonlocal last_activity
-			pending_requests.remove(request)
-			last_activity = asyncio.get_event_loop().time()
-			# self.logger.debug(f'Request resolved: {request.url} ({content_type})')
+		def on_request_failed(request) -> None:
+			tracker.request_failed(request)
 
-		# Attach event listeners
-		page.on('request', on_request)
-		page.on('response', on_response)
+		if not use_cdp:
+			page.on('request', on_request)
+			page.on('response', on_response)
+			page.on('requestfailed', on_request_failed)
 
-		now = asyncio.get_event_loop().time()
+		timed_out = False
 		try:
-			# Wait for idle time
-			start_time = asyncio.get_event_loop().time()
-			while True:
-				await asyncio.sleep(0.1)
-				now = asyncio.get_event_loop().time()
-				if (
-					len(pending_requests) == 0
-					and (now - last_activity) >= self.browser_profile.wait_for_network_idle_page_load_time
-				):
-					break
-				if now - start_time > self.browser_profile.maximum_wait_page_load_time:
-					self.logger.debug(
-						f'{self} Network timeout after {self.browser_profile.maximum_wait_page_load_time}s with {len(pending_requests)} '
-						f'pending requests: {[r.url for r in pending_requests]}'
-					)
-					break
-
+			await asyncio.wait_for(tracker.idle.wait(), timeout=maximum_wait)
+		except TimeoutError:
+			timed_out = True
+			self.logger.debug(
+				f'{self} Network timeout after {maximum_wait:.2f}s with {len(tracker.pending)} '
+				f'pending requests: {list(tracker.pending.values())}'
+			)
 		finally:
-			# Clean up event listeners
-			page.remove_listener('request', on_request)
-			page.remove_listener('response', on_response)
-
-		elapsed = now - start_time
+			tracker.close()
+			if not use_cdp:
+				page.remove_listener('request', on_request)
+				page.remove_listener('response', on_response)
+				page.remove_listener('requestfailed', on_request_failed)
+
+		elapsed = loop.time() - start_time
+		if timed_out:
+			return elapsed, True
 		if elapsed > 1:
-			self.logger.debug(f'💤 Page network traffic calmed down after {now - start_time:.2f} seconds')
+			self.logger.debug(f'💤 Page network traffic calmed down after {elapsed:.2f} seconds')
+		if not tracker.saw_activity:
+			return None, False
+		return max(tracker.last_activity - start_time, 0.0), False
+
+	def _get_page_settle_store(self) -> PageSettleStore | None:
+		"""The per-origin settle time statistics, if BrowserProfile(adaptive_page_load_timing=True)."""
+		if not self.browser_profile.adaptive_page_load_timing:
+			return None
+		return get_page_settle_store(self.browser_profile.page_load_timing_path)
+
+	async def _track_network_events(self, page: Page, cdp_session: Any) -> None:
+		"""CDPSessionPool attach hook: feed the page's NetworkIdleTracker from the Network events of its pooled session."""
+		entry = self._network_trackers.get(id(page))
+		if entry is not None and entry[0] is page:
+			tracker = entry[2]
+		else:
+			tracker = NetworkIdleTracker(idle_time=self.browser_profile.wait_for_network_idle_page_load_time)
+		cdp_session.on('Network.requestWillBeSent', tracker.on_cdp_request)
+		cdp_session.on('Network.responseReceived', tracker.on_cdp_response)
+		cdp_session.on('Network.loadingFailed', tracker.on_cdp_loading_failed)
+		await cdp_session.send('Network.enable')
+
+		for key, (other_page, _, _) in list(self._network_trackers.items()):
+			if other_page.is_closed():
+				del self._network_trackers[key]
+		self._network_trackers[id(page)] = (page, cdp_session, tracker)
 
 	@observe_debug(ignore_input=True, ignore_output=True, name='wait_for_page_and_frames_load')
 	async def _wait_for_page_and_frames_load(self, timeout_overwrite: float | None = None):
@@ -2806,8 +3549,17 @@ class BrowserSession(BaseModel):
 
 		# Wait for page load
 		page = await self.get_current_page()
+		minimum_wait = self.browser_profile.minimum_wait_page_load_time
+		maximum_wait = self.browser_profile.maximum_wait_page_load_time
+		settle_store = self._get_page_settle_store()
+		if settle_store is not None:
+			minimum_wait, maximum_wait = settle_store.waits_for(page.url, minimum_wait, maximum_wait)
 		try:
-			await self._wait_for_stable_network()
+			settle_time, timed_out = await self._wait_for_stable_network(maximum_wait=maximum_wait)
+			# an idle page (nothing was loading, e.g. a click that didn't navigate) says nothing about how long it takes to settle
+			if settle_store is not None and settle_time is not None:
+				settle_store.record(page.url, settle_time, timed_out=timed_out)
+				await settle_store.save()
 
 			# Check if the loaded URL is allowed
 			await self._check_and_handle_navigation(page)
@@ -2820,7 +3572,7 @@ class BrowserSession(BaseModel):
 
 		# Calculate remaining time to meet minimum WAIT_TIME
 		elapsed = time.time() - start_time
-		remaining = max((timeout_overwrite or self.browser_profile.minimum_wait_page_load_time) - elapsed, 0)
+		remaining = max((timeout_overwrite or minimum_wait) - elapsed, 0)
 
 		# Skip expensive performance API logging - can cause significant delays on complex pages
 		bytes_used = None
@@ -2863,21 +3615,17 @@ class BrowserSession(BaseModel):
 		if is_new_tab_page(url):
 			return True
 
-		for allowed_domain in self.browser_profile.allowed_domains:
-			try:
-				if match_url_with_domain_pattern(url, allowed_domain, log_warnings=True):
-					# If it's a pattern with wildcards, show a warning
-					if '*' in allowed_domain:
-						parsed_url = urlparse(url)
-						domain = parsed_url.hostname.lower() if parsed_url.hostname else ''
-						_log_glob_warning(domain, allowed_domain, self.logger)
-					return True
-			except AssertionError:
-				# This would only happen if a new tab page is passed to match_url_with_domain_pattern,
-				# which shouldn't occur since we check for it above
-				continue
+		matcher = get_domain_pattern_matcher(tuple(self.browser_profile.allowed_domains), log_warnings=True)
+		matching_patterns = matcher.match(url)
+		if not matching_patterns:
+			return False
 
-		return False
+		# If it's a pattern with wildcards, show a warning
+		if '*' in matching_patterns[0]:
+			parsed_url = urlparse(url)
+			domain = parsed_url.hostname.lower() if parsed_url.hostname else ''
+			_log_glob_warning(domain, matching_patterns[0], self.logger)
+		return True
 
 	async def _check_and_handle_navigation(self, page: Page) -> None:
 		"""Check if current page URL is allowed and handle if not."""
@@ -3052,7 +3800,9 @@ class BrowserSession(BaseModel):
 	@observe_debug(ignore_input=True, ignore_output=True)
 	@time_execution_async('--get_state_summary')
 	@require_healthy_browser(usable_page=True, reopen_page=True)
-	async def get_state_summary(self, cache_clickable_elements_hashes: bool) -> BrowserStateSummary:
+	async def get_state_summary(
+		self, cache_clickable_elements_hashes: bool, capture: StateCaptureSpec | None = None
+	) -> BrowserStateSummary:
 		self.logger.debug('🔄 Starting get_state_summary...')
 		"""Get a summary of the current browser state
 
@@ -3065,27 +3815,27 @@ class BrowserSession(BaseModel):
 			If True, cache the clickable elements hashes for the current state.
 			This is used to calculate which elements are new to the LLM since the last message,
 			which helps reduce token usage.
+		capture: StateCaptureSpec | None
+			Which optional parts (screenshot, highlights, tabs, page info) to capture, everything by default.
 		"""
 		await self._wait_for_page_and_frames_load()
-		updated_state = await self._get_updated_state()
+		updated_state = await self._get_updated_state(capture=capture)
 
 		# Find out which elements are new
 		# Do this only if url has not changed
 		if cache_clickable_elements_hashes:
+			# hashed once top-down for the whole snapshot, shared with multi_act via BrowserStateSummary.element_hashes
+			element_hashes = updated_state.element_hashes
 			# if we are on the same url as the last state, we can use the cached hashes
 			if self._cached_clickable_element_hashes and self._cached_clickable_element_hashes.url == updated_state.url:
 				# Pointers, feel free to edit in place
-				updated_state_clickable_elements = ClickableElementProcessor.get_clickable_elements(updated_state.element_tree)
-
-				for dom_element in updated_state_clickable_elements:
-					dom_element.is_new = (
-						ClickableElementProcessor.hash_dom_element(dom_element)
-						not in self._cached_clickable_element_hashes.hashes  # see which elements are new from the last state where we cached the hashes
-					)
+				for highlight_index, dom_element in updated_state.selector_map.items():
+					# see which elements are new from the last state where we cached the hashes
+					dom_element.is_new = element_hashes.get(highlight_index) not in self._cached_clickable_element_hashes.hashes
 			# in any case, we need to cache the new hashes
 			self._cached_clickable_element_hashes = CachedClickableElementHashes(
 				url=updated_state.url,
-				hashes=ClickableElementProcessor.get_clickable_elements_hashes(updated_state.element_tree),
+				hashes=set(element_hashes.values()),
 			)
 
 		assert updated_state
@@ -3096,8 +3846,8 @@ class BrowserSession(BaseModel):
 	@observe_debug(ignore_input=True, ignore_output=True, name='get_minimal_state_summary')
 	@require_healthy_browser(usable_page=True, reopen_page=True)
 	@time_execution_async('--get_minimal_state_summary')
-	async def get_minimal_state_summary(self) -> BrowserStateSummary:
-		"""Get basic page info without DOM processing, but try to capture screenshot"""
+	async def get_minimal_state_summary(self, capture: StateCaptureSpec | None = None) -> BrowserStateSummary:
+		"""Get basic page info without DOM processing"""
 		from browser_use.browser.views import BrowserStateSummary
 		from browser_use.dom.views import DOMElementNode
 
@@ -3116,7 +3866,7 @@ class BrowserSession(BaseModel):
 		# Try to get tabs info safely
 		try:
 			# timeout after 2 seconds
-			tabs_info = await retry(timeout=2, retries=0)(self.get_tabs_info)()
+			tabs_info = await retry(timeout=2, retries=0)(self.get_tabs_info)() if (capture or StateCaptureSpec()).tabs else []
 		except Exception:
 			tabs_info = []
 
@@ -3142,70 +3892,111 @@ class BrowserSession(BaseModel):
 		)
 
 	@observe_debug(ignore_input=True, ignore_output=True, name='get_updated_state')
-	async def _get_updated_state(self, focus_element: int = -1) -> BrowserStateSummary:
-		"""Update and return state."""
+	async def _get_updated_state(self, focus_element: int = -1, capture: StateCaptureSpec | None = None) -> BrowserStateSummary:
+		"""Update and return state.
+
+		A single evaluate (STATE_PROBE_JS) checks the page is accessible, clears the old highlights and reads the
+		page info, scroll position, title and PDF status. The independent stages then run concurrently:
+		DOM extraction followed by the screenshot (which has to capture the fresh highlights), the tabs list
+		and the PDF auto-download. Per-stage durations end up in BrowserStateSummary.capture_timings.
+		Stages the capture spec leaves out are skipped entirely.
+		"""
+		capture = capture or StateCaptureSpec()
 
 		# Check if current page is still valid, if not switch to another available page
 		page = await self.get_current_page()
 
+		capture_timings: dict[str, float] = {}
+		capture_start = time.perf_counter()
+
+		async def timed(stage: str, awaitable):
+			stage_start = time.perf_counter()
+			try:
+				return await awaitable
+			finally:
+				capture_timings[stage] = time.perf_counter() - stage_start
+
 		try:
 			# Test if page is still accessible
 			# NOTE: This also happens on invalid urls like www.sadfdsafdssdafd.com
-			await asyncio.wait_for(page.evaluate('1'), timeout=2.5)
+			self.logger.debug('🧹 Removing highlights and probing page state...')
+			page_state = await timed('probe', asyncio.wait_for(page.evaluate(STATE_PROBE_JS), timeout=2.5))
 		except Exception as e:
 			self.logger.debug(f'👋 Current page is not accessible: {type(e).__name__}: {e}')
 			raise BrowserError('Page is not accessible')
+		# the probe reads the title anyway, keep the tab cache fresh so get_tabs_info doesn't ask the page again
+		self._tab_cache.update(page, page_state.get('title') or '')
 
 		try:
-			self.logger.debug('🧹 Removing highlights...')
-			try:
-				await self.remove_highlights()
-			except TimeoutError:
-				self.logger.debug('Timeout to remove highlights')
 
-			# Check for PDF and auto-download if needed
-			try:
-				pdf_path = await self._auto_download_pdf_if_needed(page)
-				if pdf_path:
-					self.logger.info(f'📄 PDF auto-downloaded: {pdf_path}')
-			except Exception as e:
-				self.logger.debug(f'PDF auto-download check failed: {type(e).__name__}: {e}')
-
-			self.logger.debug('🌳 Starting DOM processing...')
-			dom_service = DomService(page, logger=self.logger)
-			try:
-				content = await asyncio.wait_for(
-					dom_service.get_clickable_elements(
-						focus_element=focus_element,
-						viewport_expansion=self.browser_profile.viewport_expansion,
-						highlight_elements=self.browser_profile.highlight_elements,
-					),
-					timeout=45.0,  # 45 second timeout for DOM processing - generous for complex pages
-				)
-				self.logger.debug('✅ DOM processing completed')
-			except TimeoutError:
-				self.logger.warning(f'DOM processing timed out after 45 seconds for {page.url}')
-				self.logger.warning('🔄 Falling back to minimal DOM state to allow basic navigation...')
-
-				# Create minimal DOM state for basic navigation
-				from browser_use.dom.views import DOMElementNode
-
-				minimal_element_tree = DOMElementNode(
-					tag_name='body',
-					xpath='/body',
-					attributes={},
-					children=[],
-					is_visible=True,
-					parent=None,
-				)
+			async def auto_download_pdf() -> None:
+				# Check for PDF and auto-download if needed
+				try:
+					pdf_path = await self._auto_download_pdf_if_needed(page, is_pdf_viewer=bool(page_state.get('is_pdf')))
+					if pdf_path:
+						self.logger.info(f'📄 PDF auto-downloaded: {pdf_path}')
+				except Exception as e:
+					self.logger.debug(f'PDF auto-download check failed: {type(e).__name__}: {e}')
 
-				from browser_use.dom.views import DOMState
+			async def extract_dom() -> DOMState:
+				self.logger.debug('🌳 Starting DOM processing...')
+				dom_service = DomService(page, logger=self.logger, get_cdp_session=partial(self._cdp_sessions.get, page))
+				try:
+					content = await asyncio.wait_for(
+						dom_service.get_clickable_elements(
+							focus_element=focus_element,
+							viewport_expansion=self.browser_profile.viewport_expansion,
+							highlight_elements=self.browser_profile.highlight_elements and capture.highlights,
+							incremental=self.browser_profile.incremental_dom_snapshots,
+							compact=self.browser_profile.compact_dom_transport,
+							backend=self.browser_profile.dom_extraction_backend,
+							registry_token=self._snapshot_elements.reset(page),
+						),
+						timeout=45.0,  # 45 second timeout for DOM processing - generous for complex pages
+					)
+					self.logger.debug('✅ DOM processing completed')
+					return content
+				except TimeoutError:
+					self.logger.warning(f'DOM processing timed out after 45 seconds for {page.url}')
+					self.logger.warning('🔄 Falling back to minimal DOM state to allow basic navigation...')
+
+					# Create minimal DOM state for basic navigation
+					minimal_element_tree = DOMElementNode(
+						tag_name='body',
+						xpath='/body',
+						attributes={},
+						children=[],
+						is_visible=True,
+						parent=None,
+					)
+					return DOMState(element_tree=minimal_element_tree, selector_map={})
 
-				content = DOMState(element_tree=minimal_element_tree, selector_map={})
+			async def capture_screenshot() -> str | None:
+				try:
+					self.logger.debug('📸 Capturing screenshot...')
+					# Reasonable timeout for screenshot
+					return await self.take_screenshot()
+				except Exception as e:
+					self.logger.warning(f'❌ Screenshot failed for {_log_pretty_url(page.url)}: {type(e).__name__} {e}')
+					return None
 
-			self.logger.debug('📋 Getting tabs info...')
-			tabs_info = await self.get_tabs_info()
-			self.logger.debug('✅ Tabs info completed')
+			async def extract_dom_then_screenshot() -> tuple[DOMState, str | None]:
+				# the screenshot has to wait for the DOM extraction, it's the one drawing the highlights the LLM sees
+				content = await timed('dom', extract_dom())
+				screenshot_b64 = await timed('screenshot', capture_screenshot()) if capture.screenshot else None
+				return content, screenshot_b64
+
+			async def get_tabs() -> list[TabInfo]:
+				self.logger.debug('📋 Getting tabs info...')
+				tabs_info = await self.get_tabs_info()
+				self.logger.debug('✅ Tabs info completed')
+				return tabs_info
+
+			(content, screenshot_b64), tabs_info, _ = await asyncio.gather(
+				extract_dom_then_screenshot(),
+				timed('tabs', get_tabs()) if capture.tabs else asyncio.sleep(0, result=[]),
+				timed('pdf', auto_download_pdf()),
+			)
 
 			# Get all cross-origin iframes within the page and open them in new tabs
 			# mark the titles of the new tabs so the LLM knows to check them for additional content
@@ -3228,29 +4019,11 @@ class BrowserSession(BaseModel):
 			# 		)
 			# 	)
 
-			try:
-				self.logger.debug('📸 Capturing screenshot...')
-				# Reasonable timeout for screenshot
-				screenshot_b64 = await self.take_screenshot()
-				# self.logger.debug('✅ Screenshot completed')
-			except Exception as e:
-				self.logger.warning(f'❌ Screenshot failed for {_log_pretty_url(page.url)}: {type(e).__name__} {e}')
-				screenshot_b64 = None
-
-			# Get comprehensive page information
-			page_info = await self.get_page_info(page)
-			try:
-				self.logger.debug('📏 Getting scroll info...')
-				pixels_above, pixels_below = await asyncio.wait_for(self.get_scroll_info(page), timeout=5.0)
-				self.logger.debug('✅ Scroll info completed')
-			except Exception as e:
-				self.logger.warning(f'Failed to get scroll info: {type(e).__name__}')
-				pixels_above, pixels_below = 0, 0
-
-			try:
-				title = await asyncio.wait_for(page.title(), timeout=3.0)
-			except Exception:
-				title = 'Title unavailable'
+			page_info = self._page_info_from_dimensions(page_state) if capture.page_info else None
+			# legacy scroll fields, measured against the documentElement only
+			pixels_above = int(page_state['scroll_y'])
+			pixels_below = int(max(0, page_state['document_height'] - (page_state['scroll_y'] + page_state['viewport_height'])))
+			title = page_state.get('title') or ''
 
 			# Check if this is a minimal fallback state
 			browser_errors = []
@@ -3259,6 +4032,11 @@ class BrowserSession(BaseModel):
 					f'DOM processing timed out for {page.url} - using minimal state. Basic navigation still available via go_to_url, scroll, and search actions.'
 				)
 
+			capture_timings['total'] = time.perf_counter() - capture_start
+			self.logger.debug(
+				'⏱️ State capture stages: ' + ', '.join(f'{stage}={seconds:.2f}s' for stage, seconds in capture_timings.items())
+			)
+
 			self.browser_state_summary = BrowserStateSummary(
 				element_tree=content.element_tree,
 				selector_map=content.selector_map,
@@ -3270,6 +4048,7 @@ class BrowserSession(BaseModel):
 				pixels_above=pixels_above,
 				pixels_below=pixels_below,
 				browser_errors=browser_errors,
+				capture_timings=capture_timings,
 			)
 
 			self.logger.debug('✅ get_state_summary completed successfully')
@@ -3282,6 +4061,12 @@ class BrowserSession(BaseModel):
 			raise
 
 	# region - Page Health Check Helpers
+	async def _check_page_health(self, page: Page) -> bool:
+		"""Responsiveness check used by @require_healthy_browser, coalesced through the PageHealthMonitor."""
+		if self.browser_context:
+			self._page_health.watch(page, self._cdp_sessions, self.logger)
+		return await self._page_health.check(page, self._is_page_responsive, ttl=self.browser_profile.page_health_check_ttl)
+
 	@observe_debug(ignore_input=True)
 	async def _is_page_responsive(self, page: Page, timeout: float = 5.0) -> bool:
 		"""Check if a page is responsive by trying to evaluate simple JavaScript."""
@@ -3576,28 +4361,21 @@ class BrowserSession(BaseModel):
 			pass
 
 		# Take screenshot using CDP to get around playwright's unnecessary slowness and weird behavior
-		cdp_session = None
+		screenshot_format = self.browser_profile.screenshot_format
 		try:
-			# Create CDP session for the screenshot
 			self.logger.debug(
-				f'📸 Taking viewport-only PNG screenshot of page via fresh CDP session: {_log_pretty_url(page.url)}'
+				f'📸 Taking viewport-only {screenshot_format.upper()} screenshot of page via CDP: {_log_pretty_url(page.url)}'
 			)
-			cdp_session = await self.browser_context.new_cdp_session(page)  # type: ignore
 
-			# Capture screenshot via CDP
-			screenshot_response = await cdp_session.send(
-				'Page.captureScreenshot',
-				{
-					'captureBeyondViewport': False,
-					'fromSurface': True,
-					'format': 'png',
-				},
+			# Capture screenshot via the page's pooled CDP session
+			screenshot_response = await self._cdp_sessions.send(
+				page, 'Page.captureScreenshot', await self._get_screenshot_params(page)
 			)
 
 			screenshot_b64 = screenshot_response.get('data')
 			if not screenshot_b64:
 				raise Exception(
-					f'CDP returned empty screenshot data for page {_log_pretty_url(page.url)}? (expected png base64)'
+					f'CDP returned empty screenshot data for page {_log_pretty_url(page.url)}? (expected {screenshot_format})'
 				)  # have never seen this happen in practice
 
 			return screenshot_b64
@@ -3608,13 +4386,42 @@ class BrowserSession(BaseModel):
 				self.logger.warning(f'⏱️ Screenshot timed out on page {_log_pretty_url(page.url)} (possibly crashed): {error_str}')
 			else:
 				self.logger.error(f'❌ Screenshot failed on page {_log_pretty_url(page.url)} (possibly crashed): {error_str}')
+			# don't keep reusing a session that may be wedged on a crashed page
+			self._cdp_sessions.invalidate(page)
 			raise
-		finally:
-			if cdp_session:
-				try:
-					await asyncio.wait_for(cdp_session.detach(), timeout=1.0)
-				except Exception:
-					pass
+
+	async def _get_screenshot_params(self, page: Page) -> dict[str, Any]:
+		"""Page.captureScreenshot params for the screenshot_* options of the BrowserProfile."""
+		profile = self.browser_profile
+		params: dict[str, Any] = {
+			'captureBeyondViewport': False,
+			'fromSurface': True,
+			'format': profile.screenshot_format,
+		}
+		if profile.screenshot_format != 'png' and profile.screenshot_quality is not None:
+			params['quality'] = profile.screenshot_quality
+
+		# downscaling needs an explicit clip, CDP only applies clip.scale to clipped captures
+		if not (profile.screenshot_max_dimension or profile.screenshot_clip_to_viewport):
+			return params
+
+		layout_metrics = await self._cdp_sessions.send(page, 'Page.getLayoutMetrics')
+		css_viewport = layout_metrics['cssVisualViewport']
+		width, height = css_viewport['clientWidth'], css_viewport['clientHeight']
+		scale = 1.0
+		if profile.screenshot_max_dimension:
+			# visualViewport is in device pixels, cssVisualViewport in CSS pixels
+			device_pixel_ratio = layout_metrics.get('visualViewport', {}).get('clientWidth', width) / (width or 1)
+			largest_side = max(width, height) * (device_pixel_ratio or 1)
+			scale = min(1.0, profile.screenshot_max_dimension / largest_side) if largest_side else 1.0
+		params['clip'] = {
+			'x': css_viewport['pageX'],
+			'y': css_viewport['pageY'],
+			'width': width,
+			'height': height,
+			'scale': scale,
+		}
+		return params
 
 	# region - User Actions
 
@@ -3826,10 +4633,72 @@ class BrowserSession(BaseModel):
 
 		return not is_hidden and bbox is not None and bbox['width'] > 0 and bbox['height'] > 0
 
+	async def _get_snapshot_element_handle(self, page: Page, element: DOMElementNode) -> ElementHandle | None:
+		"""Resolve an element of the current DOM snapshot without selectors, None if it isn't one or it went away."""
+		snapshot, state, index = self._snapshot_elements, self._cached_browser_state_summary, element.highlight_index
+		token = snapshot.token
+		if (
+			index is None
+			or token is None
+			or snapshot.page_key != id(page)
+			or state is None
+			or state.selector_map.get(index) is not element
+		):
+			return None
+
+		# handles to nodes of other frames' documents don't work with Playwright's actions, leave those to the frame locators
+		if element.frame_id is not None:
+			if element.frame_id != state.element_tree.frame_id:
+				return None
+		else:
+			parent = element.parent
+			while parent is not None:
+				if parent.tag_name == 'iframe':
+					return None
+				parent = parent.parent
+
+		try:
+			element_handle = snapshot.handles.get(index)
+			if element_handle is not None:
+				if await element_handle.evaluate(PREPARE_SNAPSHOT_ELEMENT_JS):
+					return element_handle
+				snapshot.handles.pop(index, None)
+				return None
+
+			if element.backend_node_id is not None:
+				# Playwright can't adopt a CDP object id as an ElementHandle, hand the node over through the page's registry
+				resolved = await self._cdp_sessions.send(page, 'DOM.resolveNode', {'backendNodeId': element.backend_node_id})
+				await self._cdp_sessions.send(
+					page,
+					'Runtime.callFunctionOn',
+					{
+						'objectId': resolved['object']['objectId'],
+						'functionDeclaration': REGISTER_SNAPSHOT_ELEMENT_JS,
+						'arguments': [{'value': token}, {'value': index}],
+					},
+				)
+			element_handle = (
+				await page.evaluate_handle(RESOLVE_SNAPSHOT_ELEMENT_JS, [token, index, element.tag_name])
+			).as_element()
+		except Exception as e:
+			self.logger.debug(
+				f'Failed to resolve element {index} from the DOM snapshot, using selectors: {type(e).__name__}: {e}'
+			)
+			snapshot.handles.pop(index, None)
+			return None
+
+		if element_handle is not None and snapshot.token == token:
+			snapshot.handles[index] = element_handle
+		return element_handle
+
 	@require_healthy_browser(usable_page=True, reopen_page=True)
 	@time_execution_async('--get_locate_element')
 	async def get_locate_element(self, element: DOMElementNode) -> ElementHandle | None:
 		page = await self.get_current_page()
+		element_handle = await self._get_snapshot_element_handle(page, element)
+		if element_handle is not None:
+			return element_handle
+
 		current_frame = page
 
 		# Start with the target element and collect all parents
@@ -4019,13 +4888,18 @@ class BrowserSession(BaseModel):
 			except Exception:
 				pass
 
+			input_strategy = await self._choose_input_strategy(element_handle, text)
+
 			# let's first try to click and type
 			try:
 				await element_handle.evaluate('el => {el.textContent = ""; el.value = "";}')
 				await element_handle.click()
-				await asyncio.sleep(0.1)  # Increased sleep time
 				page = await self.get_current_page()
-				await page.keyboard.type(text)
+				if input_strategy == 'insert':
+					await self._insert_text(page, element_handle, text)
+				else:
+					await asyncio.sleep(0.1)  # Increased sleep time
+					await page.keyboard.type(text)
 				return
 			except Exception as e:
 				self.logger.debug(f'Input text with click and type failed, trying element handle method: {e}')
@@ -4044,7 +4918,10 @@ class BrowserSession(BaseModel):
 			try:
 				if (await is_contenteditable.json_value() or tag_name == 'input') and not (readonly or disabled):
 					await element_handle.evaluate('el => {el.textContent = ""; el.value = "";}')
-					await element_handle.type(text, delay=5)
+					if input_strategy == 'insert':
+						await element_handle.fill(text)
+					else:
+						await element_handle.type(text, delay=5)
 				else:
 					await element_handle.fill(text)
 			except Exception as e:
@@ -4064,6 +4941,34 @@ class BrowserSession(BaseModel):
 			)
 			raise BrowserError(f'Failed to input text into index {element_node.highlight_index}')
 
+	async def _choose_input_strategy(self, element_handle: ElementHandle, text: str) -> Literal['type', 'insert']:
+		"""
+		Type short texts key by key like a user would, insert long plain texts in one go.
+
+		Typing sends one key event per character, seconds for a long message. It's kept for fields that react to single
+		keystrokes (autocomplete widgets, comboboxes, key listeners on the element) even when the text is long.
+		"""
+		threshold = self.browser_profile.bulk_text_input_threshold
+		if threshold is None or len(text) < threshold:
+			return 'type'
+		try:
+			probe = await element_handle.evaluate(INPUT_STRATEGY_PROBE_JS)
+		except Exception:
+			return 'type'
+		return 'insert' if probe['takesText'] and not probe['needsKeystrokes'] else 'type'
+
+	async def _insert_text(self, page: Page, element_handle: ElementHandle, text: str) -> None:
+		"""Insert text into the focused element at once: CDP Input.insertText, else the native value setter, else typing."""
+		self.logger.debug(f'⌨️ Inserting {len(text)} characters in one go instead of typing them')
+		try:
+			# fires beforeinput/input like a committed IME composition, works for inputs, textareas and contenteditables
+			await self._cdp_sessions.send(page, 'Input.insertText', {'text': text})
+			return
+		except Exception as e:
+			self.logger.debug(f'Input.insertText failed, setting the value directly: {type(e).__name__}: {e}')
+		if not await element_handle.evaluate(SET_NATIVE_VALUE_JS, text):
+			await page.keyboard.type(text)
+
 	@require_healthy_browser(usable_page=True, reopen_page=True)
 	@time_execution_async('--switch_to_tab')
 	async def switch_to_tab(self, page_id: int) -> Page:
@@ -4118,6 +5023,12 @@ class BrowserSession(BaseModel):
 			return {}
 		return self._cached_browser_state_summary.selector_map
 
+	async def get_element_hashes(self) -> dict[int, HashedDomElement]:
+		"""Hashes of the elements in the cached selector map, keyed by highlight index"""
+		if self._cached_browser_state_summary is None:
+			return {}
+		return self._cached_browser_state_summary.element_hashes
+
 	@observe_debug(ignore_input=True, ignore_output=True, name='get_element_by_index')
 	@require_healthy_browser(usable_page=True, reopen_page=True)
 	async def get_element_by_index(self, index: int) -> ElementHandle | None:
@@ -4207,9 +5118,9 @@ class BrowserSession(BaseModel):
 	@require_healthy_browser(usable_page=True, reopen_page=True)
 	async def get_scroll_info(self, page: Page) -> tuple[int, int]:
 		"""Get scroll position information for the current page."""
-		scroll_y = await page.evaluate('window.scrollY')
-		viewport_height = await page.evaluate('window.innerHeight')
-		total_height = await page.evaluate('document.documentElement.scrollHeight')
+		scroll_y, viewport_height, total_height = await page.evaluate(
+			'() => [window.scrollY, window.innerHeight, document.documentElement.scrollHeight]'
+		)
 		# Convert to int to handle fractional pixels
 		pixels_above = int(scroll_y)
 		pixels_below = int(max(0, total_height - (scroll_y + viewport_height)))
@@ -4241,6 +5152,11 @@ class BrowserSession(BaseModel):
 			};
 		}""")
 
+		return self._page_info_from_dimensions(page_data)
+
+	@staticmethod
+	def _page_info_from_dimensions(page_data: dict[str, Any]) -> PageInfo:
+		"""Build a PageInfo from the dimensions measured by get_page_info() or STATE_PROBE_JS."""
 		# Calculate derived values (convert to int to handle fractional pixels)
 		viewport_width = int(page_data['viewport_width'])
 		viewport_height = int(page_data['viewport_height'])
@@ -4256,7 +5172,7 @@ class BrowserSession(BaseModel):
 		pixels_right = max(0, page_width - (scroll_x + viewport_width))
 
 		# Create PageInfo object with comprehensive information
-		page_info = PageInfo(
+		return PageInfo(
 			viewport_width=viewport_width,
 			viewport_height=viewport_height,
 			page_width=page_width,
@@ -4269,8 +5185,6 @@ class BrowserSession(BaseModel):
 			pixels_right=pixels_right,
 		)
 
-		return page_info
-
 	async def _scroll_with_cdp_gesture(self, page: Page, pixels: int) -> bool:
 		"""
 		Scroll using CDP Input.synthesizeScrollGesture for universal compatibility.
@@ -4284,8 +5198,6 @@ class BrowserSession(BaseModel):
 		"""
 		try:
 			# Use CDP to synthesize scroll gesture - works in all contexts including PDFs
-			cdp_session = await page.context.new_cdp_session(page)  # type: ignore
-
 			# Get viewport center for scroll origin
 			viewport = await page.evaluate("""
 				() => ({
@@ -4297,7 +5209,8 @@ class BrowserSession(BaseModel):
 			center_x = viewport['width'] // 2
 			center_y = viewport['height'] // 2
 
-			await cdp_session.send(
+			await self._cdp_sessions.send(
+				page,
 				'Input.synthesizeScrollGesture',
 				{
 					'x': center_x,
@@ -4309,10 +5222,6 @@ class BrowserSession(BaseModel):
 				},
 			)
 
-			try:
-				await asyncio.wait_for(cdp_session.detach(), timeout=1.0)
-			except (TimeoutError, Exception):
-				pass
 			self.logger.debug(f'📄 Scrolled via CDP Input.synthesizeScrollGesture: {pixels}px')
 			return True
 
@@ -4474,7 +5383,9 @@ class BrowserSession(BaseModel):
 	@observe_debug(ignore_input=True, ignore_output=True, name='get_state_summary_with_fallback')
 	@require_healthy_browser(usable_page=True, reopen_page=True)
 	@time_execution_async('--get_state_summary_with_fallback')
-	async def get_state_summary_with_fallback(self, cache_clickable_elements_hashes: bool = True) -> BrowserStateSummary:
+	async def get_state_summary_with_fallback(
+		self, cache_clickable_elements_hashes: bool = True, capture: StateCaptureSpec | None = None
+	) -> BrowserStateSummary:
 		"""Get browser state with fallback to minimal state on errors
 
 		This method first tries to get a full state summary. If that fails,
@@ -4484,6 +5395,8 @@ class BrowserSession(BaseModel):
 		-----------
 		cache_clickable_elements_hashes: bool
 			If True, cache the clickable elements hashes for the current state.
+		capture: StateCaptureSpec | None
+			Which optional parts of the state to capture, everything by default.
 
 		Returns:
 		--------
@@ -4491,13 +5404,13 @@ class BrowserSession(BaseModel):
 		"""
 		# Try 1: Full state summary (current implementation)
 		try:
-			return await self.get_state_summary(cache_clickable_elements_hashes)
+			return await self.get_state_summary(cache_clickable_elements_hashes, capture=capture)
 		except Exception as e:
 			self.logger.warning(f'Full state retrieval failed: {type(e).__name__}: {e}')
 			self.logger.warning('🔄 Falling back to minimal state summary')
 
 		# Try 2: Minimal state summary as fallback
-		return await self.get_minimal_state_summary()
+		return await self.get_minimal_state_summary(capture=capture)
 
 	async def _is_pdf_viewer(self, page: Page) -> bool:
 		"""
@@ -4525,9 +5438,10 @@ class BrowserSession(BaseModel):
 			self.logger.debug(f'Error checking PDF viewer: {type(e).__name__}: {e}')
 			return False
 
-	async def _auto_download_pdf_if_needed(self, page: Page) -> str | None:
+	async def _auto_download_pdf_if_needed(self, page: Page, is_pdf_viewer: bool | None = None) -> str | None:
 		"""
 		Check if the current page is a PDF viewer and automatically download the PDF if so.
+		Pass is_pdf_viewer when the caller already knows it (e.g. from STATE_PROBE_JS) to skip the extra evaluate.
 		Returns the download path if a PDF was downloaded, None otherwise.
 		"""
 		if not self.browser_profile.downloads_path or not self._auto_download_pdfs:
@@ -4535,7 +5449,8 @@ class BrowserSession(BaseModel):
 
 		try:
 			# Check if we're in a PDF viewer
-			is_pdf_viewer = await self._is_pdf_viewer(page)
+			if is_pdf_viewer is None:
+				is_pdf_viewer = await self._is_pdf_viewer(page)
 			self.logger.debug(f'is_pdf_viewer: {is_pdf_viewer}')
 
 			if not is_pdf_viewer:
@@ -0,0 +1,134 @@
+"""
+Per-origin page settle statistics for BrowserProfile(adaptive_page_load_timing=True).
+
+Every page load records how long the origin's relevant network traffic took to calm down. Once an origin has enough
+samples, the p90 of those settle times replaces the global minimum/maximum page load waits: fast sites stop sleeping the
+fixed minimum, and sites that are occasionally slow get more time than the global maximum instead of timing out. Origins
+that never go idle (long polling, streaming) keep the global maximum so their waits don't keep growing.
+
+The statistics are shared by every BrowserSession of the process that uses the same page_load_timing_path. They are
+kept in memory only unless a path is set: the file is a list of the origins visited, which is browsing history on disk.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+SETTLE_SAMPLES_PER_ORIGIN = 50  # most recent page loads kept per origin
+MAX_SETTLE_ORIGINS = 1000  # least recently seen origins are dropped beyond this
+MIN_SETTLE_SAMPLES = 5  # page loads needed before an origin's waits are adapted
+SETTLE_PERCENTILE = 0.9
+SETTLE_MAXIMUM_FACTOR = 2.0  # maximum wait = p90 settle time * factor
+MAX_ADAPTIVE_WAIT = 30.0  # never wait longer than this for a single page load, whatever the history says
+NEVER_SETTLES_RATIO = 0.5  # origins that time out more often than this are assumed to never go idle
+SETTLE_SAVE_INTERVAL = 10.0  # seconds between writes of the store to disk
+
+
+def _origin(url: str) -> str | None:
+	parsed = urlparse(url)
+	if parsed.scheme not in ('http', 'https') or not parsed.netloc:
+		return None
+	return f'{parsed.scheme}://{parsed.netloc.lower()}'
+
+
+@dataclass
+class PageSettleStore:
+	"""Settle time samples per origin as [seconds, timed_out] pairs, oldest first."""
+
+	path: Path | None = None
+	samples: dict[str, list[list[float]]] = field(default_factory=dict)
+	_dirty: bool = field(default=False, repr=False)
+	_saved_at: float = field(default_factory=time.monotonic, repr=False)
+
+	@classmethod
+	def load(cls, path: Path) -> 'PageSettleStore':
+		store = cls(path=path)
+		try:
+			data = json.loads(path.read_text())
+			store.samples = {
+				origin: [[float(seconds), float(timed_out)] for seconds, timed_out in samples][-SETTLE_SAMPLES_PER_ORIGIN:]
+				for origin, samples in data.items()
+			}
+		except FileNotFoundError:
+			pass
+		except Exception as e:
+			logger.debug(f'Ignoring unreadable page settle timings at {path}: {type(e).__name__}: {e}')
+		return store
+
+	def record(self, url: str, settle_time: float, timed_out: bool = False) -> None:
+		origin = _origin(url)
+		if origin is None:
+			return
+		# re-inserted so the dict stays ordered from least to most recently seen origin
+		samples = self.samples.pop(origin, [])
+		samples.append([round(settle_time, 3), float(timed_out)])
+		self.samples[origin] = samples[-SETTLE_SAMPLES_PER_ORIGIN:]
+		while len(self.samples) > MAX_SETTLE_ORIGINS:
+			del self.samples[next(iter(self.samples))]
+		self._dirty = True
+
+	def settle_percentile(self, url: str, percentile: float = SETTLE_PERCENTILE) -> float | None:
+		"""Settle time (seconds) below which `percentile` of the origin's recent page loads calmed down."""
+		origin = _origin(url)
+		samples = self.samples.get(origin or '', [])
+		if len(samples) < MIN_SETTLE_SAMPLES:
+			return None
+		settle_times = sorted(seconds for seconds, _ in samples)
+		return settle_times[max(math.ceil(percentile * len(settle_times)) - 1, 0)]
+
+	def waits_for(self, url: str, minimum_wait: float, maximum_wait: float) -> tuple[float, float]:
+		"""Adapt the profile's (minimum_wait, maximum_wait) page load waits to the origin's history."""
+		settle_time = self.settle_percentile(url)
+		if settle_time is None:
+			return minimum_wait, maximum_wait
+
+		samples = self.samples[_origin(url) or '']
+		if sum(timed_out for _, timed_out in samples) / len(samples) > NEVER_SETTLES_RATIO:
+			return minimum_wait, maximum_wait
+
+		adapted_maximum = min(max(settle_time * SETTLE_MAXIMUM_FACTOR, maximum_wait), MAX_ADAPTIVE_WAIT)
+		return min(minimum_wait, settle_time), adapted_maximum
+
+	async def save(self, force: bool = False) -> None:
+		"""Write the store to disk if it changed, at most every SETTLE_SAVE_INTERVAL seconds unless forced."""
+		if self.path is None or not self._dirty:
+			return
+		if not force and time.monotonic() - self._saved_at < SETTLE_SAVE_INTERVAL:
+			return
+		# serialized here, the samples keep changing on the event loop while the file is written in a worker thread
+		data = json.dumps(self.samples, separators=(',', ':'))
+		self._dirty = False
+		self._saved_at = time.monotonic()
+		try:
+			await asyncio.to_thread(self._write, self.path, data)
+		except Exception as e:
+			self._dirty = True
+			logger.debug(f'Failed to save page settle timings to {self.path}: {type(e).__name__}: {e}')
+
+	@staticmethod
+	def _write(path: Path, data: str) -> None:
+		path.parent.mkdir(parents=True, exist_ok=True)
+		# a temp file per write, a forced save may overlap with a throttled one
+		tmp_path = path.with_name(f'{path.name}.{os.getpid()}.{id(data)}.tmp')
+		tmp_path.write_text(data)
+		tmp_path.replace(path)  # atomic, concurrent readers never see a half-written file
+
+
+_STORES: dict[Path | None, PageSettleStore] = {}
+
+
+def get_page_settle_store(path: str | Path | None = None) -> PageSettleStore:
+	"""The process-wide store backed by `path` (loaded on first use), or the in-memory one if path is None."""
+	if path is not None:
+		path = Path(path).expanduser().resolve()
+	if path not in _STORES:
+		_STORES[path] = PageSettleStore.load(path) if path is not None else PageSettleStore()
+	return _STORES[path]
@@ -0,0 +1,115 @@
+"""
+Many BrowserSessions multiplexed over one (or a few) Chromium processes, each in its own isolated BrowserContext.
+
+	shared_browser = SharedBrowser(browser_profile=BrowserProfile(headless=True), max_contexts_per_browser=10)
+	sessions = [BrowserSession(shared_browser=shared_browser) for _ in range(20)]  # 2 Chromium processes, 20 contexts
+	...
+	await shared_browser.close()
+
+Contexts don't share cookies, storage, cache or permissions, but they do share the browser process and its baseline
+memory. A session's stop() only closes its own context (or leaves it open with keep_alive=True), never the browser.
+When a browser crashes it is dropped from the pool, and the sessions that were using it get a fresh context in another
+(or a newly launched) browser the next time they (re)connect.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any
+
+from browser_use.browser.profile import BrowserProfile
+from browser_use.browser.types import Browser, BrowserContext, PlaywrightOrPatchright
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _BrowserShard:
+	browser: Browser
+	contexts: set[BrowserContext] = field(default_factory=set)
+	opening: int = 0  # contexts being created right now, counted so concurrent sessions spread across shards
+
+	@property
+	def load(self) -> int:
+		return len(self.contexts) + self.opening
+
+
+@dataclass
+class SharedBrowser:
+	"""
+	A pool of Chromium processes that hands out one new BrowserContext per BrowserSession(shared_browser=...).
+
+	Browsers are launched lazily with browser_profile's launch options, a new one only once all the running ones host
+	max_contexts_per_browser contexts. Contexts are created with the options of the session's own profile.
+	"""
+
+	browser_profile: BrowserProfile = field(default_factory=BrowserProfile)
+	max_contexts_per_browser: int = 10
+	shards: list[_BrowserShard] = field(default_factory=list)
+	_lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
+
+	@property
+	def contexts_in_use(self) -> int:
+		return sum(len(shard.contexts) for shard in self.shards)
+
+	async def new_context(self, playwright: PlaywrightOrPatchright, profile: BrowserProfile) -> tuple[Browser, BrowserContext]:
+		"""Open a new isolated context in the least loaded browser, launching one if they are all full."""
+		async with self._lock:
+			shard = min(
+				(shard for shard in self.shards if shard.browser.is_connected() and shard.load < self.max_contexts_per_browser),
+				key=lambda shard: shard.load,
+				default=None,
+			)
+			if shard is None:
+				shard = await self._launch(playwright)
+			shard.opening += 1
+
+		try:
+			browser_context = await shard.browser.new_context(**profile.kwargs_for_new_context().model_dump(mode='json'))
+		finally:
+			shard.opening -= 1
+		shard.contexts.add(browser_context)
+		browser_context.on('close', lambda closed_context: self._on_context_closed(shard, closed_context))
+		return shard.browser, browser_context
+
+	async def _launch(self, playwright: PlaywrightOrPatchright) -> _BrowserShard:
+		browser = await playwright.chromium.launch(**self.browser_profile.kwargs_for_launch().model_dump(mode='json'))
+		shard = _BrowserShard(browser=browser)
+		self.shards.append(shard)
+		browser.on('disconnected', lambda _: self._on_browser_disconnected(shard))
+		logger.info(f'🧩 Launched shared browser #{len(self.shards)} for up to {self.max_contexts_per_browser} isolated contexts')
+		return shard
+
+	def _on_context_closed(self, shard: _BrowserShard, browser_context: BrowserContext) -> None:
+		shard.contexts.discard(browser_context)
+		# keep one browser warm for the next session, close the extra ones once they are idle
+		if not shard.load and shard in self.shards and len(self.shards) > 1:
+			self.shards.remove(shard)
+			asyncio.create_task(self._close_browser(shard.browser))
+
+	def _on_browser_disconnected(self, shard: _BrowserShard) -> None:
+		if shard not in self.shards:
+			return  # closed on purpose
+		self.shards.remove(shard)
+		if shard.contexts:
+			logger.warning(
+				f'💥 Shared browser disconnected, {len(shard.contexts)} sessions will reconnect to a new browser_context'
+			)
+
+	@staticmethod
+	async def _close_browser(browser: Browser) -> None:
+		try:
+			await browser.close()
+		except Exception as e:
+			logger.debug(f'Failed to close shared browser: {type(e).__name__}: {e}')
+
+	async def close(self) -> None:
+		"""Close every browser of the pool, and with them the contexts of the sessions still using them."""
+		shards, self.shards = self.shards, []
+		await asyncio.gather(*(self._close_browser(shard.browser) for shard in shards))
+
+	async def __aenter__(self) -> 'SharedBrowser':
+		return self
+
+	async def __aexit__(self, *args: Any) -> None:
+		await self.close()
@@ -60,6 +60,25 @@ class BrowserStateSummary(DOMState):
 	pixels_below: int = 0
 	browser_errors: list[str] = field(default_factory=list)
 
+	# seconds spent in each stage of BrowserSession._get_updated_state (probe, dom, screenshot, tabs, pdf, total)
+	capture_timings: dict[str, float] = field(default_factory=dict, repr=False)
+
+
+@dataclass(frozen=True)
+class StateCaptureSpec:
+	"""
+	Which optional parts of the browser state get_state_summary() captures.
+
+	Parts nobody consumes are skipped instead of paid for on every step, e.g. an agent with use_vision=False
+	needs neither the screenshot nor the index overlays drawn for it. Whether highlights are drawn doesn't change
+	which elements get an index.
+	"""
+
+	screenshot: bool = True
+	highlights: bool = True  # only drawn if BrowserProfile.highlight_elements is enabled as well
+	tabs: bool = True
+	page_info: bool = True
+
 
 @dataclass
 class BrowserStateHistory:
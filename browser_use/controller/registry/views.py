@@ -95,12 +95,9 @@ class ActionRegistry(BaseModel):
 			return True
 
 		# Use the centralized URL matching logic from utils
-		from browser_use.utils import match_url_with_domain_pattern
+		from browser_use.utils import get_domain_pattern_matcher
 
-		for domain_pattern in domains:
-			if match_url_with_domain_pattern(url, domain_pattern):
-				return True
-		return False
+		return get_domain_pattern_matcher(tuple(domains)).matches(url)
 
 	@staticmethod
 	def _match_page_filter(page_filter: Callable[[Page], bool] | None, page: Page) -> bool:
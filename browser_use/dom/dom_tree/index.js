@@ -4,11 +4,29 @@
     focusHighlightIndex: -1,
     viewportExpansion: 0,
     debugMode: false,
+    incremental: false,
+    sinceIndexId: null,
+    sinceEpoch: -1,
+    compact: false,
+    registryToken: null,
   }
 ) => {
-  const { doHighlightElements, focusHighlightIndex, viewportExpansion, debugMode } = args;
+  const {
+    doHighlightElements,
+    focusHighlightIndex,
+    viewportExpansion,
+    debugMode,
+    incremental = false,
+    sinceIndexId = null,
+    sinceEpoch = -1,
+    compact = false,
+    registryToken = null,
+  } = args;
   let highlightIndex = 0; // Reset highlight index
 
+  // The highlighted elements of this snapshot by highlight index, published on window when registryToken is set
+  const highlightedElements = [];
+
   // Add caching mechanisms at the top level
   const DOM_CACHE = {
     boundingRects: new WeakMap(),
@@ -95,6 +113,276 @@
 
   const HIGHLIGHT_CONTAINER_ID = "playwright-highlight-container";
 
+  /**
+   * Persistent per-document index used by incremental snapshots (null when running a one-off full walk).
+   */
+  const INCREMENTAL_INDEX = incremental ? getIncrementalIndex() : null;
+
+  // Set when the walk enters subtrees the MutationObserver cannot see (iframes, shadow roots)
+  let sawUnobservedSubtree = false;
+
+  // Bit flags used by the compact transport, keep in sync with COMPACT_FLAG_* in browser_use/dom/service.py
+  const COMPACT_FLAGS = {
+    TEXT: 1,
+    VISIBLE: 2,
+    TOP_ELEMENT: 4,
+    INTERACTIVE: 8,
+    IN_VIEWPORT: 16,
+    SHADOW_ROOT: 32,
+  };
+
+  /**
+   * Returns the persistent incremental index for the current document, creating it on first use.
+   *
+   * The index survives between calls (it lives on window, so navigation resets it) and holds:
+   * stable node ids, the serialized signature of every node from the previous epoch, and the
+   * highlighted elements of that epoch. A MutationObserver plus a few layout-affecting events
+   * mark it dirty so that unchanged documents can skip the walk entirely.
+   *
+   * @returns {Object} The incremental index.
+   */
+  function getIncrementalIndex() {
+    if (window.__browserUseDomIndex) return window.__browserUseDomIndex;
+
+    const index = {
+      id: `${Date.now().toString(36)}-${Math.random().toString(36).slice(2, 10)}`,
+      epoch: 0,
+      dirty: true,
+      nextId: 0,
+      nodeIds: new WeakMap(),
+      signatures: new Map(),
+      highlighted: [],
+      rootId: null,
+      layoutKey: null,
+      observer: null,
+    };
+    const markDirty = () => {
+      index.dirty = true;
+    };
+
+    index.observer = new MutationObserver((records) => {
+      if (records.some((record) => !isHighlightMutation(record))) markDirty();
+    });
+    index.observer.observe(document, { childList: true, subtree: true, attributes: true, characterData: true });
+
+    // Visibility and top-element checks also depend on layout state that mutations don't cover
+    for (const type of ['scroll', 'resize', 'mouseover', 'focusin', 'focusout', 'input', 'transitionend', 'animationend']) {
+      window.addEventListener(type, markDirty, { capture: true, passive: true });
+    }
+
+    window.__browserUseDomIndex = index;
+    return index;
+  }
+
+  /**
+   * Checks whether a mutation record was caused by our own highlight overlays.
+   *
+   * @param {MutationRecord} record - The mutation record to check.
+   * @returns {boolean} Whether the mutation only touched the highlight container.
+   */
+  function isHighlightMutation(record) {
+    const target = record.target.nodeType === Node.ELEMENT_NODE ? record.target : record.target.parentElement;
+    if (target && (target.id === HIGHLIGHT_CONTAINER_ID || target.closest?.(`#${HIGHLIGHT_CONTAINER_ID}`))) {
+      return true;
+    }
+    if (record.type !== 'childList') return false;
+
+    const nodes = [...record.addedNodes, ...record.removedNodes];
+    return nodes.length > 0 && nodes.every((node) => node.id === HIGHLIGHT_CONTAINER_ID);
+  }
+
+  /**
+   * Returns the id for a node: stable across calls in incremental mode, sequential otherwise.
+   *
+   * @param {Node} node - The node to get the id for.
+   * @returns {string} The node id.
+   */
+  function nextNodeId(node) {
+    if (!INCREMENTAL_INDEX) return `${ID.current++}`;
+
+    let id = INCREMENTAL_INDEX.nodeIds.get(node);
+    if (id === undefined) {
+      id = `${INCREMENTAL_INDEX.nextId++}`;
+      INCREMENTAL_INDEX.nodeIds.set(node, id);
+    }
+    return id;
+  }
+
+  /**
+   * Re-registers and re-draws the highlights recorded for the previous epoch without walking the DOM again.
+   *
+   * @param {Array<[HTMLElement, number, HTMLElement | null]>} entries - The recorded highlights.
+   */
+  function replayHighlights(entries) {
+    for (const [element, index] of entries) highlightedElements[index] = element;
+    if (!doHighlightElements) return;
+
+    for (const [element, index, parentIframe] of entries) {
+      if (focusHighlightIndex >= 0 && focusHighlightIndex !== index) continue;
+      if (element.isConnected) highlightElement(element, index, parentIframe);
+    }
+  }
+
+  /**
+   * Encodes DOM_HASH_MAP into a compact columnar payload serialized as a single JSON string.
+   *
+   * Nodes are emitted in pre-order, so parents always precede their children and siblings keep
+   * their order, which makes the parent index column enough to rebuild the tree. Tag and attribute
+   * names are interned, boolean fields are packed into bit flags, and xpaths are sent relative to
+   * the parent's xpath (a one-element array holds an absolute xpath where that is not possible).
+   *
+   * @param {string} rootId - The id of the root node in DOM_HASH_MAP.
+   * @returns {string} The JSON encoded payload.
+   */
+  function encodeCompact(rootId) {
+    const tags = [];
+    const tagIndexes = new Map();
+    const attributeNames = [];
+    const attributeNameIndexes = new Map();
+    const intern = (table, indexes, value) => {
+      let index = indexes.get(value);
+      if (index === undefined) {
+        index = table.length;
+        table.push(value);
+        indexes.set(value, index);
+      }
+      return index;
+    };
+
+    const parents = [];
+    const flags = [];
+    const tagIds = [];
+    const xpaths = [];
+    const highlightIndexes = [];
+    const viewportDistances = [];
+    const texts = [];
+    const attributes = [];
+
+    const stack = [[rootId, -1, null]];
+    while (stack.length > 0) {
+      const [id, parentPosition, parentXpath] = stack.pop();
+      const nodeData = DOM_HASH_MAP[id];
+      if (!nodeData) continue;
+
+      const position = parents.length;
+      parents.push(parentPosition);
+
+      if (nodeData.type === "TEXT_NODE") {
+        flags.push(COMPACT_FLAGS.TEXT | (nodeData.isVisible ? COMPACT_FLAGS.VISIBLE : 0));
+        tagIds.push(-1);
+        xpaths.push(null);
+        highlightIndexes.push(-1);
+        viewportDistances.push(-1);
+        texts.push(nodeData.text);
+        attributes.push(null);
+        continue;
+      }
+
+      flags.push(
+        (nodeData.isVisible ? COMPACT_FLAGS.VISIBLE : 0) |
+        (nodeData.isTopElement ? COMPACT_FLAGS.TOP_ELEMENT : 0) |
+        (nodeData.isInteractive ? COMPACT_FLAGS.INTERACTIVE : 0) |
+        (nodeData.isInViewport ? COMPACT_FLAGS.IN_VIEWPORT : 0) |
+        (nodeData.shadowRoot ? COMPACT_FLAGS.SHADOW_ROOT : 0)
+      );
+      tagIds.push(intern(tags, tagIndexes, nodeData.tagName));
+      const xpath = nodeData.xpath;
+      xpaths.push(parentXpath !== null && xpath.startsWith(`${parentXpath}/`) ? xpath.slice(parentXpath.length + 1) : [xpath]);
+      highlightIndexes.push(nodeData.highlightIndex ?? -1);
+      viewportDistances.push(nodeData.viewportDistance ?? -1);
+      texts.push(null);
+
+      const names = Object.keys(nodeData.attributes);
+      attributes.push(
+        names.length > 0
+          ? names.flatMap((name) => [intern(attributeNames, attributeNameIndexes, name), nodeData.attributes[name]])
+          : null
+      );
+
+      // push in reverse so the first child is popped (and emitted) first
+      for (let i = nodeData.children.length - 1; i >= 0; i--) {
+        stack.push([nodeData.children[i], position, xpath]);
+      }
+    }
+
+    return JSON.stringify({
+      tags,
+      attributeNames,
+      parents,
+      flags,
+      tagIds,
+      xpaths,
+      highlightIndexes,
+      viewportDistances,
+      texts,
+      attributes,
+    });
+  }
+
+  /**
+   * Builds an incremental snapshot relative to the epoch the caller already has.
+   *
+   * If the caller's index id and epoch match ours, only the node entries whose serialized form changed
+   * (plus their ancestors) are returned in `map`, together with the ids of nodes that disappeared in `removed`. Otherwise the
+   * full map is returned with `full: true`. When nothing was mutated since the previous epoch and the
+   * layout is unchanged, the walk is skipped entirely and an empty delta is returned.
+   *
+   * @param {Object} index - The incremental index.
+   * @returns {Object} The snapshot.
+   */
+  function buildIncrementalSnapshot(index) {
+    if (index.observer.takeRecords().some((record) => !isHighlightMutation(record))) {
+      index.dirty = true;
+    }
+
+    const layoutKey = [viewportExpansion, doHighlightElements, window.scrollX, window.scrollY, window.innerWidth, window.innerHeight].join('|');
+    const canDiff = sinceIndexId === index.id && sinceEpoch === index.epoch;
+
+    if (canDiff && !index.dirty && index.layoutKey === layoutKey) {
+      replayHighlights(index.highlighted);
+      index.observer.takeRecords();
+      return { rootId: index.rootId, map: {}, removed: [], indexId: index.id, epoch: index.epoch, full: false };
+    }
+
+    index.highlighted = [];
+    const rootId = buildDomTree(document.body);
+    DOM_CACHE.clearCache();
+
+    const signatures = new Map();
+    const changed = {};
+    for (const [id, nodeData] of Object.entries(DOM_HASH_MAP)) {
+      const signature = JSON.stringify(nodeData);
+      signatures.set(id, signature);
+      if (!canDiff || index.signatures.get(id) !== signature) changed[id] = nodeData;
+    }
+    const removed = canDiff ? [...index.signatures.keys()].filter((id) => !signatures.has(id)) : [];
+
+    if (canDiff) {
+      // Changed nodes get re-linked by their parent on the Python side, so send the ancestor chain along
+      const parentIds = new Map();
+      for (const [id, nodeData] of Object.entries(DOM_HASH_MAP)) {
+        for (const childId of nodeData.children || []) parentIds.set(childId, id);
+      }
+      for (const id of Object.keys(changed)) {
+        let parentId = parentIds.get(id);
+        while (parentId !== undefined && !(parentId in changed)) {
+          changed[parentId] = DOM_HASH_MAP[parentId];
+          parentId = parentIds.get(parentId);
+        }
+      }
+    }
+
+    index.signatures = signatures;
+    index.rootId = rootId;
+    index.epoch += 1;
+    index.layoutKey = layoutKey;
+    index.dirty = sawUnobservedSubtree;
+    // Drop the records produced by our own highlight overlays during the walk
+    index.observer.takeRecords();
+
+    return { rootId, map: changed, removed, indexId: index.id, epoch: index.epoch, full: !canDiff };
+  }
+
   // Add a WeakMap cache for XPath strings
   const xpathCache = new WeakMap();
 
@@ -908,6 +1196,27 @@
     return false; // No rects were found in the viewport
   }
 
+  /**
+   * Gets the distance in pixels between an element and the actual (unexpanded) viewport.
+   * Used on the Python side to rank elements when the serialized DOM has to fit a budget.
+   *
+   * @param {HTMLElement} element - The element to measure.
+   * @returns {number | null} 0 when the element is inside the viewport, null when it has no size.
+   */
+  function getViewportDistance(element) {
+    const rects = element.getClientRects();
+    const candidates = rects && rects.length > 0 ? rects : [getCachedBoundingRect(element)];
+
+    let distance = Infinity;
+    for (const rect of candidates) {
+      if (!rect || rect.width === 0 || rect.height === 0) continue;
+      const dx = Math.max(0, -rect.right, rect.left - window.innerWidth);
+      const dy = Math.max(0, -rect.bottom, rect.top - window.innerHeight);
+      distance = Math.min(distance, Math.max(dx, dy));
+    }
+    return distance === Infinity ? null : Math.round(distance);
+  }
+
   // /**
   //  * Gets the effective scroll of an element.
   //  *
@@ -1117,7 +1426,7 @@
    * @param {HTMLElement} node - The node to highlight.
    * @param {HTMLElement | null} parentIframe - The parent iframe node.
    * @param {boolean} isParentHighlighted - Whether the parent node is highlighted.
-   * @returns {boolean} Whether the element was highlighted.
+   * @returns {boolean} Whether the element got a highlight index, whether or not an overlay was drawn for it.
    */
   function handleHighlighting(nodeData, node, parentIframe, isParentHighlighted) {
     if (!nodeData.isInteractive) return false; // Not interactive, definitely don't highlight
@@ -1144,7 +1453,12 @@
       // regardless of viewport status
       if (nodeData.isInViewport || viewportExpansion === -1) {
         nodeData.highlightIndex = highlightIndex++;
+        highlightedElements[nodeData.highlightIndex] = node;
+        INCREMENTAL_INDEX?.highlighted.push([node, nodeData.highlightIndex, parentIframe]);
+        const viewportDistance = getViewportDistance(node);
+        if (viewportDistance !== null) nodeData.viewportDistance = viewportDistance;
 
+        // Drawing the overlay is optional, the index (and so the element list) must not depend on it
         if (doHighlightElements) {
           if (focusHighlightIndex >= 0) {
             if (focusHighlightIndex === nodeData.highlightIndex) {
@@ -1153,14 +1467,14 @@
           } else {
             highlightElement(node, nodeData.highlightIndex, parentIframe);
           }
-          return true; // Successfully highlighted
         }
+        return true; // Index assigned
       } else {
         // console.log(`Skipping highlight for ${nodeData.tagName} (outside viewport)`);
       }
     }
 
-    return false; // Did not highlight
+    return false; // No index assigned
   }
 
   /**
@@ -1197,7 +1511,7 @@
         if (domElement) nodeData.children.push(domElement);
       }
 
-      const id = `${ID.current++}`;
+      const id = nextNodeId(node);
       DOM_HASH_MAP[id] = nodeData;
       return id;
     }
@@ -1220,7 +1534,7 @@
         return null;
       }
 
-      const id = `${ID.current++}`;
+      const id = nextNodeId(node);
       DOM_HASH_MAP[id] = {
         type: "TEXT_NODE",
         text: textContent,
@@ -1314,6 +1628,7 @@
         try {
           const iframeDoc = node.contentDocument || node.contentWindow?.document;
           if (iframeDoc) {
+            sawUnobservedSubtree = true;
             for (const child of iframeDoc.childNodes) {
               const domElement = buildDomTree(child, node, false);
               if (domElement) nodeData.children.push(domElement);
@@ -1341,6 +1656,7 @@
         // Handle shadow DOM
         if (node.shadowRoot) {
           nodeData.shadowRoot = true;
+          sawUnobservedSubtree = true;
           for (const child of node.shadowRoot.childNodes) {
             const domElement = buildDomTree(child, parentIframe, nodeWasHighlighted);
             if (domElement) nodeData.children.push(domElement);
@@ -1367,15 +1683,35 @@
       }
     }
 
-    const id = `${ID.current++}`;
+    const id = nextNodeId(node);
     DOM_HASH_MAP[id] = nodeData;
     return id;
   }
 
+  /**
+   * Publishes this snapshot's highlighted elements, so the caller can get a handle to an element by its
+   * highlight index (checked against the token of the snapshot it was taken from) instead of a selector.
+   */
+  function publishElementRegistry() {
+    if (registryToken === null) return;
+    window.__browserUseElements = { token: registryToken, elements: highlightedElements };
+  }
+
+  if (INCREMENTAL_INDEX) {
+    const snapshot = buildIncrementalSnapshot(INCREMENTAL_INDEX);
+    publishElementRegistry();
+    return snapshot;
+  }
+
   const rootId = buildDomTree(document.body);
+  publishElementRegistry();
 
   // Clear the cache before starting
   DOM_CACHE.clearCache();
 
+  if (compact) {
+    return encodeCompact(rootId);
+  }
+
   return { rootId, map: DOM_HASH_MAP };
 };
@@ -1,8 +1,70 @@
 import hashlib
+import logging
+from collections.abc import Iterator
+from dataclasses import dataclass, field
 
 from browser_use.dom.history_tree_processor.view import DOMHistoryElement, HashedDomElement
 from browser_use.dom.views import DOMElementNode
 
+logger = logging.getLogger(__name__)
+
+# hash of the empty branch path (the root of the tree), every element's branch path hash is derived from its parent's
+ROOT_BRANCH_PATH_HASH = hash(())
+
+# attributes that usually survive re-renders, used to re-match elements whose hash changed
+STABLE_ATTRIBUTES = ('id', 'name', 'aria-label')
+
+
+@dataclass
+class HistoryElementIndex:
+	"""
+	Lookup tables from a snapshot's highlighted elements, built once so every replayed action is a dict lookup.
+
+	`by_hash` is the exact match used by history replay, `by_xpath` and `by_attribute` are only used
+	to re-match an element whose branch path or attributes changed since the history was recorded.
+	"""
+
+	by_hash: dict[HashedDomElement, DOMElementNode] = field(default_factory=dict)
+	by_xpath: dict[str, list[DOMElementNode]] = field(default_factory=dict)
+	by_attribute: dict[tuple[str, str], list[DOMElementNode]] = field(default_factory=dict)
+
+	@classmethod
+	def build(cls, tree: DOMElementNode) -> 'HistoryElementIndex':
+		index = cls()
+		for node, hashed_node in HistoryTreeProcessor.iter_hashed_elements(tree):
+			# first element in document order wins, same as the previous tree walk
+			index.by_hash.setdefault(hashed_node, node)
+			index.by_xpath.setdefault(node.xpath, []).append(node)
+			for attribute in STABLE_ATTRIBUTES:
+				value = node.attributes.get(attribute)
+				if value:
+					index.by_attribute.setdefault((attribute, value), []).append(node)
+		return index
+
+	def find(self, dom_history_element: DOMHistoryElement, fuzzy: bool = False) -> DOMElementNode | None:
+		node = self.by_hash.get(HistoryTreeProcessor._hash_dom_history_element(dom_history_element))
+		if node is not None or not fuzzy:
+			return node
+
+		# fuzzy re-matching only accepts a single unambiguous candidate with the same tag
+		candidates = self.by_xpath.get(dom_history_element.xpath, [])
+		matches = [candidate for candidate in candidates if candidate.tag_name == dom_history_element.tag_name]
+		if len(matches) == 1:
+			logger.debug(f'🔎 Re-matched <{dom_history_element.tag_name}> from history by xpath')
+			return matches[0]
+
+		for attribute in STABLE_ATTRIBUTES:
+			value = dom_history_element.attributes.get(attribute)
+			if not value:
+				continue
+			candidates = self.by_attribute.get((attribute, value), [])
+			matches = [candidate for candidate in candidates if candidate.tag_name == dom_history_element.tag_name]
+			if len(matches) == 1:
+				logger.debug(f'🔎 Re-matched <{dom_history_element.tag_name}> from history by {attribute}="{value}"')
+				return matches[0]
+
+		return None
+
 
 class HistoryTreeProcessor:
 	""" "
@@ -31,22 +93,50 @@ class HistoryTreeProcessor:
 		)
 
 	@staticmethod
-	def find_history_element_in_tree(dom_history_element: DOMHistoryElement, tree: DOMElementNode) -> DOMElementNode | None:
-		hashed_dom_history_element = HistoryTreeProcessor._hash_dom_history_element(dom_history_element)
+	def find_history_element_in_tree(
+		dom_history_element: DOMHistoryElement,
+		tree: DOMElementNode,
+		element_index: HistoryElementIndex | None = None,
+		fuzzy: bool = False,
+	) -> DOMElementNode | None:
+		"""
+		Find the element of the tree matching a history element.
+
+		Pass the snapshot's `element_index` (e.g. BrowserStateSummary.history_index) when looking up
+		several elements in the same tree, so the tree is only hashed once.
+		"""
+		if element_index is None:
+			element_index = HistoryElementIndex.build(tree)
+		return element_index.find(dom_history_element, fuzzy=fuzzy)
 
-		def process_node(node: DOMElementNode):
+	@staticmethod
+	def hash_dom_tree(tree: DOMElementNode) -> dict[int, HashedDomElement]:
+		"""Hash every highlighted element of a snapshot in one pass, keyed by highlight index"""
+		return {node.highlight_index: hashed_node for node, hashed_node in HistoryTreeProcessor.iter_hashed_elements(tree)}  # type: ignore[misc]
+
+	@staticmethod
+	def iter_hashed_elements(tree: DOMElementNode) -> Iterator[tuple[DOMElementNode, HashedDomElement]]:
+		"""
+		Yield (element, hash) for the highlighted elements of the tree in document order.
+
+		Branch path hashes are computed top-down, each child folding its tag name into its parent's hash,
+		so the whole tree is hashed in O(n) instead of walking up to the root for every element.
+		The hash is memoized on the element, so `element.hash` is free afterwards.
+		"""
+		stack: list[tuple[DOMElementNode, int]] = [(tree, HistoryTreeProcessor._branch_path_hash_of(tree))]
+		while stack:
+			node, branch_path_hash = stack.pop()
 			if node.highlight_index is not None:
-				hashed_node = HistoryTreeProcessor._hash_dom_element(node)
-				if hashed_node == hashed_dom_history_element:
-					return node
-			for child in node.children:
+				hashed_node = HashedDomElement(
+					branch_path_hash,
+					HistoryTreeProcessor._attributes_hash(node.attributes),
+					HistoryTreeProcessor._xpath_hash(node.xpath),
+				)
+				node._hash = hashed_node
+				yield node, hashed_node
+			for child in reversed(node.children):
 				if isinstance(child, DOMElementNode):
-					result = process_node(child)
-					if result is not None:
-						return result
-			return None
-
-		return process_node(tree)
+					stack.append((child, HistoryTreeProcessor._branch_path_hash_step(branch_path_hash, child.tag_name)))
 
 	@staticmethod
 	def compare_history_element_and_dom_element(dom_history_element: DOMHistoryElement, dom_element: DOMElementNode) -> bool:
@@ -65,8 +155,7 @@ class HistoryTreeProcessor:
 
 	@staticmethod
 	def _hash_dom_element(dom_element: DOMElementNode) -> HashedDomElement:
-		parent_branch_path = HistoryTreeProcessor._get_parent_branch_path(dom_element)
-		branch_path_hash = HistoryTreeProcessor._parent_branch_path_hash(parent_branch_path)
+		branch_path_hash = HistoryTreeProcessor._branch_path_hash_of(dom_element)
 		attributes_hash = HistoryTreeProcessor._attributes_hash(dom_element.attributes)
 		xpath_hash = HistoryTreeProcessor._xpath_hash(dom_element.xpath)
 		# text_hash = DomTreeProcessor._text_hash(dom_element)
@@ -86,18 +175,29 @@ class HistoryTreeProcessor:
 		return [parent.tag_name for parent in parents]
 
 	@staticmethod
-	def _parent_branch_path_hash(parent_branch_path: list[str]) -> str:
-		parent_branch_path_string = '/'.join(parent_branch_path)
-		return hashlib.sha256(parent_branch_path_string.encode()).hexdigest()
+	def _branch_path_hash_of(dom_element: DOMElementNode) -> int:
+		return HistoryTreeProcessor._parent_branch_path_hash(HistoryTreeProcessor._get_parent_branch_path(dom_element))
+
+	@staticmethod
+	def _parent_branch_path_hash(parent_branch_path: list[str]) -> int:
+		branch_path_hash = ROOT_BRANCH_PATH_HASH
+		for tag_name in parent_branch_path:
+			branch_path_hash = HistoryTreeProcessor._branch_path_hash_step(branch_path_hash, tag_name)
+		return branch_path_hash
+
+	@staticmethod
+	def _branch_path_hash_step(parent_hash: int, tag_name: str) -> int:
+		# builtin hash: fast and non-cryptographic, only ever compared within the same process
+		# (history files store the branch path itself and are re-hashed on load)
+		return hash((parent_hash, tag_name))
 
 	@staticmethod
-	def _attributes_hash(attributes: dict[str, str]) -> str:
-		attributes_string = ''.join(f'{key}={value}' for key, value in attributes.items())
-		return hashlib.sha256(attributes_string.encode()).hexdigest()
+	def _attributes_hash(attributes: dict[str, str]) -> int:
+		return hash(tuple(attributes.items()))
 
 	@staticmethod
-	def _xpath_hash(xpath: str) -> str:
-		return hashlib.sha256(xpath.encode()).hexdigest()
+	def _xpath_hash(xpath: str) -> int:
+		return hash(xpath)
 
 	@staticmethod
 	def _text_hash(dom_element: DOMElementNode) -> str:
@@ -3,15 +3,15 @@ from dataclasses import dataclass
 from pydantic import BaseModel
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class HashedDomElement:
 	"""
 	Hash of the dom element to be used as a unique identifier
 	"""
 
-	branch_path_hash: str
-	attributes_hash: str
-	xpath_hash: str
+	branch_path_hash: int
+	attributes_hash: int
+	xpath_hash: int
 	# text_hash: str
 
 
@@ -0,0 +1,68 @@
+"""
+Compare the buildDomTree (index.js) and DOMSnapshot extraction backends on a few real pages.
+
+run with:
+python browser_use/dom/playground/snapshot_benchmark.py
+"""
+
+import asyncio
+import time
+
+from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.browser.types import ViewportSize
+from browser_use.dom.service import DomService
+
+RUNS = 5
+
+websites = [
+	'https://google.com',
+	'https://www.ycombinator.com/companies',
+	'https://en.wikipedia.org/wiki/Humanist_Party_of_Ontario',
+	'https://github.com',
+	'https://amazon.com',
+]
+
+
+async def benchmark_backends():
+	browser_session = BrowserSession(
+		browser_profile=BrowserProfile(
+			window_size=ViewportSize(width=1100, height=1000),
+			disable_security=True,
+			headless=True,
+		),
+	)
+	await browser_session.start()
+	page = await browser_session.get_current_page()
+	dom_service = DomService(page)
+
+	for website in websites:
+		await page.goto(website)
+		await asyncio.sleep(2)
+
+		results = {}
+		for backend in ('js', 'cdp_snapshot'):
+			timings = []
+			for _ in range(RUNS):
+				await browser_session.remove_highlights()
+				start_time = time.perf_counter()
+				state = await dom_service.get_clickable_elements(
+					highlight_elements=False, viewport_expansion=500, backend=backend
+				)
+				timings.append(time.perf_counter() - start_time)
+			results[backend] = state
+			print(
+				f'{backend:>12}: {min(timings) * 1000:7.1f}ms (best of {RUNS})  interactive={len(state.selector_map)}  {website}'
+			)
+
+		js_xpaths = {node.xpath for node in results['js'].selector_map.values()}
+		snapshot_xpaths = {node.xpath for node in results['cdp_snapshot'].selector_map.values()}
+		print(
+			f'{"":>12}  shared={len(js_xpaths & snapshot_xpaths)}  '
+			f'only js={len(js_xpaths - snapshot_xpaths)}  only snapshot={len(snapshot_xpaths - js_xpaths)}'
+		)
+
+	await browser_session.kill()
+
+
+if __name__ == '__main__':
+	asyncio.run(benchmark_backends())
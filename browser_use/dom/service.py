@@ -1,37 +1,151 @@
+import asyncio
+import copy
+import hashlib
+import json
 import logging
+import secrets
+import weakref
+from collections.abc import Awaitable, Callable
+from functools import cache
 from importlib import resources
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Literal
 from urllib.parse import urlparse
 
 if TYPE_CHECKING:
 	from browser_use.browser.types import Page
 
+try:
+	# faster decoding of the compact transport string when available
+	from orjson import loads as json_loads  # type: ignore
+except ImportError:
+	json_loads = json.loads
 
+from browser_use.dom.snapshot_processor.service import SNAPSHOT_COMPUTED_STYLES, DOMSnapshotProcessor, SnapshotViewport
 from browser_use.dom.views import (
 	DOMBaseNode,
 	DOMElementNode,
+	DOMIncrementalIndex,
 	DOMState,
 	DOMTextNode,
 	SelectorMap,
 	ViewportInfo,
 )
-from browser_use.utils import is_new_tab_page, time_execution_async
+from browser_use.utils import is_new_tab_page, time_execution_async, time_execution_sync
 
 # @dataclass
 # class ViewportInfo:
 # 	width: int
 # 	height: int
 
+# Prefix of the window property holding the installed buildDomTree function, see _get_build_dom_tree_scripts()
+BUILD_DOM_TREE_GLOBAL = '__browserUseBuildDomTree'
+
+
+@cache
+def _get_build_dom_tree_scripts() -> tuple[str, str, str]:
+	"""Read dom_tree/index.js once per process and derive the scripts used to run it.
+
+	Returns (source, install_and_run, run_installed):
+	- install_and_run ships the full source, stores it on the page's window and runs it. It is only needed once per
+		document. The property is non-configurable and non-writable and holds a frozen object, so the page can't swap
+		the function once it's installed, and its name ends in a version hash of the source and a random per-process
+		token, so the page can't plant its own copy before we install ours.
+	- run_installed is a tiny stub that calls the installed copy, so V8 doesn't have to receive and parse ~50KB of
+		source every step. It returns null when the document has no such property or the property isn't the locked
+		down one install_and_run defines, and the caller injects the source again.
+	"""
+	source = resources.files('browser_use.dom.dom_tree').joinpath('index.js').read_text()
+	version = hashlib.sha256(source.encode()).hexdigest()[:16]
+	global_name = f'{BUILD_DOM_TREE_GLOBAL}_{version}_{secrets.token_hex(8)}'
+	function_source = source.strip().rstrip(';')
+
+	install_and_run = f"""(args) => {{
+		const buildDomTree = ({function_source});
+		try {{
+			Object.defineProperty(window, '{global_name}', {{
+				value: Object.freeze({{ run: buildDomTree }}),
+				configurable: false,
+				enumerable: false,
+				writable: false,
+			}});
+		}} catch (e) {{
+			// the page locked down window, keep working without the cached copy
+		}}
+		return buildDomTree(args);
+	}}"""
+	run_installed = f"""(args) => {{
+		const installed = Object.getOwnPropertyDescriptor(window, '{global_name}');
+		if (!installed || installed.configurable || installed.writable || !Object.isFrozen(installed.value)) return null;
+		return typeof installed.value.run === 'function' ? installed.value.run(args) : null;
+	}}"""
+	return source, install_and_run, run_installed
+
+
+# Bit flags of the compact buildDomTree transport, keep in sync with COMPACT_FLAGS in dom_tree/index.js
+COMPACT_FLAG_TEXT = 1
+COMPACT_FLAG_VISIBLE = 2
+COMPACT_FLAG_TOP_ELEMENT = 4
+COMPACT_FLAG_INTERACTIVE = 8
+COMPACT_FLAG_IN_VIEWPORT = 16
+COMPACT_FLAG_SHADOW_ROOT = 32
+
+# Draws the highlight overlays for the DOMSnapshot backend, same look and container as highlightElement in index.js
+DRAW_HIGHLIGHT_RECTS_JS = """(rects) => {
+	const colors = [
+		'#FF0000', '#00FF00', '#0000FF', '#FFA500', '#800080', '#008080',
+		'#FF69B4', '#4B0082', '#FF4500', '#2E8B57', '#DC143C', '#4682B4',
+	];
+	let container = document.getElementById('playwright-highlight-container');
+	if (!container) {
+		container = document.createElement('div');
+		container.id = 'playwright-highlight-container';
+		Object.assign(container.style, {
+			position: 'fixed', pointerEvents: 'none', top: '0', left: '0', width: '100%', height: '100%',
+			zIndex: '2147483647', backgroundColor: 'transparent',
+		});
+		document.body.appendChild(container);
+	}
+	const fragment = document.createDocumentFragment();
+	for (const [index, x, y, width, height] of rects) {
+		const color = colors[index % colors.length];
+		const overlay = document.createElement('div');
+		Object.assign(overlay.style, {
+			position: 'fixed', border: `2px solid ${color}`, backgroundColor: color + '1A', pointerEvents: 'none',
+			boxSizing: 'border-box', top: `${y}px`, left: `${x}px`, width: `${width}px`, height: `${height}px`,
+		});
+		const label = document.createElement('div');
+		label.className = 'playwright-highlight-label';
+		Object.assign(label.style, {
+			position: 'fixed', background: color, color: 'white', padding: '1px 4px', borderRadius: '4px',
+			fontSize: `${Math.min(12, Math.max(8, height / 2))}px`,
+			top: `${Math.max(0, y + 2)}px`, left: `${Math.max(0, x + width - 22)}px`,
+		});
+		label.textContent = String(index);
+		fragment.append(overlay, label);
+	}
+	container.appendChild(fragment);
+}"""
+
+# Python mirrors of the in-page incremental indexes, one per page, dropped together with the page
+_INCREMENTAL_INDEXES: 'weakref.WeakKeyDictionary[Page, DOMIncrementalIndex]' = weakref.WeakKeyDictionary()
+
 
 class DomService:
 	logger: logging.Logger
 
-	def __init__(self, page: 'Page', logger: logging.Logger | None = None):
+	def __init__(
+		self,
+		page: 'Page',
+		logger: logging.Logger | None = None,
+		get_cdp_session: Callable[[], Awaitable[Any]] | None = None,
+	):
 		self.page = page
+		# provider of a long-lived CDP session for the page (e.g. BrowserSession's pool), else one is attached per snapshot
+		self.get_cdp_session = get_cdp_session
 		self.xpath_cache = {}
 		self.logger = logger or logging.getLogger(__name__)
 
-		self.js_code = resources.files('browser_use.dom.dom_tree').joinpath('index.js').read_text()
+		self.js_code, self._install_and_run_js, self._run_installed_js = _get_build_dom_tree_scripts()
 
 	# region - Clickable elements
 	@time_execution_async('--get_clickable_elements')
@@ -40,8 +154,31 @@ class DomService:
 		highlight_elements: bool = True,
 		focus_element: int = -1,
 		viewport_expansion: int = 0,
+		incremental: bool = False,
+		compact: bool = False,
+		backend: Literal['js', 'cdp_snapshot'] = 'js',
+		registry_token: str | None = None,
 	) -> DOMState:
-		element_tree, selector_map = await self._build_dom_tree(highlight_elements, focus_element, viewport_expansion)
+		"""Extract the DOM tree and the selector map of the interactive elements.
+
+		With incremental=True, a MutationObserver-backed index is kept inside the page between calls, and only
+		the nodes that were added, removed or changed since the previous call are transferred and re-parsed.
+		The unchanged nodes are shared with the previous call's tree and re-parented into the new one, so the
+		previous DOMState's element_tree must not be used anymore once a new incremental snapshot was taken.
+		With compact=True, full snapshots are sent as a single columnar JSON string instead of one object per node.
+		With backend='cdp_snapshot', the tree is built in Python from a single DOMSnapshot.captureSnapshot call
+		instead of walking the DOM with buildDomTree on the page's main thread (incremental and compact don't apply).
+		With registry_token, buildDomTree publishes the highlighted elements on window.__browserUseElements under that
+		token, so they can be resolved by highlight index later (the DOMSnapshot backend records backendNodeIds instead).
+		"""
+		if backend == 'cdp_snapshot':
+			element_tree, selector_map = await self._build_dom_tree_from_snapshot(
+				highlight_elements, focus_element, viewport_expansion
+			)
+		else:
+			element_tree, selector_map = await self._build_dom_tree(
+				highlight_elements, focus_element, viewport_expansion, incremental, compact, registry_token
+			)
 		return DOMState(element_tree=element_tree, selector_map=selector_map)
 
 	@time_execution_async('--get_cross_origin_iframes')
@@ -68,23 +205,16 @@ class DomService:
 		highlight_elements: bool,
 		focus_element: int,
 		viewport_expansion: int,
+		incremental: bool = False,
+		compact: bool = False,
+		registry_token: str | None = None,
 	) -> tuple[DOMElementNode, SelectorMap]:
 		if await self.page.evaluate('1+1') != 2:
 			raise ValueError('The page cannot evaluate javascript code properly')
 
 		if is_new_tab_page(self.page.url):
 			# short-circuit if the page is a new empty tab for speed, no need to inject buildDomTree.js
-			return (
-				DOMElementNode(
-					tag_name='body',
-					xpath='',
-					attributes={},
-					children=[],
-					is_visible=False,
-					parent=None,
-				),
-				{},
-			)
+			return self._empty_dom_tree()
 
 		# NOTE: We execute JS code in the browser to extract important DOM information.
 		#       The returned hash map contains information about the DOM tree and the
@@ -95,18 +225,30 @@ class DomService:
 			'focusHighlightIndex': focus_element,
 			'viewportExpansion': viewport_expansion,
 			'debugMode': debug_mode,
+			'compact': compact,
+			'registryToken': registry_token,
 		}
+		previous_index = _INCREMENTAL_INDEXES.get(self.page) if incremental else None
+		if incremental:
+			args['incremental'] = True
+			args['sinceIndexId'] = previous_index.index_id if previous_index else None
+			args['sinceEpoch'] = previous_index.epoch if previous_index else -1
 
 		try:
 			self.logger.debug(f'🔧 Starting JavaScript DOM analysis for {self.page.url[:50]}...')
-			eval_page: dict = await self.page.evaluate(self.js_code, args)
+			# buildDomTree is installed once per document, later calls only send a small stub
+			eval_page: dict | str | None = await self.page.evaluate(self._run_installed_js, args)
+			if eval_page is None:
+				self.logger.debug('💉 Installing buildDomTree.js into the current document...')
+				eval_page = await self.page.evaluate(self._install_and_run_js, args)
+			assert eval_page is not None
 			self.logger.debug('✅ JavaScript DOM analysis completed')
 		except Exception as e:
 			self.logger.error('Error evaluating JavaScript: %s', e)
 			raise
 
 		# Only log performance metrics in debug mode
-		if debug_mode and 'perfMetrics' in eval_page:
+		if debug_mode and isinstance(eval_page, dict) and 'perfMetrics' in eval_page:
 			perf = eval_page['perfMetrics']
 
 			# Get key metrics for summary
@@ -131,14 +273,86 @@ class DomService:
 			)
 
 		self.logger.debug('🔄 Starting Python DOM tree construction...')
-		result = await self._construct_dom_tree(eval_page)
+		# NOTE: tree construction runs in a worker thread, so parsing a 50k node page doesn't block the event loop
+		#       (other agents sharing the loop, log streaming, network listeners) for its whole duration
+		if isinstance(eval_page, str):
+			result = await self._construct_dom_tree_from_compact(eval_page)
+		elif incremental:
+			result = await asyncio.to_thread(self._apply_incremental_snapshot, eval_page, previous_index)
+		else:
+			result = await self._construct_dom_tree(eval_page)
 		self.logger.debug('✅ Python DOM tree construction completed')
 		return result
 
+	@time_execution_async('--build_dom_tree_from_snapshot')
+	async def _build_dom_tree_from_snapshot(
+		self,
+		highlight_elements: bool,
+		focus_element: int,
+		viewport_expansion: int,
+	) -> tuple[DOMElementNode, SelectorMap]:
+		if is_new_tab_page(self.page.url):
+			return self._empty_dom_tree()
+
+		self.logger.debug(f'📸 Capturing DOMSnapshot for {self.page.url[:50]}...')
+		if self.get_cdp_session is not None:
+			cdp_session = await self.get_cdp_session()
+		else:
+			cdp_session = await self.page.context.new_cdp_session(self.page)  # type: ignore
+		try:
+			snapshot, layout_metrics = await asyncio.gather(
+				cdp_session.send(
+					'DOMSnapshot.captureSnapshot',
+					{'computedStyles': list(SNAPSHOT_COMPUTED_STYLES), 'includePaintOrder': True, 'includeDOMRects': True},
+				),
+				cdp_session.send('Page.getLayoutMetrics'),
+			)
+		finally:
+			if self.get_cdp_session is None:
+				await cdp_session.detach()
+
+		layout_viewport = layout_metrics['cssLayoutViewport']
+		processor = DOMSnapshotProcessor(
+			snapshot=snapshot,
+			viewport=SnapshotViewport(width=layout_viewport['clientWidth'], height=layout_viewport['clientHeight']),
+			viewport_expansion=viewport_expansion,
+			highlight_elements=highlight_elements,
+			focus_element=focus_element,
+		)
+		element_tree, selector_map = await asyncio.to_thread(processor.build)
+
+		if processor.highlight_rects:
+			await self.page.evaluate(DRAW_HIGHLIGHT_RECTS_JS, [[index, *rect] for index, rect in processor.highlight_rects])
+
+		self.logger.debug(
+			f'🔎 Built DOM tree from DOMSnapshot: documents={len(snapshot["documents"])} interactive={len(selector_map)}'
+		)
+		return element_tree, selector_map
+
+	@staticmethod
+	def _empty_dom_tree() -> tuple[DOMElementNode, SelectorMap]:
+		return (
+			DOMElementNode(
+				tag_name='body',
+				xpath='',
+				attributes={},
+				children=[],
+				is_visible=False,
+				parent=None,
+			),
+			{},
+		)
+
 	@time_execution_async('--construct_dom_tree')
 	async def _construct_dom_tree(
 		self,
 		eval_page: dict,
+	) -> tuple[DOMElementNode, SelectorMap]:
+		return await asyncio.to_thread(self._construct_dom_tree_sync, eval_page)
+
+	def _construct_dom_tree_sync(
+		self,
+		eval_page: dict,
 	) -> tuple[DOMElementNode, SelectorMap]:
 		js_node_map = eval_page['map']
 		js_root_id = eval_page['rootId']
@@ -179,6 +393,175 @@ class DomService:
 
 		return html_to_dict, selector_map
 
+	@time_execution_async('--construct_dom_tree_from_compact')
+	async def _construct_dom_tree_from_compact(
+		self,
+		payload: dict | str,
+	) -> tuple[DOMElementNode, SelectorMap]:
+		return await asyncio.to_thread(self._construct_dom_tree_from_compact_sync, payload)
+
+	def _construct_dom_tree_from_compact_sync(
+		self,
+		payload: dict | str,
+	) -> tuple[DOMElementNode, SelectorMap]:
+		"""Build the tree from the columnar payload produced by buildDomTree(compact=true).
+
+		The payload arrives as the raw JSON string and is decoded here, off the event loop.
+		Nodes arrive in pre-order, so every parent is created before its children and the
+		parent index column is enough to rebuild the children lists in order.
+		"""
+		if isinstance(payload, str):
+			payload = json_loads(payload)
+		assert isinstance(payload, dict)
+		tags = payload['tags']
+		attribute_names = payload['attributeNames']
+		parents = payload['parents']
+
+		selector_map: SelectorMap = {}
+		nodes: list[DOMBaseNode] = []
+		xpaths: list[str] = []
+
+		for position, (flags, tag_id, xpath, highlight_index, viewport_distance, text, attributes) in enumerate(
+			zip(
+				payload['flags'],
+				payload['tagIds'],
+				payload['xpaths'],
+				payload['highlightIndexes'],
+				payload['viewportDistances'],
+				payload['texts'],
+				payload['attributes'],
+			)
+		):
+			parent_position = parents[position]
+			parent = nodes[parent_position] if parent_position >= 0 else None
+			assert parent is None or isinstance(parent, DOMElementNode)
+
+			if flags & COMPACT_FLAG_TEXT:
+				node = DOMTextNode(text=text, is_visible=bool(flags & COMPACT_FLAG_VISIBLE), parent=parent)
+				xpaths.append('')
+			else:
+				# relative segments are appended to the parent's xpath, absolute xpaths come wrapped in a list
+				xpath = xpath[0] if isinstance(xpath, list) else f'{xpaths[parent_position]}/{xpath}'
+				node = DOMElementNode(
+					tag_name=tags[tag_id],
+					xpath=xpath,
+					attributes={attribute_names[attributes[i]]: attributes[i + 1] for i in range(0, len(attributes or ()), 2)},
+					children=[],
+					is_visible=bool(flags & COMPACT_FLAG_VISIBLE),
+					is_interactive=bool(flags & COMPACT_FLAG_INTERACTIVE),
+					is_top_element=bool(flags & COMPACT_FLAG_TOP_ELEMENT),
+					is_in_viewport=bool(flags & COMPACT_FLAG_IN_VIEWPORT),
+					highlight_index=highlight_index if highlight_index >= 0 else None,
+					viewport_distance=viewport_distance if viewport_distance >= 0 else None,
+					shadow_root=bool(flags & COMPACT_FLAG_SHADOW_ROOT),
+					parent=parent,
+				)
+				if node.highlight_index is not None:
+					selector_map[node.highlight_index] = node
+				xpaths.append(xpath)
+
+			nodes.append(node)
+			if parent is not None:
+				parent.children.append(node)
+
+		if not nodes or not isinstance(nodes[0], DOMElementNode):
+			raise ValueError('Failed to parse HTML to dictionary')
+
+		return nodes[0], selector_map
+
+	@time_execution_sync('--apply_incremental_snapshot')
+	def _apply_incremental_snapshot(
+		self,
+		eval_page: dict,
+		previous_index: DOMIncrementalIndex | None,
+	) -> tuple[DOMElementNode, SelectorMap]:
+		"""Build the new epoch's tree from the previous one and the changed and removed nodes reported by buildDomTree.
+
+		Only the changed nodes (which include their ancestors) are parsed. The unchanged subtrees hanging off them are
+		copied into the new tree instead of re-parented, so the trees handed out for earlier epochs stay intact.
+		"""
+		if eval_page['full'] or previous_index is None or previous_index.index_id != eval_page['indexId']:
+			# new document or the page and our mirror are out of sync, start over from the full map
+			nodes: dict[str, DOMBaseNode] = {}
+		else:
+			nodes = dict(previous_index.nodes)
+
+		for id in (*eval_page['removed'], *eval_page['map'].keys()):
+			nodes.pop(id, None)
+
+		# stable ids are not in bottom-up order, so parse all changed nodes before linking children
+		children_by_id: dict[str, list[str]] = {}
+		for id, node_data in eval_page['map'].items():
+			node, children_ids = self._parse_node(node_data)
+			if node is None:
+				continue
+			nodes[id] = node
+			children_by_id[id] = children_ids
+
+		selector_map: SelectorMap = {}
+		for id, children_ids in children_by_id.items():
+			node = nodes[id]
+			if not isinstance(node, DOMElementNode):
+				continue
+			if node.highlight_index is not None:
+				selector_map[node.highlight_index] = node
+			for child_id in children_ids:
+				child_node = nodes.get(child_id)
+				if child_node is None:
+					continue
+				if child_id in children_by_id:
+					child_node.parent = node
+				else:
+					# unchanged, but its parent is a new node now
+					child_node = self._copy_subtree(child_node, node, selector_map)
+				node.children.append(child_node)
+
+		root = nodes.get(str(eval_page['rootId']))
+		if root is None or not isinstance(root, DOMElementNode):
+			raise ValueError('Failed to parse HTML to dictionary')
+		if str(eval_page['rootId']) not in children_by_id:
+			# nothing changed, hand out a copy so get_state_summary's is_new doesn't leak into the previous DOMState
+			root = self._copy_subtree(root, None, selector_map)
+			assert isinstance(root, DOMElementNode)
+
+		# every element starts out as not new, get_state_summary recomputes is_new for the current epoch
+		for node in selector_map.values():
+			node.is_new = False
+
+		_INCREMENTAL_INDEXES[self.page] = DOMIncrementalIndex(
+			index_id=eval_page['indexId'],
+			epoch=eval_page['epoch'],
+			root_id=str(eval_page['rootId']),
+			nodes=nodes,
+		)
+		self.logger.debug(
+			f'🧩 Applied incremental DOM snapshot epoch={eval_page["epoch"]} full={eval_page["full"]} '
+			f'changed={len(children_by_id)} removed={len(eval_page["removed"])} total={len(nodes)}'
+		)
+		return root, selector_map
+
+	@staticmethod
+	def _copy_subtree(node: DOMBaseNode, parent: DOMElementNode | None, selector_map: SelectorMap) -> DOMBaseNode:
+		"""Copy a node and its descendants under a new parent, adding the copied elements to selector_map."""
+		root_copy = copy.copy(node)
+		root_copy.parent = parent
+		# iterative, deeply nested DOMs would exceed the recursion limit
+		stack = [root_copy]
+		while stack:
+			node_copy = stack.pop()
+			if not isinstance(node_copy, DOMElementNode):
+				continue
+			if node_copy.highlight_index is not None:
+				selector_map[node_copy.highlight_index] = node_copy
+			children = node_copy.children
+			node_copy.children = []
+			for child in children:
+				child_copy = copy.copy(child)
+				child_copy.parent = node_copy
+				node_copy.children.append(child_copy)
+				stack.append(child_copy)
+		return root_copy
+
 	def _parse_node(
 		self,
 		node_data: dict,
@@ -215,6 +598,7 @@ class DomService:
 			is_top_element=node_data.get('isTopElement', False),
 			is_in_viewport=node_data.get('isInViewport', False),
 			highlight_index=node_data.get('highlightIndex'),
+			viewport_distance=node_data.get('viewportDistance'),
 			shadow_root=node_data.get('shadowRoot', False),
 			parent=None,
 			viewport_info=viewport_info,
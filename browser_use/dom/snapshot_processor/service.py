@@ -0,0 +1,655 @@
+import re
+from dataclasses import dataclass, field
+
+from browser_use.dom.views import DOMBaseNode, DOMElementNode, DOMTextNode, SelectorMap
+
+# computed styles requested from DOMSnapshot.captureSnapshot, the layout arrays hold them in this order
+SNAPSHOT_COMPUTED_STYLES = ('display', 'visibility', 'opacity', 'cursor', 'position', 'pointer-events')
+_DISPLAY, _VISIBILITY, _OPACITY, _CURSOR, _POSITION, _POINTER_EVENTS = range(len(SNAPSHOT_COMPUTED_STYLES))
+
+ELEMENT_NODE = 1
+TEXT_NODE = 3
+DOCUMENT_NODE = 9
+DOCUMENT_FRAGMENT_NODE = 11
+
+HIGHLIGHT_CONTAINER_ID = 'playwright-highlight-container'
+
+# the sets below mirror the heuristics of buildDomTree in dom_tree/index.js, keep them in sync
+ALWAYS_ACCEPTED_TAGS = {'body', 'div', 'main', 'article', 'section', 'nav', 'header', 'footer'}
+LEAF_ELEMENT_DENY_LIST = {'svg', 'script', 'style', 'link', 'meta', 'noscript', 'template'}
+INTERACTIVE_CURSORS = {
+	'pointer',
+	'move',
+	'text',
+	'grab',
+	'grabbing',
+	'cell',
+	'copy',
+	'alias',
+	'all-scroll',
+	'col-resize',
+	'context-menu',
+	'crosshair',
+	'e-resize',
+	'ew-resize',
+	'help',
+	'n-resize',
+	'ne-resize',
+	'nesw-resize',
+	'ns-resize',
+	'nw-resize',
+	'nwse-resize',
+	'row-resize',
+	's-resize',
+	'se-resize',
+	'sw-resize',
+	'vertical-text',
+	'w-resize',
+	'zoom-in',
+	'zoom-out',
+}
+NON_INTERACTIVE_CURSORS = {'not-allowed', 'no-drop', 'wait', 'progress', 'initial', 'inherit'}
+INTERACTIVE_TAGS = {
+	'a',
+	'button',
+	'input',
+	'select',
+	'textarea',
+	'details',
+	'summary',
+	'label',
+	'option',
+	'optgroup',
+	'fieldset',
+	'legend',
+}
+INTERACTIVE_CANDIDATE_TAGS = {'a', 'button', 'input', 'select', 'textarea', 'details', 'summary', 'label'}
+INTERACTIVE_ROLES = {
+	'button',
+	'menuitemradio',
+	'menuitemcheckbox',
+	'radio',
+	'checkbox',
+	'tab',
+	'switch',
+	'slider',
+	'spinbutton',
+	'combobox',
+	'searchbox',
+	'textbox',
+	'option',
+	'scrollbar',
+}
+DISTINCT_INTERACTIVE_TAGS = {'a', 'button', 'input', 'select', 'textarea', 'summary', 'details', 'label', 'option'}
+DISTINCT_INTERACTIVE_ROLES = INTERACTIVE_ROLES | {'link', 'menuitem', 'listbox'}
+MOUSE_EVENT_ATTRIBUTES = ('onclick', 'onmousedown', 'onmouseup', 'ondblclick')
+INTERACTION_EVENT_ATTRIBUTES = (
+	'onmousedown',
+	'onmouseup',
+	'onkeydown',
+	'onkeyup',
+	'onsubmit',
+	'onchange',
+	'oninput',
+	'onfocus',
+	'onblur',
+)
+INTERACTIVE_CLASS_RE = re.compile(r'\b(btn|clickable|menu|item|entry|link)\b', re.IGNORECASE)
+KNOWN_CONTAINER_CLASSES = {'menu', 'dropdown', 'list', 'toolbar'}
+
+# cell size of the grid used to find the topmost layout box at a point
+HIT_TEST_CELL_SIZE = 128
+
+Rect = tuple[float, float, float, float]
+
+
+@dataclass
+class SnapshotViewport:
+	"""Size of the main frame's viewport, in CSS pixels"""
+
+	width: float
+	height: float
+
+
+@dataclass
+class _SnapshotDocument:
+	"""The flat arrays of one DocumentSnapshot, unpacked once into per-node lookups"""
+
+	parents: list[int]
+	node_types: list[int]
+	node_names: list[str]
+	node_values: list[str]
+	backend_node_ids: list[int]
+	attributes: list[dict[str, str]]
+	children: list[list[int]]
+	layout_of: dict[int, int]
+	layout_nodes: list[int]
+	# per layout object, in main frame viewport coordinates
+	rects: list[Rect]
+	styles: list[list[str]]
+	paint_orders: list[int]
+	clickable: set[int]
+	pseudo: set[int]
+	content_documents: dict[int, int]
+	frame_id: str | None
+	is_main: bool
+
+
+@dataclass
+class _TraversalState:
+	"""State that buildDomTree passes down the recursion as arguments"""
+
+	is_parent_highlighted: bool = False
+	in_content_editable: bool = False
+	in_known_container: bool = False
+	transparent: bool = False
+
+
+@dataclass
+class DOMSnapshotProcessor:
+	"""
+	Build the DOMElementNode tree and selector map from a DOMSnapshot.captureSnapshot result.
+
+	This is the Python counterpart of buildDomTree in index.js: visibility, topmost-element and
+	interactivity checks are computed from the computed styles, layout bounds and paint orders of the
+	snapshot instead of querying the live DOM, so the page's main thread is only used for one snapshot.
+	"""
+
+	snapshot: dict
+	viewport: SnapshotViewport
+	viewport_expansion: int = 0
+	highlight_elements: bool = True
+	focus_element: int = -1
+
+	highlight_index: int = field(default=0, init=False)
+	selector_map: SelectorMap = field(default_factory=dict, init=False)
+	# (highlight index, viewport rect) of the elements to draw highlights for
+	highlight_rects: list[tuple[int, Rect]] = field(default_factory=list, init=False)
+	_documents: dict[int, _SnapshotDocument] = field(default_factory=dict, init=False, repr=False)
+	_hit_grid: dict[tuple[int, int], list[int]] | None = field(default=None, init=False, repr=False)
+
+	def build(self) -> tuple[DOMElementNode, SelectorMap]:
+		main = self._document(0, offset=(0.0, 0.0))
+		body = self._find_body(main)
+		if body is None:
+			raise ValueError('Failed to parse HTML to dictionary')
+
+		root = DOMElementNode(
+			tag_name='body',
+			xpath='/body',
+			attributes={},
+			children=[],
+			is_visible=False,
+			parent=None,
+			backend_node_id=main.backend_node_ids[body],
+			frame_id=main.frame_id,
+		)
+		body_xpath = self._xpath(main, body, self._xpath(main, main.parents[body], ''))
+		for child in main.children[body]:
+			child_node = self._build(main, child, body_xpath, _TraversalState())
+			if child_node is not None:
+				child_node.parent = root
+				root.children.append(child_node)
+
+		return root, self.selector_map
+
+	# region - Snapshot arrays
+
+	def _document(self, document_index: int, offset: tuple[float, float]) -> _SnapshotDocument:
+		if document_index in self._documents:
+			return self._documents[document_index]
+
+		strings: list[str] = self.snapshot['strings']
+		document = self.snapshot['documents'][document_index]
+		nodes = document['nodes']
+		layout = document['layout']
+
+		def string(index: int) -> str:
+			return strings[index] if index >= 0 else ''
+
+		parents = nodes['parentIndex']
+		children: list[list[int]] = [[] for _ in parents]
+		for index, parent in enumerate(parents):
+			if parent >= 0:
+				children[parent].append(index)
+
+		# bounds are relative to the frame's document, move them into the main frame's viewport
+		dx = offset[0] - document.get('scrollOffsetX', 0)
+		dy = offset[1] - document.get('scrollOffsetY', 0)
+
+		layout_of: dict[int, int] = {}
+		for layout_index, node_index in enumerate(layout['nodeIndex']):
+			layout_of.setdefault(node_index, layout_index)
+
+		parsed = _SnapshotDocument(
+			parents=parents,
+			node_types=nodes['nodeType'],
+			node_names=[string(index).lower() for index in nodes['nodeName']],
+			node_values=[string(index) for index in nodes['nodeValue']],
+			backend_node_ids=nodes['backendNodeId'],
+			attributes=[
+				{strings[pairs[i]]: strings[pairs[i + 1]] for i in range(0, len(pairs), 2)} for pairs in nodes['attributes']
+			],
+			children=children,
+			layout_of=layout_of,
+			layout_nodes=layout['nodeIndex'],
+			rects=[(x + dx, y + dy, width, height) for x, y, width, height in layout['bounds']],
+			styles=[[string(index) for index in style] for style in layout['styles']],
+			paint_orders=layout.get('paintOrders') or [0] * len(layout['nodeIndex']),
+			clickable=set(nodes.get('isClickable', {}).get('index', ())),
+			pseudo=set(nodes.get('pseudoType', {}).get('index', ())),
+			content_documents=dict(
+				zip(
+					nodes.get('contentDocumentIndex', {}).get('index', ()), nodes.get('contentDocumentIndex', {}).get('value', ())
+				)
+			),
+			frame_id=string(document.get('frameId', -1)) or None,
+			is_main=document_index == 0,
+		)
+		self._documents[document_index] = parsed
+		return parsed
+
+	@staticmethod
+	def _find_body(document: _SnapshotDocument) -> int | None:
+		for html in document.children[0]:
+			if document.node_types[html] == ELEMENT_NODE and document.node_names[html] == 'html':
+				for child in document.children[html]:
+					if document.node_types[child] == ELEMENT_NODE and document.node_names[child] == 'body':
+						return child
+		return None
+
+	@staticmethod
+	def _rect(document: _SnapshotDocument, node: int) -> Rect | None:
+		layout_index = document.layout_of.get(node)
+		return document.rects[layout_index] if layout_index is not None else None
+
+	@staticmethod
+	def _style(document: _SnapshotDocument, node: int) -> list[str] | None:
+		layout_index = document.layout_of.get(node)
+		return document.styles[layout_index] if layout_index is not None else None
+
+	# endregion
+
+	# region - Tree
+
+	def _build(self, document: _SnapshotDocument, node: int, parent_xpath: str, state: _TraversalState) -> DOMBaseNode | None:
+		node_type = document.node_types[node]
+		if node_type == TEXT_NODE:
+			return self._build_text_node(document, node, state)
+		if node_type != ELEMENT_NODE or node in document.pseudo:
+			return None
+
+		tag_name = document.node_names[node]
+		attributes = document.attributes[node]
+		if attributes.get('id') == HIGHLIGHT_CONTAINER_ID or not self._is_element_accepted(tag_name):
+			return None
+
+		rect = self._rect(document, node)
+		style = self._style(document, node)
+		shadow_roots = [child for child in document.children[node] if document.node_types[child] == DOCUMENT_FRAGMENT_NODE]
+
+		# early viewport check, only filters out elements that have no size and lie clearly outside the viewport
+		if self.viewport_expansion != -1 and not shadow_roots and rect is not None:
+			is_fixed_or_sticky = style is not None and style[_POSITION] in ('fixed', 'sticky')
+			has_size = rect[2] > 0 or rect[3] > 0
+			if not is_fixed_or_sticky and not has_size and not self._intersects_expanded_viewport(rect):
+				return None
+
+		xpath = self._xpath(document, node, parent_xpath)
+		element = DOMElementNode(
+			tag_name=tag_name,
+			xpath=xpath,
+			attributes=dict(attributes)
+			if self._is_interactive_candidate(tag_name, attributes) or tag_name in ('iframe', 'body')
+			else {},
+			children=[],
+			is_visible=self._is_element_visible(rect, style),
+			parent=None,
+			shadow_root=bool(shadow_roots),
+			backend_node_id=document.backend_node_ids[node],
+			frame_id=document.frame_id,
+		)
+
+		in_content_editable = state.in_content_editable or attributes.get('contenteditable') in ('', 'true')
+		in_known_container = state.in_known_container or self._is_known_container(tag_name, attributes)
+
+		node_was_highlighted = False
+		if element.is_visible:
+			assert rect is not None
+			element.is_top_element = self._is_top_element(document, node, rect)
+			if element.is_top_element:
+				element.is_interactive = self._is_interactive_element(
+					document, node, tag_name, attributes, style, in_content_editable
+				)
+				node_was_highlighted = self._handle_highlighting(
+					element, document, node, rect, style, state.is_parent_highlighted, in_known_container
+				)
+
+		transparent = state.transparent or (style is not None and style[_OPACITY] == '0')
+		child_states: list[tuple[_SnapshotDocument, list[int], str, _TraversalState]] = []
+		if tag_name == 'iframe':
+			content_document_index = document.content_documents.get(node)
+			if content_document_index is not None:
+				frame_document = self._document(content_document_index, offset=(rect[0], rect[1]) if rect else (0.0, 0.0))
+				child_states.append((frame_document, frame_document.children[0], '', _TraversalState()))
+		elif (
+			in_content_editable or attributes.get('id') == 'tinymce' or 'mce-content-body' in attributes.get('class', '').split()
+		):
+			child_state = _TraversalState(node_was_highlighted, in_content_editable, in_known_container, transparent)
+			child_states.append((document, document.children[node], xpath, child_state))
+		else:
+			shadow_state = _TraversalState(node_was_highlighted, in_content_editable, False, transparent)
+			for shadow_root in shadow_roots:
+				child_states.append((document, document.children[shadow_root], '', shadow_state))
+			light_state = _TraversalState(
+				node_was_highlighted or state.is_parent_highlighted, in_content_editable, in_known_container, transparent
+			)
+			light_children = [child for child in document.children[node] if document.node_types[child] != DOCUMENT_FRAGMENT_NODE]
+			child_states.append((document, light_children, xpath, light_state))
+
+		for child_document, child_ids, child_parent_xpath, child_state in child_states:
+			for child in child_ids:
+				child_node = self._build(child_document, child, child_parent_xpath, child_state)
+				if child_node is not None:
+					child_node.parent = element
+					element.children.append(child_node)
+
+		# skip empty anchor tags only if they have no dimensions and no children
+		if tag_name == 'a' and not element.children and not attributes.get('href'):
+			if rect is None or (rect[2] <= 0 and rect[3] <= 0):
+				return None
+
+		return element
+
+	def _build_text_node(self, document: _SnapshotDocument, node: int, state: _TraversalState) -> DOMTextNode | None:
+		text = document.node_values[node].strip()
+		if not text:
+			return None
+
+		parent = document.parents[node]
+		if parent < 0 or document.node_types[parent] != ELEMENT_NODE or document.node_names[parent] == 'script':
+			return None
+
+		return DOMTextNode(text=text, is_visible=self._is_text_node_visible(document, node, parent, state), parent=None)
+
+	@staticmethod
+	def _xpath(document: _SnapshotDocument, node: int, parent_xpath: str) -> str:
+		"""Same xpath as getXPathTree in index.js, stopping at shadow root and document boundaries"""
+		parent = document.parents[node]
+		tag_name = document.node_names[node]
+		position = 0
+		if parent >= 0 and document.node_types[parent] == ELEMENT_NODE:
+			siblings = [
+				sibling
+				for sibling in document.children[parent]
+				if document.node_types[sibling] == ELEMENT_NODE and document.node_names[sibling] == tag_name
+			]
+			if len(siblings) > 1:
+				position = siblings.index(node) + 1
+		segment = f'{tag_name}[{position}]' if position > 0 else tag_name
+		return f'{parent_xpath}/{segment}' if parent_xpath else segment
+
+	# endregion
+
+	# region - Visibility
+
+	def _intersects_expanded_viewport(self, rect: Rect) -> bool:
+		if self.viewport_expansion == -1:
+			return True
+		x, y, width, height = rect
+		expansion = self.viewport_expansion
+		return not (
+			y + height < -expansion
+			or y > self.viewport.height + expansion
+			or x + width < -expansion
+			or x > self.viewport.width + expansion
+		)
+
+	def _viewport_distance(self, rect: Rect) -> int | None:
+		x, y, width, height = rect
+		if width == 0 or height == 0:
+			return None
+		dx = max(0, -(x + width), x - self.viewport.width)
+		dy = max(0, -(y + height), y - self.viewport.height)
+		return round(max(dx, dy))
+
+	@staticmethod
+	def _is_element_visible(rect: Rect | None, style: list[str] | None) -> bool:
+		return (
+			rect is not None
+			and style is not None
+			and rect[2] > 0
+			and rect[3] > 0
+			and style[_VISIBILITY] != 'hidden'
+			and style[_DISPLAY] != 'none'
+		)
+
+	def _is_text_node_visible(self, document: _SnapshotDocument, node: int, parent: int, state: _TraversalState) -> bool:
+		if self.viewport_expansion != -1:
+			rect = self._rect(document, node)
+			if rect is None or rect[2] <= 0 or rect[3] <= 0 or not self._intersects_expanded_viewport(rect):
+				return False
+
+		# approximates parentElement.checkVisibility({checkOpacity: true, checkVisibilityCSS: true})
+		parent_style = self._style(document, parent)
+		return (
+			parent_style is not None
+			and not state.transparent
+			and parent_style[_VISIBILITY] != 'hidden'
+			and parent_style[_OPACITY] != '0'
+			and parent_style[_DISPLAY] != 'none'
+		)
+
+	def _is_top_element(self, document: _SnapshotDocument, node: int, rect: Rect) -> bool:
+		if self.viewport_expansion == -1:
+			return True
+
+		if not self._intersects_expanded_viewport(rect):
+			return False
+
+		# elements inside iframes are considered top by default
+		if not document.is_main:
+			return True
+
+		# like document.elementFromPoint, points outside of the actual viewport hit nothing
+		center_x = rect[0] + rect[2] / 2
+		center_y = rect[1] + rect[3] / 2
+		if not (0 <= center_x < self.viewport.width and 0 <= center_y < self.viewport.height):
+			return False
+
+		hit = self._hit_test(document, center_x, center_y)
+		while hit >= 0:
+			if hit == node:
+				return True
+			if document.node_names[hit] == 'html':
+				break
+			hit = document.parents[hit]
+		return False
+
+	def _hit_test(self, document: _SnapshotDocument, x: float, y: float) -> int:
+		"""Return the node of the topmost (highest paint order) layout box at the point, or -1"""
+		if self._hit_grid is None:
+			self._hit_grid = self._build_hit_grid(document)
+
+		best_layout_index = -1
+		best_key = (-1, -1)
+		cell = (int(x // HIT_TEST_CELL_SIZE), int(y // HIT_TEST_CELL_SIZE))
+		for layout_index in self._hit_grid.get(cell, ()):
+			left, top, width, height = document.rects[layout_index]
+			if left <= x < left + width and top <= y < top + height:
+				key = (document.paint_orders[layout_index], layout_index)
+				if key > best_key:
+					best_key, best_layout_index = key, layout_index
+
+		if best_layout_index < 0:
+			return -1
+		return document.layout_nodes[best_layout_index]
+
+	def _build_hit_grid(self, document: _SnapshotDocument) -> dict[tuple[int, int], list[int]]:
+		"""Bucket the hit-testable layout boxes inside the viewport by grid cell"""
+		grid: dict[tuple[int, int], list[int]] = {}
+		max_column = int(self.viewport.width // HIT_TEST_CELL_SIZE)
+		max_row = int(self.viewport.height // HIT_TEST_CELL_SIZE)
+		for layout_index, ((left, top, width, height), style) in enumerate(zip(document.rects, document.styles)):
+			if width <= 0 or height <= 0 or style[_POINTER_EVENTS] == 'none' or style[_VISIBILITY] == 'hidden':
+				continue
+			first_column = max(0, int(left // HIT_TEST_CELL_SIZE))
+			last_column = min(max_column, int((left + width) // HIT_TEST_CELL_SIZE))
+			first_row = max(0, int(top // HIT_TEST_CELL_SIZE))
+			last_row = min(max_row, int((top + height) // HIT_TEST_CELL_SIZE))
+			for column in range(first_column, last_column + 1):
+				for row in range(first_row, last_row + 1):
+					grid.setdefault((column, row), []).append(layout_index)
+		return grid
+
+	# endregion
+
+	# region - Interactivity
+
+	@staticmethod
+	def _is_element_accepted(tag_name: str) -> bool:
+		return tag_name in ALWAYS_ACCEPTED_TAGS or tag_name not in LEAF_ELEMENT_DENY_LIST
+
+	@staticmethod
+	def _is_interactive_candidate(tag_name: str, attributes: dict[str, str]) -> bool:
+		if tag_name in INTERACTIVE_CANDIDATE_TAGS:
+			return True
+		return (
+			any(name in attributes for name in ('onclick', 'role', 'tabindex', 'aria-', 'data-action'))
+			or attributes.get('contenteditable') == 'true'
+		)
+
+	@staticmethod
+	def _is_known_container(tag_name: str, attributes: dict[str, str]) -> bool:
+		"""Whether element.closest('button,a,[role="button"],.menu,.dropdown,.list,.toolbar') would match the element itself"""
+		return (
+			tag_name in ('button', 'a')
+			or attributes.get('role') == 'button'
+			or not KNOWN_CONTAINER_CLASSES.isdisjoint(attributes.get('class', '').split())
+		)
+
+	@staticmethod
+	def _is_interactive_element(
+		document: _SnapshotDocument,
+		node: int,
+		tag_name: str,
+		attributes: dict[str, str],
+		style: list[str] | None,
+		in_content_editable: bool,
+	) -> bool:
+		cursor = style[_CURSOR] if style is not None else ''
+		if tag_name != 'html' and cursor in INTERACTIVE_CURSORS:
+			return True
+
+		if tag_name in INTERACTIVE_TAGS:
+			if cursor in NON_INTERACTIVE_CURSORS:
+				return False
+			# disabled, readonly and inert are reflected by their attributes
+			return not any(name in attributes for name in ('disabled', 'readonly', 'inert'))
+
+		if in_content_editable:
+			return True
+
+		classes = attributes.get('class', '').split()
+		if (
+			'button' in classes
+			or 'dropdown-toggle' in classes
+			or attributes.get('data-index')
+			or attributes.get('data-toggle') == 'dropdown'
+			or attributes.get('aria-haspopup') == 'true'
+		):
+			return True
+
+		if attributes.get('role') in INTERACTIVE_ROLES or attributes.get('aria-role') in INTERACTIVE_ROLES:
+			return True
+
+		# the snapshot reports nodes with click listeners, which index.js cannot see from page.evaluate
+		if node in document.clickable:
+			return True
+
+		return any(name in attributes for name in MOUSE_EVENT_ATTRIBUTES)
+
+	def _is_element_distinct_interaction(
+		self,
+		document: _SnapshotDocument,
+		node: int,
+		tag_name: str,
+		attributes: dict[str, str],
+		style: list[str] | None,
+		in_known_container: bool,
+	) -> bool:
+		if tag_name == 'iframe' or tag_name in DISTINCT_INTERACTIVE_TAGS:
+			return True
+		if attributes.get('role') in DISTINCT_INTERACTIVE_ROLES:
+			return True
+		if attributes.get('contenteditable') in ('', 'true'):
+			return True
+		if any(name in attributes for name in ('data-testid', 'data-cy', 'data-test', 'onclick')):
+			return True
+		if node in document.clickable or any(name in attributes for name in INTERACTION_EVENT_ATTRIBUTES):
+			return True
+		return self._is_heuristically_interactive(document, node, tag_name, attributes, style, in_known_container)
+
+	def _is_heuristically_interactive(
+		self,
+		document: _SnapshotDocument,
+		node: int,
+		tag_name: str,
+		attributes: dict[str, str],
+		style: list[str] | None,
+		in_known_container: bool,
+	) -> bool:
+		if not in_known_container:
+			return False
+
+		parent = document.parents[node]
+		if parent >= 0 and document.node_names[parent] == 'body':
+			return False
+
+		has_interactive_signal = (
+			any(name in attributes for name in ('role', 'tabindex', 'onclick'))
+			or bool(INTERACTIVE_CLASS_RE.search(attributes.get('class', '')))
+			or self._is_interactive_element(document, node, tag_name, attributes, style, False)
+		)
+		if not has_interactive_signal:
+			return False
+
+		return any(
+			document.node_types[child] == ELEMENT_NODE
+			and self._is_element_visible(self._rect(document, child), self._style(document, child))
+			for child in document.children[node]
+		)
+
+	def _handle_highlighting(
+		self,
+		element: DOMElementNode,
+		document: _SnapshotDocument,
+		node: int,
+		rect: Rect,
+		style: list[str] | None,
+		is_parent_highlighted: bool,
+		in_known_container: bool,
+	) -> bool:
+		if not element.is_interactive:
+			return False
+
+		if is_parent_highlighted and not self._is_element_distinct_interaction(
+			document, node, element.tag_name, document.attributes[node], style, in_known_container
+		):
+			return False
+
+		element.is_in_viewport = self._intersects_expanded_viewport(rect)
+		if not element.is_in_viewport and self.viewport_expansion != -1:
+			return False
+
+		element.highlight_index = self.highlight_index
+		element.viewport_distance = self._viewport_distance(rect)
+		self.selector_map[self.highlight_index] = element
+		self.highlight_index += 1
+
+		# drawing the overlay is optional, the index (and so the element list) must not depend on it
+		if self.highlight_elements and (self.focus_element < 0 or self.focus_element == element.highlight_index):
+			self.highlight_rects.append((element.highlight_index, rect))
+		return True
+
+	# endregion
@@ -1,5 +1,4 @@
-from dataclasses import dataclass
-from functools import cached_property
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Optional
 
 from browser_use.dom.history_tree_processor.view import CoordinateSet, HashedDomElement, ViewportInfo
@@ -8,10 +7,13 @@ from browser_use.utils import time_execution_sync
 
 # Avoid circular import issues
 if TYPE_CHECKING:
+	from browser_use.dom.history_tree_processor.service import HistoryElementIndex
+
 	from .views import DOMElementNode
 
 
-@dataclass(frozen=False)
+# eq=False: nodes compare by identity, comparing fields would recurse through the parent and children links
+@dataclass(frozen=False, eq=False)
 class DOMBaseNode:
 	is_visible: bool
 	# Use None as default and set parent later to avoid circular reference issues
@@ -21,7 +23,7 @@ class DOMBaseNode:
 		raise NotImplementedError('DOMBaseNode is an abstract class')
 
 
-@dataclass(frozen=False)
+@dataclass(frozen=False, eq=False)
 class DOMTextNode(DOMBaseNode):
 	text: str
 	type: str = 'TEXT_NODE'
@@ -70,7 +72,7 @@ DEFAULT_INCLUDE_ATTRIBUTES = [
 ]
 
 
-@dataclass(frozen=False)
+@dataclass(frozen=False, eq=False)
 class DOMElementNode(DOMBaseNode):
 	"""
 	xpath: the xpath of the element from the last root node (shadow root or iframe OR document if no shadow root or iframe).
@@ -89,6 +91,11 @@ class DOMElementNode(DOMBaseNode):
 	viewport_coordinates: CoordinateSet | None = None
 	page_coordinates: CoordinateSet | None = None
 	viewport_info: ViewportInfo | None = None
+	# distance in px to the actual (unexpanded) viewport, 0 when inside it, reported for highlighted elements
+	viewport_distance: int | None = None
+	# CDP backendNodeId and id of the frame whose document holds the node, only known with the DOMSnapshot backend
+	backend_node_id: int | None = None
+	frame_id: str | None = None
 
 	"""
 	### State injected by the browser context.
@@ -97,6 +104,9 @@ class DOMElementNode(DOMBaseNode):
 	"""
 	is_new: bool | None = None
 
+	# memoized by `hash`, or for a whole snapshot at once by HistoryTreeProcessor.iter_hashed_elements
+	_hash: HashedDomElement | None = field(default=None, init=False, repr=False)
+
 	def __json__(self) -> dict:
 		return {
 			'tag_name': self.tag_name,
@@ -139,13 +149,15 @@ class DOMElementNode(DOMBaseNode):
 
 		return tag_str
 
-	@cached_property
+	@property
 	def hash(self) -> HashedDomElement:
-		from browser_use.dom.history_tree_processor.service import (
-			HistoryTreeProcessor,
-		)
+		if self._hash is None:
+			from browser_use.dom.history_tree_processor.service import (
+				HistoryTreeProcessor,
+			)
 
-		return HistoryTreeProcessor._hash_dom_element(self)
+			self._hash = HistoryTreeProcessor._hash_dom_element(self)
+		return self._hash
 
 	def get_all_text_till_next_clickable_element(self, max_depth: int = -1) -> str:
 		text_parts = []
@@ -167,123 +179,267 @@ class DOMElementNode(DOMBaseNode):
 		collect_text(self, 0)
 		return '\n'.join(text_parts).strip()
 
+	def _collect_clickable_entries(self) -> list[tuple['DOMElementNode | None', int, str]]:
+		"""Collect the lines of clickable_elements_to_string in document order, without formatting them.
+
+		Single pass over the tree: the text of a highlighted element is collected on the way down into the
+		list of its nearest highlighted ancestor, and its entry is completed once its subtree has been visited.
+		Returns (element, depth, text) for highlighted elements and (None, depth, text) for plain text lines.
+		"""
+		entries: list[tuple[DOMElementNode | None, int, str]] = []
+
+		def process_node(node: DOMBaseNode, depth: int, text_parts: list[str] | None) -> None:
+			# text_parts collects the text of the nearest highlighted ancestor, None when there is none
+			if isinstance(node, DOMElementNode):
+				if node.highlight_index is None:
+					# Process children regardless
+					for child in node.children:
+						process_node(child, depth, text_parts)
+					return
+
+				# Reserve the entry, the element text is only known once the children are processed
+				entry_index = len(entries)
+				entries.append((node, depth, ''))
+				own_text_parts: list[str] = []
+				for child in node.children:
+					process_node(child, depth + 1, own_text_parts)
+				entries[entry_index] = (node, depth, '\n'.join(own_text_parts).strip())
+
+			elif isinstance(node, DOMTextNode):
+				# Add text only if it doesn't have a highlighted parent
+				if text_parts is not None:
+					text_parts.append(node.text)
+				elif node.parent and node.parent.is_visible and node.parent.is_top_element:
+					entries.append((None, depth, node.text))
+
+		# Text below a highlighted ancestor of this subtree belongs to that ancestor and is never printed
+		has_highlighted_ancestor = False
+		current = self.parent
+		while current is not None:
+			if current.highlight_index is not None:
+				has_highlighted_ancestor = True
+				break
+			current = current.parent
+
+		process_node(self, 0, [] if has_highlighted_ancestor else None)
+		return entries
+
 	@time_execution_sync('--clickable_elements_to_string')
 	def clickable_elements_to_string(self, include_attributes: list[str] | None = None) -> str:
 		"""Convert the processed DOM content to HTML."""
-		formatted_text = []
+		if not include_attributes:
+			include_attributes = DEFAULT_INCLUDE_ATTRIBUTES
 
+		return '\n'.join(
+			_format_clickable_element_line(node, depth, text, include_attributes) if node else depth * '\t' + text
+			for node, depth, text in self._collect_clickable_entries()
+		)
+
+	@time_execution_sync('--clickable_elements_to_string_within_budget')
+	def clickable_elements_to_string_within_budget(
+		self,
+		include_attributes: list[str] | None = None,
+		max_length: int = 40000,
+	) -> tuple[str, 'OmittedElements']:
+		"""Like clickable_elements_to_string, but only renders what fits into max_length characters.
+
+		Lines are picked by priority instead of position: elements inside the viewport first, then new
+		elements, then the rest by distance to the viewport. Text lines share the priority of the element
+		before them. Rendering stops at the first line that does not fit, the picked lines are emitted in
+		document order, and everything left out is reported. When everything fits, the output is identical
+		to clickable_elements_to_string.
+		"""
 		if not include_attributes:
 			include_attributes = DEFAULT_INCLUDE_ATTRIBUTES
 
-		def process_node(node: DOMBaseNode, depth: int) -> None:
-			next_depth = int(depth)
-			depth_str = depth * '\t'
+		entries = self._collect_clickable_entries()
+
+		ranks: list[tuple[int, int, int]] = []
+		priority = (0, 0)
+		for position, (node, _, _) in enumerate(entries):
+			if node is not None:
+				priority = _viewport_priority(node)
+			ranks.append((*priority, position))
+		ranks.sort()
+
+		lines: dict[int, str] = {}
+		used_length = 0
+		omitted = OmittedElements()
+		for rank, (_, _, position) in enumerate(ranks):
+			node, depth, text = entries[position]
+			line = _format_clickable_element_line(node, depth, text, include_attributes) if node else depth * '\t' + text
+			line_length = len(line) + (1 if lines else 0)  # joined with newlines
+			if used_length + line_length > max_length:
+				# budget hit: stop rendering, everything ranked below this line is left out
+				for _, _, omitted_position in ranks[rank:]:
+					omitted.add(entries[omitted_position][0])
+				break
+			lines[position] = line
+			used_length += line_length
+
+		return '\n'.join(lines[position] for position in sorted(lines)), omitted
+
+
+def _viewport_priority(node: DOMElementNode) -> tuple[int, int]:
+	"""Sort key for budgeted serialization: (in viewport | new | near viewport, distance to the viewport)."""
+	distance = node.viewport_distance
+	if distance is None:
+		# distance not reported, fall back to the (expanded) viewport flag
+		distance = 0 if node.is_in_viewport else 1_000_000
+	if distance == 0:
+		return 0, 0
+	if node.is_new:
+		return 1, distance
+	return 2, distance
+
+
+def _format_clickable_element_line(node: DOMElementNode, depth: int, text: str, include_attributes: list[str]) -> str:
+	"""Format a single highlighted element as `[index]<tag attributes>text />`."""
+	depth_str = depth * '\t'
+	attributes_html_str = None
+	if include_attributes:
+		attributes_to_include = {
+			key: str(value).strip()
+			for key, value in node.attributes.items()
+			if key in include_attributes and str(value).strip() != ''
+		}
 
-			if isinstance(node, DOMElementNode):
-				# Add element with highlight_index
-				if node.highlight_index is not None:
-					next_depth += 1
-
-					text = node.get_all_text_till_next_clickable_element()
-					attributes_html_str = None
-					if include_attributes:
-						attributes_to_include = {
-							key: str(value).strip()
-							for key, value in node.attributes.items()
-							if key in include_attributes and str(value).strip() != ''
-						}
-
-						# If value of any of the attributes is the same as ANY other value attribute only include the one that appears first in include_attributes
-						# WARNING: heavy vibes, but it seems good enough for saving tokens (it kicks in hard when it's long text)
-
-						# Pre-compute ordered keys that exist in both lists (faster than repeated lookups)
-						ordered_keys = [key for key in include_attributes if key in attributes_to_include]
-
-						if len(ordered_keys) > 1:  # Only process if we have multiple attributes
-							keys_to_remove = set()  # Use set for O(1) lookups
-							seen_values = {}  # value -> first_key_with_this_value
-
-							for key in ordered_keys:
-								value = attributes_to_include[key]
-								if len(value) > 5:  # to not remove false, true, etc
-									if value in seen_values:
-										# This value was already seen with an earlier key, so remove this key
-										keys_to_remove.add(key)
-									else:
-										# First time seeing this value, record it
-										seen_values[value] = key
-
-							# Remove duplicate keys (no need to check existence since we know they exist)
-							for key in keys_to_remove:
-								del attributes_to_include[key]
-
-						# Easy LLM optimizations
-						# if tag == role attribute, don't include it
-						if node.tag_name == attributes_to_include.get('role'):
-							del attributes_to_include['role']
-
-						# Remove attributes that duplicate the node's text content
-						attrs_to_remove_if_text_matches = ['aria-label', 'placeholder', 'title']
-						for attr in attrs_to_remove_if_text_matches:
-							if (
-								attributes_to_include.get(attr)
-								and attributes_to_include.get(attr, '').strip().lower() == text.strip().lower()
-							):
-								del attributes_to_include[attr]
-
-						if attributes_to_include.items():
-							# Format as key1='value1' key2='value2'
-							attributes_html_str = ' '.join(
-								f'{key}={cap_text_length(value, 15)}' for key, value in attributes_to_include.items()
-							)
-
-					# Build the line
-					if node.is_new:
-						highlight_indicator = f'*[{node.highlight_index}]'
+		# If value of any of the attributes is the same as ANY other value attribute
+		# only include the one that appears first in include_attributes
+		# WARNING: heavy vibes, but it seems good enough for saving tokens (it kicks in hard when it's long text)
+
+		# Pre-compute ordered keys that exist in both lists (faster than repeated lookups)
+		ordered_keys = [key for key in include_attributes if key in attributes_to_include]
+
+		if len(ordered_keys) > 1:  # Only process if we have multiple attributes
+			keys_to_remove = set()  # Use set for O(1) lookups
+			seen_values = {}  # value -> first_key_with_this_value
 
+			for key in ordered_keys:
+				value = attributes_to_include[key]
+				if len(value) > 5:  # to not remove false, true, etc
+					if value in seen_values:
+						# This value was already seen with an earlier key, so remove this key
+						keys_to_remove.add(key)
 					else:
-						highlight_indicator = f'[{node.highlight_index}]'
+						# First time seeing this value, record it
+						seen_values[value] = key
 
-					line = f'{depth_str}{highlight_indicator}<{node.tag_name}'
+			# Remove duplicate keys (no need to check existence since we know they exist)
+			for key in keys_to_remove:
+				del attributes_to_include[key]
 
-					if attributes_html_str:
-						line += f' {attributes_html_str}'
+		# Easy LLM optimizations
+		# if tag == role attribute, don't include it
+		if node.tag_name == attributes_to_include.get('role'):
+			del attributes_to_include['role']
 
-					if text:
-						# Add space before >text only if there were NO attributes added before
-						text = text.strip()
-						if not attributes_html_str:
-							line += ' '
-						line += f'>{text}'
+		# Remove attributes that duplicate the node's text content
+		attrs_to_remove_if_text_matches = ['aria-label', 'placeholder', 'title']
+		for attr in attrs_to_remove_if_text_matches:
+			if attributes_to_include.get(attr) and attributes_to_include.get(attr, '').strip().lower() == text.strip().lower():
+				del attributes_to_include[attr]
 
-					# Add space before /> only if neither attributes NOR text were added
-					elif not attributes_html_str:
-						line += ' '
+		if attributes_to_include.items():
+			# Format as key1='value1' key2='value2'
+			attributes_html_str = ' '.join(f'{key}={cap_text_length(value, 15)}' for key, value in attributes_to_include.items())
 
-					# makes sense to have if the website has lots of text -> so the LLM knows which things are part of the same clickable element and which are not
-					line += ' />'  # 1 token
-					formatted_text.append(line)
+	# Build the line
+	if node.is_new:
+		highlight_indicator = f'*[{node.highlight_index}]'
 
-				# Process children regardless
-				for child in node.children:
-					process_node(child, next_depth)
+	else:
+		highlight_indicator = f'[{node.highlight_index}]'
 
-			elif isinstance(node, DOMTextNode):
-				# Add text only if it doesn't have a highlighted parent
-				if node.has_parent_with_highlight_index():
-					return
+	line = f'{depth_str}{highlight_indicator}<{node.tag_name}'
+
+	if attributes_html_str:
+		line += f' {attributes_html_str}'
+
+	if text:
+		# Add space before >text only if there were NO attributes added before
+		text = text.strip()
+		if not attributes_html_str:
+			line += ' '
+		line += f'>{text}'
 
-				if node.parent and node.parent.is_visible and node.parent.is_top_element:
-					formatted_text.append(f'{depth_str}{node.text}')
+	# Add space before /> only if neither attributes NOR text were added
+	elif not attributes_html_str:
+		line += ' '
 
-		process_node(self, 0)
-		return '\n'.join(formatted_text)
+	# makes sense to have if the website has lots of text -> so the LLM knows which things are part of
+	# the same clickable element and which are not
+	line += ' />'  # 1 token
+	return line
 
 
 SelectorMap = dict[int, DOMElementNode]
 
 
+@dataclass
+class OmittedElements:
+	"""What DOMElementNode.clickable_elements_to_string_within_budget left out to stay within its budget."""
+
+	elements: int = 0
+	in_viewport: int = 0
+	new: int = 0
+	text_lines: int = 0
+	highlight_indexes: list[int] = field(default_factory=list)
+
+	def add(self, node: DOMElementNode | None) -> None:
+		if node is None:
+			self.text_lines += 1
+			return
+		self.elements += 1
+		if _viewport_priority(node)[0] == 0:
+			self.in_viewport += 1
+		if node.is_new:
+			self.new += 1
+		if node.highlight_index is not None:
+			self.highlight_indexes.append(node.highlight_index)
+
+	def __bool__(self) -> bool:
+		return bool(self.elements or self.text_lines)
+
+
 @dataclass
 class DOMState:
 	element_tree: DOMElementNode
 	selector_map: SelectorMap
+	_element_hashes: dict[int, HashedDomElement] | None = field(default=None, init=False, repr=False, compare=False)
+	_history_index: 'HistoryElementIndex | None' = field(default=None, init=False, repr=False, compare=False)
+
+	@property
+	def element_hashes(self) -> dict[int, HashedDomElement]:
+		"""Hashes of the highlighted elements of this snapshot keyed by highlight index, computed once top-down"""
+		if self._element_hashes is None:
+			from browser_use.dom.history_tree_processor.service import HistoryTreeProcessor
+
+			self._element_hashes = HistoryTreeProcessor.hash_dom_tree(self.element_tree)
+		return self._element_hashes
+
+	@property
+	def history_index(self) -> 'HistoryElementIndex':
+		"""Hash, xpath and stable attribute lookups used to find history elements in this snapshot, built once"""
+		if self._history_index is None:
+			from browser_use.dom.history_tree_processor.service import HistoryElementIndex
+
+			self._history_index = HistoryElementIndex.build(self.element_tree)
+		return self._history_index
+
+
+@dataclass
+class DOMIncrementalIndex:
+	"""Python-side mirror of the in-page index kept by buildDomTree in incremental mode.
+
+	Nodes are keyed by their stable in-page id, so each new epoch only has to parse the nodes
+	that were added or changed and drop the ones that were removed.
+
+	Later epochs never modify these nodes: they link the nodes they parsed and copy the unchanged
+	subtrees below them, so the tree of every epoch's DOMState stays intact.
+	"""
+
+	index_id: str
+	epoch: int
+	root_id: str
+	nodes: dict[str, DOMBaseNode]
@@ -50,6 +50,22 @@ class ContentPartRefusalParam(BaseModel):
 
 SupportedImageMediaType = Literal['image/jpeg', 'image/png', 'image/gif', 'image/webp']
 
+# base64 encoded magic bytes of each supported image format
+_BASE64_IMAGE_SIGNATURES: dict[str, SupportedImageMediaType] = {
+	'iVBORw0KGgo': 'image/png',
+	'/9j/': 'image/jpeg',
+	'UklGR': 'image/webp',
+	'R0lGOD': 'image/gif',
+}
+
+
+def get_base64_image_media_type(data: str, default: SupportedImageMediaType = 'image/png') -> SupportedImageMediaType:
+	"""Detect the media type of base64 encoded image data (e.g. a screenshot) from its magic bytes."""
+	for signature, media_type in _BASE64_IMAGE_SIGNATURES.items():
+		if data.startswith(signature):
+			return media_type
+	return default
+
 
 class ImageURL(BaseModel):
 	url: str
@@ -6,7 +6,7 @@ import pytest
 from browser_use.agent.prompts import AgentMessagePrompt
 from browser_use.agent.service import Agent
 from browser_use.browser.views import BrowserStateSummary, TabInfo
-from browser_use.dom.views import DOMElementNode, SelectorMap
+from browser_use.dom.views import DOMElementNode, OmittedElements, SelectorMap
 from browser_use.filesystem.file_system import FileSystem
 from browser_use.llm.anthropic.chat import ChatAnthropic
 from browser_use.llm.azure.chat import ChatAzureOpenAI
@@ -80,8 +80,11 @@ def create_mock_state_message(temp_dir: str):
 		sensitive_data=None,
 	)
 
-	# Override the clickable_elements_to_string method to return our simple element
-	mock_button.clickable_elements_to_string = lambda include_attributes=None: '[1]<button id="test-button">Click Me</button>'
+	# Override the clickable_elements_to_string_within_budget method to return our simple element
+	mock_button.clickable_elements_to_string_within_budget = lambda include_attributes=None, max_length=40000: (
+		'[1]<button id="test-button">Click Me</button>',
+		OmittedElements(),
+	)
 
 	# Get the formatted message
 	message = agent_prompt.get_user_message(use_vision=False)
@@ -659,7 +659,11 @@ class BrowserUseServer:
 		if not self.browser_session:
 			return 'Error: No browser session active'
 
-		state = await self.browser_session.get_state_summary(cache_clickable_elements_hashes=False)
+		from browser_use.browser.views import StateCaptureSpec
+
+		# the screenshot and the highlights drawn for it are only worth capturing if they're returned
+		capture = StateCaptureSpec(screenshot=include_screenshot, highlights=include_screenshot)
+		state = await self.browser_session.get_state_summary(cache_clickable_elements_hashes=False, capture=capture)
 
 		result = {
 			'url': state.url,
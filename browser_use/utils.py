@@ -4,9 +4,9 @@ import os
 import platform
 import signal
 import time
-from collections.abc import Callable, Coroutine
+from collections.abc import Callable, Coroutine, Iterable
 from fnmatch import fnmatch
-from functools import cache, wraps
+from functools import cache, lru_cache, wraps
 from pathlib import Path
 from sys import stderr
 from typing import Any, ParamSpec, TypeVar
@@ -529,6 +529,111 @@ def match_url_with_domain_pattern(url: str, domain_pattern: str, log_warnings: b
 		return False
 
 
+_GLOB_CHARS = frozenset('*?[')
+_TRIE_PATTERNS = '\0'  # key of a suffix trie node holding the indices of the *.domain patterns that end there
+
+
+class DomainPatternMatcher:
+	"""
+	Compiled form of match_url_with_domain_pattern() for a fixed list of patterns. SECURITY CRITICAL.
+
+	Matches exactly like calling match_url_with_domain_pattern(url, pattern) for every pattern, but parses each URL
+	once: patterns are grouped by scheme, plain domains are looked up in a hash of exact hosts, *.domain patterns in a
+	suffix trie keyed by reversed labels, and only the rare other globs (e.g. a.*.example.com) fall back to fnmatch.
+	Unsafe patterns are rejected once at compile time. Verdicts are cached per URL.
+	"""
+
+	def __init__(self, patterns: Iterable[str], log_warnings: bool = False, cache_size: int = 1024):
+		self.patterns = tuple(patterns)
+		# scheme pattern -> (match-all indices, exact host -> indices, suffix trie, fnmatch fallback indices)
+		self._groups: dict[str, tuple[list[int], dict[str, list[int]], dict[str, Any], list[int]]] = {}
+
+		for index, domain_pattern in enumerate(self.patterns):
+			domain_pattern = domain_pattern.lower()
+			if '://' in domain_pattern:
+				pattern_scheme, pattern_domain = domain_pattern.split('://', 1)
+			else:
+				pattern_scheme = 'https'  # Default to matching only https for security
+				pattern_domain = domain_pattern
+			if ':' in pattern_domain and not pattern_domain.startswith(':'):
+				pattern_domain = pattern_domain.split(':', 1)[0]
+
+			match_all, exact, trie, fallback = self._groups.setdefault(pattern_scheme, ([], {}, {}, []))
+			if pattern_domain == '*':
+				match_all.append(index)
+				continue
+			# an exact match is checked before any glob handling, even for patterns that contain wildcards
+			exact.setdefault(pattern_domain, []).append(index)
+			if '*' not in pattern_domain or not self._is_safe_glob(domain_pattern, pattern_domain, log_warnings):
+				continue
+			if pattern_domain.startswith('*.') and not _GLOB_CHARS.intersection(pattern_domain[2:]):
+				# *.example.com matches example.com and every subdomain of it
+				node = trie
+				for label in reversed(pattern_domain[2:].split('.')):
+					node = node.setdefault(label, {})
+				node.setdefault(_TRIE_PATTERNS, []).append(index)
+			else:
+				fallback.append(index)
+
+		self.match = lru_cache(maxsize=cache_size)(self._match)
+
+	@staticmethod
+	def _is_safe_glob(domain_pattern: str, pattern_domain: str, log_warnings: bool) -> bool:
+		"""The unsafe glob checks of match_url_with_domain_pattern(), such patterns never match anything."""
+		if pattern_domain.count('*.') > 1 or pattern_domain.count('.*') > 1:
+			error = f'⛔️ Multiple wildcards in pattern=[{domain_pattern}] are not supported'
+		elif pattern_domain.endswith('.*'):
+			error = f'⛔️ Wildcard TLDs like in pattern=[{domain_pattern}] are not supported for security'
+		elif '*' in pattern_domain.replace('*.', ''):
+			error = f'⛔️ Only *.domain style patterns are supported, ignoring pattern=[{domain_pattern}]'
+		else:
+			return True
+		if log_warnings:
+			logger.error(error)
+		return False
+
+	def _match(self, url: str) -> tuple[str, ...]:
+		"""All the patterns that match the url, in their original order."""
+		# Note: new tab pages should be handled at the callsite, not here
+		if is_new_tab_page(url):
+			return ()
+		try:
+			parsed_url = urlparse(url)
+			scheme = parsed_url.scheme.lower() if parsed_url.scheme else ''
+			domain = parsed_url.hostname.lower() if parsed_url.hostname else ''
+		except Exception as e:
+			logger.error(f'⛔️ Error matching URL {url} with patterns {list(self.patterns)}: {type(e).__name__}: {e}')
+			return ()
+		if not scheme or not domain:
+			return ()
+
+		matched: set[int] = set()
+		labels = domain.split('.')
+		for pattern_scheme, (match_all, exact, trie, fallback) in self._groups.items():
+			if pattern_scheme != scheme and not (_GLOB_CHARS.intersection(pattern_scheme) and fnmatch(scheme, pattern_scheme)):
+				continue
+			matched.update(match_all)
+			matched.update(exact.get(domain, ()))
+			node = trie
+			for label in reversed(labels):
+				node = node.get(label)
+				if node is None:
+					break
+				matched.update(node.get(_TRIE_PATTERNS, ()))
+			matched.update(index for index in fallback if match_url_with_domain_pattern(url, self.patterns[index]))
+
+		return tuple(self.patterns[index] for index in sorted(matched))
+
+	def matches(self, url: str) -> bool:
+		return bool(self.match(url))
+
+
+@lru_cache(maxsize=64)
+def get_domain_pattern_matcher(patterns: tuple[str, ...], log_warnings: bool = False) -> DomainPatternMatcher:
+	"""The compiled matcher for a list of domain patterns, built once per distinct list."""
+	return DomainPatternMatcher(patterns, log_warnings=log_warnings)
+
+
 def merge_dicts(a: dict, b: dict, path: tuple[str, ...] = ()):
 	for key in b:
 		if key in a:
@@ -0,0 +1,162 @@
+"""
+Tests for the long-lived per-page CDP sessions shared by screenshots, scroll gestures, probes and event consumers.
+
+run with:
+python -m pytest tests/test_cdp_session_pool.py
+"""
+
+import asyncio
+
+import pytest
+
+from browser_use.browser.session import CDPSessionPool
+
+
+class FakeCDPSession:
+	def __init__(self, fail_with=None):
+		self.fail_with = fail_with
+		self.sent = []
+		self.handlers = {}
+		self.detached = False
+
+	def on(self, event, handler):
+		self.handlers[event] = handler
+
+	async def send(self, method, params=None):
+		if self.fail_with:
+			raise self.fail_with
+		self.sent.append(method)
+		return {'method': method}
+
+	async def detach(self):
+		self.detached = True
+
+
+class FakeContext:
+	def __init__(self):
+		self.attached: list[FakeCDPSession] = []
+
+	async def new_cdp_session(self, page):
+		await asyncio.sleep(0.01)
+		cdp_session = FakeCDPSession()
+		self.attached.append(cdp_session)
+		return cdp_session
+
+
+class FakePage:
+	def __init__(self):
+		self.context = FakeContext()
+		self.handlers = {}
+		self.url = 'about:blank'
+		self.main_frame = object()
+		self.closed = False
+
+	def on(self, event, handler):
+		self.handlers[event] = handler
+
+	def remove_listener(self, event, handler):
+		if self.handlers.get(event) is handler:
+			del self.handlers[event]
+
+	def is_closed(self):
+		return self.closed
+
+
+async def test_session_is_attached_once_and_reused():
+	pool, page = CDPSessionPool(), FakePage()
+	sessions = await asyncio.gather(*(pool.get(page) for _ in range(3)))  # type: ignore[arg-type]
+	assert len(page.context.attached) == 1
+	assert all(cdp_session is page.context.attached[0] for cdp_session in sessions)
+
+	await pool.send(page, 'Page.captureScreenshot')  # type: ignore[arg-type]
+	await pool.send(page, 'Input.synthesizeScrollGesture')  # type: ignore[arg-type]
+	assert page.context.attached[0].sent == ['Page.captureScreenshot', 'Input.synthesizeScrollGesture']
+	assert len(page.context.attached) == 1
+
+
+async def test_session_outlives_navigations_until_close():
+	pool, page = CDPSessionPool(), FakePage()
+	first = await pool.get(page)  # type: ignore[arg-type]
+	assert set(page.handlers) == {'close'}
+
+	pool.invalidate(page)  # type: ignore[arg-type]
+	second = await pool.get(page)  # type: ignore[arg-type]
+	assert second is not first
+	await asyncio.sleep(0)
+	assert first.detached and not pool.background
+
+	page.handlers['close'](page)
+	assert not pool.sessions and not pool.watched and not page.handlers
+	assert not second.detached
+
+
+async def test_clear_unsubscribes_from_pages():
+	pool, page = CDPSessionPool(), FakePage()
+	await pool.get(page)  # type: ignore[arg-type]
+
+	pool.clear()
+	assert not pool.sessions and not pool.watched and not page.handlers
+
+	await pool.get(page)  # type: ignore[arg-type]
+	assert set(page.handlers) == {'close'} and len(page.context.attached) == 2
+
+
+async def test_attach_hooks_run_on_every_session():
+	pool, page, other_page = CDPSessionPool(), FakePage(), FakePage()
+	already_attached = await pool.get(page)  # type: ignore[arg-type]
+	hooked = []
+
+	async def hook(page, cdp_session):
+		hooked.append(cdp_session)
+		cdp_session.on('Inspector.targetCrashed', lambda event: None)
+
+	await pool.add_attach_hook('crashes', hook)
+	await pool.add_attach_hook('crashes', hook)  # once per name
+	assert hooked == [already_attached]
+
+	await pool.get(other_page)  # type: ignore[arg-type]
+	pool.invalidate(page)  # type: ignore[arg-type]
+	reattached = await pool.get(page)  # type: ignore[arg-type]
+	assert hooked == [already_attached, other_page.context.attached[0], reattached]
+	assert 'Inspector.targetCrashed' in reattached.handlers
+
+	async def broken_hook(page, cdp_session):
+		raise RuntimeError('Fetch.enable failed')
+
+	# a failing hook doesn't take the session down for everyone else
+	await pool.add_attach_hook('broken', broken_hook)
+	pool.invalidate(page)  # type: ignore[arg-type]
+	assert len(hooked) == 3
+	await pool.get(page)  # type: ignore[arg-type]
+	assert len(hooked) == 4
+
+
+async def test_send_reattaches_once_when_session_is_gone():
+	pool, page = CDPSessionPool(), FakePage()
+	stale = await pool.get(page)  # type: ignore[arg-type]
+	stale.fail_with = RuntimeError('Target page, context or browser has been closed')
+
+	assert await pool.send(page, 'Page.captureScreenshot') == {'method': 'Page.captureScreenshot'}  # type: ignore[arg-type]
+	assert len(page.context.attached) == 2
+
+	# other errors are the caller's problem
+	page.context.attached[1].fail_with = ValueError('Invalid parameters')
+	with pytest.raises(ValueError):
+		await pool.send(page, 'Page.captureScreenshot')  # type: ignore[arg-type]
+	assert len(page.context.attached) == 2
+
+
+async def test_failed_attach_is_not_cached():
+	pool, page = CDPSessionPool(), FakePage()
+
+	async def broken_new_cdp_session(page):
+		raise RuntimeError('Target crashed')
+
+	original = page.context.new_cdp_session
+	page.context.new_cdp_session = broken_new_cdp_session  # type: ignore[method-assign]
+	with pytest.raises(RuntimeError):
+		await pool.get(page)  # type: ignore[arg-type]
+	assert not pool.sessions
+
+	page.context.new_cdp_session = original  # type: ignore[method-assign]
+	assert await pool.get(page) is page.context.attached[0]  # type: ignore[arg-type]
@@ -0,0 +1,106 @@
+"""
+Tests for the LLM-facing serialization of the DOM tree.
+
+run with:
+python -m pytest tests/test_clickable_elements_to_string.py
+"""
+
+from browser_use.dom.views import DOMElementNode, DOMTextNode
+
+
+def _element(tag, parent=None, attributes=None, highlight_index=None, is_new=None, visible=True, viewport_distance=None):
+	node = DOMElementNode(
+		tag_name=tag,
+		xpath='',
+		attributes=attributes or {},
+		children=[],
+		is_visible=visible,
+		is_top_element=True,
+		highlight_index=highlight_index,
+		is_new=is_new,
+		viewport_distance=viewport_distance,
+		parent=parent,
+	)
+	if parent is not None:
+		parent.children.append(node)
+	return node
+
+
+def _text(text, parent):
+	node = DOMTextNode(text=text, is_visible=True, parent=parent)
+	parent.children.append(node)
+	return node
+
+
+def _build_tree():
+	body = _element('body')
+	_text('Welcome', body)
+	nav = _element('nav', body)
+	link = _element('a', nav, {'title': 'Home page', 'role': 'a'}, highlight_index=0)
+	_text('Home page', link)
+	# nested highlighted element inside a highlighted element gets its own line and indentation
+	menu = _element('div', body, {'role': 'button', 'aria-label': 'Open the menu'}, highlight_index=1, is_new=True)
+	label = _element('span', menu)
+	_text('Menu', label)
+	item = _element('button', menu, {'type': 'submit', 'name': 'submit-form', 'title': 'submit-form'}, highlight_index=2)
+	_text('Send', item)
+	_element('input', body, {'placeholder': 'Search...', 'value': ''}, highlight_index=3)
+	_element('button', body, highlight_index=4)
+	hidden = _element('div', body, visible=False)
+	_text('not shown', hidden)
+	return body, menu
+
+
+def test_serialization_format():
+	body, _ = _build_tree()
+	assert body.clickable_elements_to_string() == '\n'.join(
+		[
+			'Welcome',
+			'[0]<a >Home page />',
+			'*[1]<div role=button aria-label=Open the menu>Menu />',
+			'\t[2]<button type=submit title=submit-form>Send />',
+			'[3]<input placeholder=Search... />',
+			'[4]<button  />',
+		]
+	)
+
+
+def test_include_attributes_filter():
+	body, _ = _build_tree()
+	lines = body.clickable_elements_to_string(include_attributes=['type']).splitlines()
+	assert lines[2] == '*[1]<div >Menu />'
+	assert lines[3] == '\t[2]<button type=submit>Send />'
+
+
+def test_subtree_below_highlighted_element():
+	_, menu = _build_tree()
+	assert menu.children[1].clickable_elements_to_string() == '[2]<button type=submit title=submit-form>Send />'
+	# text of a subtree whose ancestor is highlighted belongs to that ancestor
+	assert menu.children[0].clickable_elements_to_string() == ''
+
+
+def test_budget_large_enough_matches_full_output():
+	body, _ = _build_tree()
+	text, omitted = body.clickable_elements_to_string_within_budget(max_length=10_000)
+	assert text == body.clickable_elements_to_string()
+	assert not omitted
+
+
+def test_budget_prefers_viewport_then_new_then_nearest():
+	body = _element('body')
+	# a long header above the viewport comes first in document order
+	for index in range(5):
+		_element('a', body, {'title': f'header link {index}'}, highlight_index=index, viewport_distance=800 - index)
+	_element('button', body, {'title': 'new'}, highlight_index=5, viewport_distance=300, is_new=True)
+	_element('button', body, {'title': 'visible'}, highlight_index=6, viewport_distance=0)
+
+	text, omitted = body.clickable_elements_to_string_within_budget(max_length=81)
+
+	assert text.splitlines() == [
+		'[4]<a title=header link 4 />',
+		'*[5]<button title=new />',
+		'[6]<button title=visible />',
+	]
+	assert len(text) <= 81
+	assert omitted.elements == 4 and omitted.in_viewport == 0 and omitted.new == 0
+	assert sorted(omitted.highlight_indexes) == [0, 1, 2, 3]
@@ -0,0 +1,78 @@
+"""
+Tests for decoding the compact columnar buildDomTree transport.
+
+run with:
+python -m pytest tests/test_dom_compact.py
+"""
+
+import json
+import threading
+
+from browser_use.dom.service import (
+	COMPACT_FLAG_INTERACTIVE,
+	COMPACT_FLAG_SHADOW_ROOT,
+	COMPACT_FLAG_TEXT,
+	COMPACT_FLAG_TOP_ELEMENT,
+	COMPACT_FLAG_VISIBLE,
+	DomService,
+)
+from browser_use.dom.views import DOMElementNode, DOMTextNode
+
+
+class FakePage:
+	url = 'https://example.com'
+
+
+def _payload():
+	visible_top = COMPACT_FLAG_VISIBLE | COMPACT_FLAG_TOP_ELEMENT
+	return {
+		'tags': ['body', 'div', 'button'],
+		'attributeNames': ['id', 'aria-label'],
+		# body > div(shadow root) > [button, "Click"], body > button
+		'parents': [-1, 0, 1, 1, 0],
+		'flags': [
+			0,
+			visible_top | COMPACT_FLAG_SHADOW_ROOT,
+			visible_top | COMPACT_FLAG_INTERACTIVE,
+			COMPACT_FLAG_TEXT | COMPACT_FLAG_VISIBLE,
+			visible_top | COMPACT_FLAG_INTERACTIVE,
+		],
+		'tagIds': [0, 1, 2, -1, 2],
+		'xpaths': [['/body'], ['html/body/div'], 'button[1]', None, ['html/body/button']],
+		'highlightIndexes': [-1, -1, 0, -1, 1],
+		'viewportDistances': [-1, -1, 0, -1, 120],
+		'texts': [None, None, None, 'Click', None],
+		'attributes': [None, [0, 'main'], [0, 'go', 1, None], None, None],
+	}
+
+
+async def test_compact_payload_rebuilds_tree():
+	root, selector_map = await DomService(FakePage())._construct_dom_tree_from_compact(_payload())  # type: ignore[arg-type]
+
+	assert root.tag_name == 'body' and root.xpath == '/body' and root.attributes == {}
+	div, second_button = root.children
+	assert isinstance(div, DOMElementNode) and div.shadow_root and div.attributes == {'id': 'main'}
+	button, text = div.children
+	assert isinstance(button, DOMElementNode) and isinstance(text, DOMTextNode)
+	assert button.xpath == 'html/body/div/button[1]'
+	assert button.attributes == {'id': 'go', 'aria-label': None}
+	assert button.parent is div and text.parent is div and text.text == 'Click'
+	assert selector_map == {0: button, 1: second_button}
+	assert button.viewport_distance == 0 and second_button.viewport_distance == 120 and div.viewport_distance is None
+	assert second_button.xpath == 'html/body/button' and second_button.is_interactive and not root.is_visible
+
+
+async def test_transport_string_is_decoded_off_the_event_loop(monkeypatch):
+	threads = []
+	construct = DomService._construct_dom_tree_from_compact_sync
+
+	def record_thread(self, payload):
+		threads.append(threading.get_ident())
+		assert isinstance(payload, str)
+		return construct(self, payload)
+
+	monkeypatch.setattr(DomService, '_construct_dom_tree_from_compact_sync', record_thread)
+	root, selector_map = await DomService(FakePage())._construct_dom_tree_from_compact(json.dumps(_payload()))  # type: ignore[arg-type]
+
+	assert threads and threads[0] != threading.get_ident()
+	assert root.tag_name == 'body' and sorted(selector_map) == [0, 1]
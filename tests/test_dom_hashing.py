@@ -0,0 +1,120 @@
+"""
+Tests for the top-down branch path hashing and the per-snapshot index used by get_state_summary, multi_act and history replay.
+
+run with:
+python -m pytest tests/test_dom_hashing.py
+"""
+
+from browser_use.browser.views import BrowserStateSummary
+from browser_use.dom.clickable_element_processor.service import ClickableElementProcessor
+from browser_use.dom.history_tree_processor.service import HistoryElementIndex, HistoryTreeProcessor
+from browser_use.dom.views import DOMElementNode, DOMTextNode
+
+
+def _element(tag, xpath, parent=None, highlight_index=None, attributes=None):
+	node = DOMElementNode(
+		tag_name=tag,
+		xpath=xpath,
+		attributes=attributes or {},
+		children=[],
+		is_visible=True,
+		parent=parent,
+		highlight_index=highlight_index,
+	)
+	if parent is not None:
+		parent.children.append(node)
+	return node
+
+
+def _tree():
+	root = _element('html', '/html')
+	body = _element('body', 'body', root)
+	form = _element('form', 'body/form', body)
+	button = _element('button', 'body/form/button', form, highlight_index=0, attributes={'type': 'submit'})
+	button.children.append(DOMTextNode(text='Send', is_visible=True, parent=button))
+	link = _element('a', 'body/a', body, highlight_index=1, attributes={'href': '/about'})
+	return root, {0: button, 1: link}
+
+
+class TestTopDownHashing:
+	def test_matches_bottom_up_hash(self):
+		root, selector_map = _tree()
+		expected = {index: HistoryTreeProcessor._hash_dom_element(node) for index, node in selector_map.items()}
+		assert HistoryTreeProcessor.hash_dom_tree(root) == expected
+
+	def test_matches_history_element(self):
+		root, selector_map = _tree()
+		history_element = HistoryTreeProcessor.convert_dom_element_to_history_element(selector_map[0])
+		assert history_element.entire_parent_branch_path == ['body', 'form', 'button']
+
+		# the same element in a fresh snapshot, under a different index
+		new_root = _element('html', '/html')
+		new_body = _element('body', 'body', new_root)
+		_element('a', 'body/a', new_body, highlight_index=0, attributes={'href': '/about'})
+		new_form = _element('form', 'body/form', new_body)
+		new_button = _element('button', 'body/form/button', new_form, highlight_index=5, attributes={'type': 'submit'})
+
+		assert HistoryTreeProcessor.find_history_element_in_tree(history_element, new_root) is new_button
+
+	def test_branch_path_depends_on_ancestors(self):
+		root, selector_map = _tree()
+		hashes = HistoryTreeProcessor.hash_dom_tree(root)
+		moved = _element('button', 'body/form/button', _element('div', 'body/div', root.children[0]), highlight_index=2)
+		assert HistoryTreeProcessor.hash_dom_tree(root)[2].branch_path_hash != hashes[0].branch_path_hash
+		assert moved.hash == HistoryTreeProcessor._hash_dom_element(moved)
+
+	def test_state_hash_table_is_computed_once_and_memoized_on_nodes(self):
+		root, selector_map = _tree()
+		state = BrowserStateSummary(element_tree=root, selector_map=selector_map, url='https://example.com', title='', tabs=[])
+		table = state.element_hashes
+		assert state.element_hashes is table
+		# element.hash reuses the table entry instead of walking up to the root again
+		assert selector_map[1].hash is table[1]
+		assert ClickableElementProcessor.hash_dom_element(selector_map[1]) == hash(table[1])
+		assert ClickableElementProcessor.get_clickable_elements_hashes(root) == {hash(h) for h in table.values()}
+
+
+class TestHistoryElementIndex:
+	def test_exact_lookup_prefers_first_in_document_order(self):
+		root, selector_map = _tree()
+		duplicate = _element('a', 'body/a', root.children[0], highlight_index=7, attributes={'href': '/about'})
+		index = HistoryElementIndex.build(root)
+		history_element = HistoryTreeProcessor.convert_dom_element_to_history_element(duplicate)
+		assert index.find(history_element) is selector_map[1]
+
+	def test_fuzzy_fallback_on_xpath_and_stable_attributes(self):
+		root, selector_map = _tree()
+		button = selector_map[0]
+		history_element = HistoryTreeProcessor.convert_dom_element_to_history_element(button)
+		history_element.attributes = {'type': 'submit', 'class': 'renamed'}
+		index = HistoryElementIndex.build(root)
+		assert index.find(history_element) is None
+		assert index.find(history_element, fuzzy=True) is button
+
+		# xpath moved too, the stable id still identifies the element
+		body = root.children[0]
+		field = _element('input', 'body/div/input', _element('div', 'body/div', body), highlight_index=3, attributes={'id': 'q'})
+		history_element = HistoryTreeProcessor.convert_dom_element_to_history_element(field)
+		history_element.xpath = 'body/section/input'
+		history_element.entire_parent_branch_path = ['body', 'section', 'input']
+		assert HistoryElementIndex.build(root).find(history_element, fuzzy=True) is field
+
+	def test_fuzzy_fallback_rejects_ambiguous_candidates(self):
+		root, _ = _tree()
+		body = root.children[0]
+		_element('input', 'body/input[1]', body, highlight_index=3, attributes={'name': 'q'})
+		_element('input', 'body/input[2]', body, highlight_index=4, attributes={'name': 'q'})
+		history_element = HistoryTreeProcessor.convert_dom_element_to_history_element(body.children[-1])
+		history_element.xpath = 'body/input[3]'
+		history_element.attributes = {'name': 'q', 'value': 'x'}
+		assert HistoryElementIndex.build(root).find(history_element, fuzzy=True) is None
+
+	def test_state_index_is_built_once(self):
+		root, selector_map = _tree()
+		state = BrowserStateSummary(element_tree=root, selector_map=selector_map, url='https://example.com', title='', tabs=[])
+		assert state.history_index is state.history_index
+		history_element = HistoryTreeProcessor.convert_dom_element_to_history_element(selector_map[1])
+		assert (
+			HistoryTreeProcessor.find_history_element_in_tree(history_element, root, element_index=state.history_index)
+			is selector_map[1]
+		)
@@ -0,0 +1,58 @@
+"""
+Tests that drawing the highlight overlays doesn't change which elements get an index.
+
+Needs a real Chromium (playwright install chromium), skipped otherwise.
+
+run with:
+python -m pytest tests/test_dom_highlight_indexes.py
+"""
+
+import pytest
+from playwright.async_api import async_playwright
+
+from browser_use.dom.service import DomService
+
+HIGHLIGHT_CONTAINER_ID = 'playwright-highlight-container'
+
+# interactive elements nested in interactive elements, some distinct (own handler / tag) and some not
+PAGE = """
+<a href="#card" style="display: block; cursor: pointer">
+	<span style="cursor: pointer">Card title</span>
+	<button onclick="void 0">Add to cart</button>
+</a>
+<div role="button" tabindex="0" style="cursor: pointer">
+	<span style="cursor: pointer">Menu</span>
+	<div role="menuitem" tabindex="0">Settings</div>
+</div>
+<label style="cursor: pointer"><input type="checkbox"> Remember me</label>
+<input type="text" placeholder="Search">
+"""
+
+
+@pytest.fixture
+async def page():
+	async with async_playwright() as playwright:
+		try:
+			browser = await playwright.chromium.launch(headless=True)
+		except Exception as e:
+			pytest.skip(f'Chromium is not available: {type(e).__name__}')
+		page = await browser.new_page()
+		await page.set_content(PAGE)
+		yield page
+		await browser.close()
+
+
+def _elements(dom_state):
+	return [(index, node.tag_name, node.xpath) for index, node in sorted(dom_state.selector_map.items())]
+
+
+async def test_element_list_does_not_depend_on_highlights(page):
+	highlighted = await DomService(page).get_clickable_elements(highlight_elements=True)
+	assert await page.evaluate(f"!!document.getElementById('{HIGHLIGHT_CONTAINER_ID}')")
+	await page.evaluate(f"document.getElementById('{HIGHLIGHT_CONTAINER_ID}').remove()")
+
+	plain = await DomService(page).get_clickable_elements(highlight_elements=False)
+	assert not await page.evaluate(f"!!document.getElementById('{HIGHLIGHT_CONTAINER_ID}')")
+
+	assert _elements(plain) == _elements(highlighted)
+	assert len(highlighted.selector_map) >= 5
@@ -0,0 +1,123 @@
+"""
+Tests for applying incremental buildDomTree snapshots to the Python DOM tree.
+
+run with:
+python -m pytest tests/test_dom_incremental.py
+"""
+
+import weakref
+
+from browser_use.dom.service import _INCREMENTAL_INDEXES, DomService
+from browser_use.dom.views import DOMElementNode
+
+
+class FakePage:
+	url = 'https://example.com'
+
+
+def _element(tag, xpath, children, highlight_index=None):
+	node = {
+		'tagName': tag,
+		'xpath': xpath,
+		'attributes': {},
+		'children': children,
+		'isVisible': True,
+		'isTopElement': True,
+	}
+	if highlight_index is not None:
+		node['isInteractive'] = True
+		node['highlightIndex'] = highlight_index
+	return node
+
+
+def _snapshot(node_map, removed=(), epoch=1, full=False, root_id='0'):
+	return {'rootId': root_id, 'map': node_map, 'removed': list(removed), 'indexId': 'idx', 'epoch': epoch, 'full': full}
+
+
+class TestIncrementalSnapshots:
+	def setup_method(self):
+		self.page = FakePage()
+		self.service = DomService(self.page)  # type: ignore[arg-type]
+
+	def _apply(self, eval_page):
+		return self.service._apply_incremental_snapshot(eval_page, _INCREMENTAL_INDEXES.get(self.page))
+
+	def test_full_snapshot_builds_tree(self):
+		root, selector_map = self._apply(
+			_snapshot(
+				{
+					'0': _element('body', '/body', ['1', '2']),
+					'1': _element('button', 'button[1]', [], highlight_index=0),
+					'2': {'type': 'TEXT_NODE', 'text': 'hello', 'isVisible': True},
+				},
+				full=True,
+			)
+		)
+		assert root.tag_name == 'body'
+		assert [type(child).__name__ for child in root.children] == ['DOMElementNode', 'DOMTextNode']
+		assert selector_map[0].tag_name == 'button'
+		assert selector_map[0].parent is root
+
+	def test_delta_leaves_the_previous_tree_intact(self):
+		root, first_map = self._apply(
+			_snapshot(
+				{
+					'0': _element('body', '/body', ['1', '2']),
+					'1': _element('button', 'button[1]', [], highlight_index=0),
+					'2': _element('div', 'div[1]', ['3']),
+					'3': _element('a', 'div[1]/a[1]', [], highlight_index=1),
+				},
+				full=True,
+			)
+		)
+		button = first_map[0]
+		link = first_map[1]
+
+		# the link is removed and a new input appears, ancestors are sent along with the change
+		new_root, second_map = self._apply(
+			_snapshot(
+				{
+					'0': _element('body', '/body', ['1', '2']),
+					'2': _element('div', 'div[1]', ['4']),
+					'4': _element('input', 'div[1]/input[1]', [], highlight_index=1),
+				},
+				removed=['3'],
+				epoch=2,
+			)
+		)
+
+		# the unchanged button is copied into the new tree
+		assert second_map[0] is not button and second_map[0].xpath == button.xpath
+		assert second_map[0].parent is new_root and second_map[0] in new_root.children
+		assert second_map[1].tag_name == 'input'
+		assert isinstance(second_map[1].parent, DOMElementNode) and second_map[1].parent.tag_name == 'div'
+
+		# the previous epoch's tree and selector map are left untouched
+		assert root is not new_root
+		assert first_map == {0: button, 1: link}
+		assert button.parent is root and link.parent is root.children[1]
+		assert root.children == [button, link.parent] and link.parent.children == [link]
+
+	def test_empty_delta_returns_a_copy_of_the_same_tree(self):
+		root, first_map = self._apply(_snapshot({'0': _element('body', '/body', ['1']), '1': _element('a', 'a[1]', [], 0)}))
+		first_map[0].is_new = True  # what get_state_summary does
+
+		again_root, again_map = self._apply(_snapshot({}, epoch=1))
+		assert again_root is not root and again_root.xpath == root.xpath
+		assert again_map[0] is not first_map[0] and again_map[0].parent is again_root
+		assert again_map[0].is_new is False and first_map[0].is_new is True
+
+	def test_mismatched_index_falls_back_to_full(self):
+		self._apply(_snapshot({'0': _element('body', '/body', ['1']), '1': _element('a', 'a[1]', [], 0)}))
+		eval_page = _snapshot({'5': _element('body', '/body', [])}, root_id='5')
+		eval_page['indexId'] = 'other-document'
+		root, selector_map = self._apply(eval_page)
+		assert root.children == []
+		assert selector_map == {}
+
+	def test_index_is_dropped_with_page(self):
+		self._apply(_snapshot({'0': _element('body', '/body', [])}))
+		page_ref = weakref.ref(self.page)
+		assert self.page in _INCREMENTAL_INDEXES
+		del self.service, self.page
+		assert page_ref() is None
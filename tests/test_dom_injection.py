@@ -0,0 +1,55 @@
+"""
+Tests for installing buildDomTree once per document.
+
+run with:
+python -m pytest tests/test_dom_injection.py
+"""
+
+from browser_use.dom.service import BUILD_DOM_TREE_GLOBAL, DomService, _get_build_dom_tree_scripts
+
+
+class FakeDocumentPage:
+	"""Page double that remembers whether buildDomTree was installed into its current document."""
+
+	url = 'https://example.com'
+
+	def __init__(self):
+		self.installed = False
+		self.scripts: list[str] = []
+
+	async def evaluate(self, script, args=None):
+		if script == '1+1':
+			return 2
+		self.scripts.append(script)
+		if script == DomService(self)._install_and_run_js:  # type: ignore[arg-type]
+			self.installed = True
+		elif not self.installed:
+			return None
+		return {'rootId': '0', 'map': {'0': {'tagName': 'body', 'xpath': '/body', 'attributes': {}, 'children': []}}}
+
+
+async def test_build_dom_tree_is_installed_once_per_document():
+	_, install_and_run, run_installed = _get_build_dom_tree_scripts()
+	page = FakeDocumentPage()
+
+	for _ in range(3):
+		await DomService(page).get_clickable_elements()  # type: ignore[arg-type]
+	assert page.scripts == [run_installed, install_and_run, run_installed, run_installed]
+
+	# a navigation drops the installed copy, the next call installs it again
+	page.installed = False
+	await DomService(page).get_clickable_elements()  # type: ignore[arg-type]
+	assert page.scripts[-2:] == [run_installed, install_and_run]
+
+
+def test_scripts_are_read_once_and_locked_down():
+	assert _get_build_dom_tree_scripts() is _get_build_dom_tree_scripts()
+	source, install_and_run, run_installed = _get_build_dom_tree_scripts()
+	assert len(run_installed) < 500 < len(source)
+
+	# the stub only trusts the property install_and_run defines, under a name the page can't know in advance
+	global_name = run_installed.split("getOwnPropertyDescriptor(window, '")[1].split("'")[0]
+	assert global_name.startswith(f'{BUILD_DOM_TREE_GLOBAL}_') and len(global_name.split('_')[-1]) == 16
+	assert f"Object.defineProperty(window, '{global_name}'" in install_and_run
+	assert 'configurable: false' in install_and_run and 'writable: false' in install_and_run
+	assert 'Object.freeze(' in install_and_run and 'Object.isFrozen(' in run_installed
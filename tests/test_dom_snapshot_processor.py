@@ -0,0 +1,215 @@
+"""
+Tests for building the DOM tree from DOMSnapshot.captureSnapshot results.
+
+run with:
+python -m pytest tests/test_dom_snapshot_processor.py
+"""
+
+from browser_use.dom.snapshot_processor.service import SNAPSHOT_COMPUTED_STYLES, DOMSnapshotProcessor, SnapshotViewport
+from browser_use.dom.views import DOMElementNode, DOMTextNode
+
+DEFAULT_STYLE = {'display': 'block', 'visibility': 'visible', 'opacity': '1', 'cursor': 'auto', 'position': 'static'}
+
+
+class SnapshotBuilder:
+	"""Builds the flat captureSnapshot arrays from a list of nodes"""
+
+	def __init__(self):
+		self.strings: list[str] = []
+		self.documents: list[dict] = []
+
+	def _string(self, value: str) -> int:
+		if value not in self.strings:
+			self.strings.append(value)
+		return self.strings.index(value)
+
+	def document(self, scroll=(0, 0)) -> dict:
+		document = {
+			'frameId': self._string(f'FRAME{len(self.documents)}'),
+			'nodes': {
+				'parentIndex': [],
+				'nodeType': [],
+				'nodeName': [],
+				'nodeValue': [],
+				'backendNodeId': [],
+				'attributes': [],
+				'isClickable': {'index': []},
+				'contentDocumentIndex': {'index': [], 'value': []},
+			},
+			'layout': {'nodeIndex': [], 'bounds': [], 'styles': [], 'paintOrders': []},
+			'scrollOffsetX': scroll[0],
+			'scrollOffsetY': scroll[1],
+		}
+		self.documents.append(document)
+		self.node(document, -1, 9, '#document')
+		return document
+
+	def node(self, document, parent, node_type, name, value='', attributes=None, bounds=None, style=None, clickable=False):
+		nodes = document['nodes']
+		index = len(nodes['parentIndex'])
+		nodes['parentIndex'].append(parent)
+		nodes['nodeType'].append(node_type)
+		nodes['nodeName'].append(self._string(name))
+		nodes['nodeValue'].append(self._string(value) if value else -1)
+		nodes['backendNodeId'].append(1000 * len(self.documents) + index)
+		nodes['attributes'].append([self._string(item) for pair in (attributes or {}).items() for item in pair])
+		if clickable:
+			nodes['isClickable']['index'].append(index)
+		if bounds is not None:
+			layout = document['layout']
+			layout['nodeIndex'].append(index)
+			layout['bounds'].append(list(bounds))
+			merged_style = {**DEFAULT_STYLE, **(style or {})}
+			layout['styles'].append([self._string(merged_style.get(name, '')) for name in SNAPSHOT_COMPUTED_STYLES])
+			layout['paintOrders'].append(len(layout['paintOrders']))
+		return index
+
+	def element(self, document, parent, tag, attributes=None, bounds=(0, 0, 100, 20), **kwargs):
+		return self.node(document, parent, 1, tag.upper(), attributes=attributes, bounds=bounds, **kwargs)
+
+	def text(self, document, parent, value, bounds=(0, 0, 50, 10)):
+		return self.node(document, parent, 3, '#text', value=value, bounds=bounds)
+
+	def page(self):
+		document = self.document()
+		html = self.element(document, 0, 'html', bounds=(0, 0, 800, 2000))
+		body = self.element(document, html, 'body', bounds=(0, 0, 800, 2000))
+		return document, body
+
+	def snapshot(self) -> dict:
+		return {'documents': self.documents, 'strings': self.strings}
+
+
+def _process(builder: SnapshotBuilder, **kwargs) -> DOMSnapshotProcessor:
+	processor = DOMSnapshotProcessor(builder.snapshot(), SnapshotViewport(width=800, height=600), **kwargs)
+	return processor
+
+
+def test_builds_tree_selector_map_and_xpaths():
+	builder = SnapshotBuilder()
+	document, body = builder.page()
+	form = builder.element(document, body, 'div', bounds=(0, 0, 800, 100))
+	first = builder.element(document, form, 'button', bounds=(10, 10, 80, 20))
+	builder.text(document, first, ' Send ', bounds=(12, 12, 30, 10))
+	builder.element(document, form, 'button', bounds=(100, 10, 80, 20), attributes={'disabled': ''})
+	link = builder.element(document, form, 'a', {'href': '/about'}, bounds=(200, 10, 80, 20))
+	builder.element(document, form, 'script', bounds=None)
+
+	processor = _process(builder)
+	root, selector_map = processor.build()
+
+	assert root.xpath == '/body' and root.tag_name == 'body'
+	div = root.children[0]
+	assert isinstance(div, DOMElementNode) and div.xpath == 'html/body/div'
+	assert [child.xpath for child in div.children if isinstance(child, DOMElementNode)] == [
+		'html/body/div/button[1]',
+		'html/body/div/button[2]',
+		'html/body/div/a',
+	]
+	assert [node.tag_name for node in selector_map.values()] == ['button', 'a']
+	assert selector_map[0].backend_node_id == 1000 + first
+	assert selector_map[1].backend_node_id == 1000 + link
+	assert selector_map[1].attributes == {'href': '/about'}
+	assert selector_map[0].viewport_distance == 0
+	text = selector_map[0].children[0]
+	assert isinstance(text, DOMTextNode) and text.text == 'Send' and text.is_visible
+	assert not div.children[1].is_interactive  # type: ignore[union-attr]
+	assert [index for index, _ in processor.highlight_rects] == [0, 1]
+
+
+def test_covered_elements_are_not_top():
+	builder = SnapshotBuilder()
+	document, body = builder.page()
+	builder.element(document, body, 'button', bounds=(10, 10, 80, 20))
+	# a modal painted later covers the button
+	modal = builder.element(document, body, 'div', bounds=(0, 0, 800, 600))
+	builder.element(document, modal, 'input', bounds=(300, 300, 100, 20))
+	# pointer-events: none overlays don't block the hit test
+	builder.element(document, body, 'div', bounds=(0, 0, 800, 600), style={'pointer-events': 'none'})
+
+	root, selector_map = _process(builder).build()
+	button = root.children[0]
+	assert isinstance(button, DOMElementNode) and button.is_visible and not button.is_top_element
+	assert [node.tag_name for node in selector_map.values()] == ['input']
+
+
+def test_viewport_expansion_and_hidden_elements():
+	builder = SnapshotBuilder()
+	document, body = builder.page()
+	builder.element(document, body, 'button', bounds=(10, 10, 80, 20), style={'visibility': 'hidden'})
+	builder.element(document, body, 'button', bounds=(10, 700, 80, 20))
+	builder.element(document, body, 'span', bounds=(10, 50, 80, 20), style={'cursor': 'pointer'})
+
+	root, selector_map = _process(builder, viewport_expansion=500).build()
+	assert not root.children[0].is_visible
+	# below the viewport: centre is outside of it, so it is never the topmost element (same as elementFromPoint)
+	assert not root.children[1].is_top_element  # type: ignore[union-attr]
+	assert [node.tag_name for node in selector_map.values()] == ['span']
+
+	# with viewport_expansion=-1 everything visible is considered, hidden elements still aren't
+	_, everything = _process(builder, viewport_expansion=-1).build()
+	assert [node.attributes for node in everything.values()] == [{}, {}]
+	assert [node.xpath for node in everything.values()] == ['html/body/button[2]', 'html/body/span']
+
+
+def test_nested_interactive_elements_and_clickable_listeners():
+	builder = SnapshotBuilder()
+	document, body = builder.page()
+	button = builder.element(document, body, 'button', bounds=(10, 10, 200, 40))
+	builder.element(document, button, 'span', bounds=(20, 20, 40, 20), style={'cursor': 'pointer'})
+	builder.element(document, button, 'a', {'href': '#'}, bounds=(100, 20, 40, 20))
+	builder.element(document, body, 'div', {'class': 'card'}, bounds=(10, 100, 200, 40), clickable=True)
+
+	_, selector_map = _process(builder).build()
+	# the span triggers the button's action, the nested link is a distinct interaction
+	assert [node.tag_name for node in selector_map.values()] == ['button', 'a', 'div']
+
+
+def test_element_list_does_not_depend_on_highlights():
+	builder = SnapshotBuilder()
+	document, body = builder.page()
+	card = builder.element(document, body, 'a', {'href': '#card'}, bounds=(10, 10, 300, 60))
+	builder.element(document, card, 'span', bounds=(20, 20, 80, 20), style={'cursor': 'pointer'})
+	builder.element(document, card, 'button', {'onclick': 'void 0'}, bounds=(120, 20, 80, 20))
+	menu = builder.element(document, body, 'div', {'role': 'button', 'tabindex': '0'}, bounds=(10, 100, 300, 60))
+	builder.element(document, menu, 'span', bounds=(20, 110, 80, 20), style={'cursor': 'pointer'})
+	builder.element(document, menu, 'div', {'role': 'menuitem', 'tabindex': '0'}, bounds=(120, 110, 80, 20))
+	builder.element(document, body, 'input', {'type': 'text'}, bounds=(10, 200, 200, 20))
+
+	def elements(processor):
+		_, selector_map = processor.build()
+		return [(index, node.tag_name, node.xpath) for index, node in selector_map.items()]
+
+	highlighted = _process(builder)
+	plain = _process(builder, highlight_elements=False)
+	assert elements(plain) == elements(highlighted)
+	assert len(elements(highlighted)) >= 5
+	assert highlighted.highlight_rects and not plain.highlight_rects
+
+
+def test_iframes_and_shadow_roots():
+	builder = SnapshotBuilder()
+	document, body = builder.page()
+	host = builder.element(document, body, 'div', bounds=(0, 0, 400, 50))
+	shadow_root = builder.node(document, host, 11, '#document-fragment')
+	builder.element(document, shadow_root, 'button', bounds=(10, 10, 80, 20))
+	iframe = builder.element(document, body, 'iframe', {'src': '/frame'}, bounds=(0, 100, 400, 300))
+
+	frame_document = builder.document(scroll=(0, 50))
+	document['nodes']['contentDocumentIndex'] = {'index': [iframe], 'value': [1]}
+	frame_html = builder.element(frame_document, 0, 'html', bounds=(0, 0, 400, 1000))
+	frame_body = builder.element(frame_document, frame_html, 'body', bounds=(0, 0, 400, 1000))
+	builder.element(frame_document, frame_body, 'input', bounds=(10, 60, 100, 20))
+
+	root, selector_map = _process(builder).build()
+	shadow_host = root.children[0]
+	assert isinstance(shadow_host, DOMElementNode) and shadow_host.shadow_root
+	assert shadow_host.children[0].xpath == 'button'  # type: ignore[union-attr]
+
+	frame = root.children[1]
+	assert isinstance(frame, DOMElementNode) and frame.attributes == {'src': '/frame'}
+	assert frame.children[0].xpath == 'html'  # type: ignore[union-attr]
+	assert [node.tag_name for node in selector_map.values()] == ['button', 'input']
+	frame_input = selector_map[1]
+	assert frame_input.xpath == 'html/body/input' and frame_input.backend_node_id == 2000 + 3
+	assert (root.frame_id, selector_map[0].frame_id, frame_input.frame_id) == ('FRAME0', 'FRAME0', 'FRAME1')
@@ -0,0 +1,120 @@
+"""
+Tests for DomainPatternMatcher, the compiled form of match_url_with_domain_pattern used for allowed_domains and
+domain-scoped sensitive data.
+
+run with:
+python -m pytest tests/test_domain_pattern_matcher.py
+"""
+
+import itertools
+import logging
+
+from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.controller.registry.service import Registry
+from browser_use.controller.registry.views import ActionRegistry
+from browser_use.utils import DomainPatternMatcher, get_domain_pattern_matcher, match_url_with_domain_pattern
+
+PATTERNS = [
+	'example.com',
+	'EXAMPLE.org',
+	'*.example.com',
+	'*.co.uk',
+	'*google.com',
+	'foo*.example.net',
+	'a.*.example.io',
+	'*.exa?ple.dev',
+	'http*://*.github.com',
+	'http://plain.com',
+	'chrome-extension://*',
+	'example.com:8080',
+	'*.*.example.com',
+	'example.*',
+	'*.example*.com',
+	'*',
+	'ftp://files.example.com',
+	'https://[::1]',
+	'*.',
+	'',
+]
+
+URLS = [
+	'https://example.com',
+	'https://example.com:8443/path?q=1',
+	'http://example.com',
+	'https://sub.example.com/a',
+	'https://a.b.sub.example.com',
+	'https://notexample.com',
+	'https://example.org',
+	'https://www.bbc.co.uk',
+	'https://co.uk',
+	'https://google.com',
+	'https://agoogle.com',
+	'https://foobar.example.net',
+	'https://bar.example.net',
+	'https://a.b.example.io',
+	'https://a.example.io',
+	'https://x.example.dev',
+	'https://x.exaxple.dev',
+	'http://api.github.com',
+	'https://github.com',
+	'http://plain.com',
+	'https://plain.com',
+	'chrome-extension://abcdefgh/popup.html',
+	'ftp://files.example.com/x',
+	'https://[::1]:3000/',
+	'https://trailing.dot.',
+	'https://*.example.com',
+	'https://*.*.example.com',
+	'about:blank',
+	'chrome://new-tab-page/',
+	'notaurl',
+	'https://[broken',
+	'',
+]
+
+
+def test_matches_exactly_like_the_reference_implementation():
+	for patterns in [PATTERNS, *itertools.combinations(PATTERNS, 2)]:
+		matcher = DomainPatternMatcher(patterns)
+		for url in URLS:
+			expected = tuple(pattern for pattern in patterns if match_url_with_domain_pattern(url, pattern))
+			assert matcher.match(url) == expected, (patterns, url)
+
+
+def test_unsafe_patterns_are_reported_once(caplog):
+	with caplog.at_level(logging.ERROR):
+		matcher = DomainPatternMatcher(['*.*.example.com', 'example.*'], log_warnings=True)
+		for _ in range(3):
+			assert not matcher.matches('https://a.b.example.com')
+	assert len([record for record in caplog.records if '⛔️' in record.message]) == 2
+
+
+def test_matchers_and_verdicts_are_cached():
+	assert get_domain_pattern_matcher(('example.com',)) is get_domain_pattern_matcher(('example.com',))
+	matcher = get_domain_pattern_matcher(('*.example.com',))
+	matcher.match('https://a.example.com/1')
+	matcher.match('https://a.example.com/1')
+	assert matcher.match.cache_info().hits >= 1
+
+
+def test_callers_use_the_compiled_matcher():
+	browser_session = BrowserSession(browser_profile=BrowserProfile(allowed_domains=['*.example.com', 'http*://test.org']))
+	assert browser_session._is_url_allowed('https://docs.example.com/x')
+	assert browser_session._is_url_allowed('http://test.org')
+	assert browser_session._is_url_allowed('about:blank')
+	assert not browser_session._is_url_allowed('https://example.org')
+
+	assert ActionRegistry._match_domains(['*.example.com'], 'https://a.example.com')
+	assert not ActionRegistry._match_domains(['*.example.com'], 'https://example.org')
+
+	from pydantic import BaseModel
+
+	class Params(BaseModel):
+		text: str
+
+	sensitive_data = {'https://*.example.com': {'pw': 'example-secret'}, 'legacy': 'legacy-secret', 'other.com': {'pw': 'x'}}
+	params = Params(text='<secret>pw</secret> <secret>legacy</secret>')
+	replaced = Registry()._replace_sensitive_data(params, sensitive_data, current_url='https://login.example.com')
+	assert replaced.text == 'example-secret legacy-secret'  # type: ignore[attr-defined]
+	replaced = Registry()._replace_sensitive_data(params, sensitive_data, current_url='https://evil.com')
+	assert replaced.text == '<secret>pw</secret> legacy-secret'  # type: ignore[attr-defined]
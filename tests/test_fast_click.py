@@ -0,0 +1,157 @@
+"""
+Tests for the coordinate fast path of BrowserSession._click_element_node.
+
+run with:
+python -m pytest tests/test_fast_click.py
+"""
+
+import inspect
+
+import pytest
+
+from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.browser.session import CLICK_POINT_JS
+from browser_use.dom.views import DOMElementNode
+
+
+class FakeElementHandle:
+	def __init__(self, click_point):
+		self.click_point = click_point
+		self.clicks = 0
+
+	async def evaluate(self, expression):
+		assert expression == CLICK_POINT_JS
+		return self.click_point
+
+	async def click(self, timeout=None):
+		self.clicks += 1
+
+
+class FakeDownloadInfo:
+	@property
+	async def value(self):
+		raise TimeoutError('no download')
+
+
+class FakeExpectDownload:
+	async def __aenter__(self):
+		return FakeDownloadInfo()
+
+	async def __aexit__(self, *exc_info):
+		return False
+
+
+class FakePage:
+	url = 'https://example.com/'
+
+	async def wait_for_load_state(self):
+		pass
+
+	def expect_download(self, timeout=None):
+		return FakeExpectDownload()
+
+
+class FakeCDPSessionPool:
+	def __init__(self, fail=False, fail_on=None):
+		self.fail = fail
+		self.fail_on = fail_on
+		self.events = []
+
+	async def get(self, page):
+		if self.fail:
+			raise RuntimeError('CDP session is only available in Chromium')
+
+	async def send(self, page, method, params=None):
+		if params['type'] == self.fail_on:
+			raise RuntimeError('Target closed')
+		self.events.append((method, params['type'], params['x'], params['y'], params['button']))
+		return {}
+
+
+def _session(element_handle, snapshot_handle=True, cdp_sessions=None, **profile_kwargs):
+	page = FakePage()
+	element = DOMElementNode(
+		tag_name='button', xpath='button', attributes={}, children=[], is_visible=True, parent=None, highlight_index=3
+	)
+	profile_kwargs.setdefault('downloads_path', None)
+	browser_session = BrowserSession(browser_profile=BrowserProfile(**profile_kwargs))
+	browser_session._cdp_sessions = cdp_sessions or FakeCDPSessionPool()  # type: ignore[assignment]
+	if snapshot_handle:
+		browser_session._snapshot_elements.reset(page)  # type: ignore[arg-type]
+		browser_session._snapshot_elements.handles[3] = element_handle  # type: ignore[assignment]
+
+	async def get_current_page():
+		return page
+
+	async def get_locate_element(element_node):
+		return element_handle
+
+	object.__setattr__(browser_session, 'get_current_page', get_current_page)
+	object.__setattr__(browser_session, 'get_locate_element', get_locate_element)
+	return browser_session, element
+
+
+async def _click(browser_session, element):
+	return await inspect.unwrap(BrowserSession._click_element_node)(browser_session, element)
+
+
+async def test_unobstructed_snapshot_elements_are_clicked_with_mouse_events():
+	element_handle = FakeElementHandle([120.5, 40.0])
+	browser_session, element = _session(element_handle)
+
+	await _click(browser_session, element)
+	assert element_handle.clicks == 0
+	assert browser_session._cdp_sessions.events == [  # type: ignore[attr-defined]
+		('Input.dispatchMouseEvent', 'mouseMoved', 120.5, 40.0, 'none'),
+		('Input.dispatchMouseEvent', 'mousePressed', 120.5, 40.0, 'left'),
+		('Input.dispatchMouseEvent', 'mouseReleased', 120.5, 40.0, 'left'),
+	]
+
+
+async def test_regular_click_when_the_fast_path_does_not_apply():
+	# covered by another element (the hit-test returns null)
+	covered = FakeElementHandle(None)
+	browser_session, element = _session(covered)
+	await _click(browser_session, element)
+	assert covered.clicks == 1 and not browser_session._cdp_sessions.events  # type: ignore[attr-defined]
+
+	# located through selectors instead of the snapshot registry, e.g. inside an iframe
+	located = FakeElementHandle([10, 10])
+	browser_session, element = _session(located, snapshot_handle=False)
+	await _click(browser_session, element)
+	assert located.clicks == 1 and not browser_session._cdp_sessions.events  # type: ignore[attr-defined]
+
+	# disabled in the profile
+	disabled = FakeElementHandle([10, 10])
+	browser_session, element = _session(disabled, fast_coordinate_clicks=False)
+	await _click(browser_session, element)
+	assert disabled.clicks == 1 and not browser_session._cdp_sessions.events  # type: ignore[attr-defined]
+
+	# no CDP (e.g. firefox)
+	no_cdp = FakeElementHandle([10, 10])
+	browser_session, element = _session(no_cdp, cdp_sessions=FakeCDPSessionPool(fail=True))
+	await _click(browser_session, element)
+	assert no_cdp.clicks == 1
+
+
+async def test_no_second_click_once_the_press_was_dispatched():
+	# nothing reached the page yet, the regular click takes over
+	before_press = FakeElementHandle([10, 10])
+	browser_session, element = _session(before_press, cdp_sessions=FakeCDPSessionPool(fail_on='mousePressed'))
+	await _click(browser_session, element)
+	assert before_press.clicks == 1
+
+	# the page may have handled the press already, clicking again could trigger the action twice
+	after_press = FakeElementHandle([10, 10])
+	browser_session, element = _session(after_press, cdp_sessions=FakeCDPSessionPool(fail_on='mouseReleased'))
+	with pytest.raises(Exception, match='Target closed'):
+		await _click(browser_session, element)
+	assert after_press.clicks == 0
+
+	# also while waiting for a download, where click errors don't propagate
+	with_downloads = FakeElementHandle([10, 10])
+	browser_session, element = _session(
+		with_downloads, cdp_sessions=FakeCDPSessionPool(fail_on='mousePressed'), downloads_path='/tmp/downloads'
+	)
+	await _click(browser_session, element)
+	assert with_downloads.clicks == 1
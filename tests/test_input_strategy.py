@@ -0,0 +1,125 @@
+"""
+Tests for choosing between typing key by key and inserting text in one go in BrowserSession._input_text_element_node.
+
+run with:
+python -m pytest tests/test_input_strategy.py
+"""
+
+import inspect
+
+from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.browser.session import INPUT_STRATEGY_PROBE_JS, SET_NATIVE_VALUE_JS
+from browser_use.dom.views import DOMElementNode
+
+LONG_TEXT = 'Lorem ipsum dolor sit amet. ' * 80
+
+
+class FakeElementHandle:
+	def __init__(self, takes_text=True, needs_keystrokes=False, input_element=True):
+		self.probe = {'takesText': takes_text, 'needsKeystrokes': needs_keystrokes}
+		self.input_element = input_element
+		self.probes = 0
+		self.value = None
+
+	async def evaluate(self, expression, arg=None):
+		if expression == INPUT_STRATEGY_PROBE_JS:
+			self.probes += 1
+			return self.probe
+		if expression == SET_NATIVE_VALUE_JS:
+			if self.input_element:
+				self.value = arg
+			return self.input_element
+		return None  # clearing the field
+
+	async def click(self):
+		pass
+
+
+class FakeKeyboard:
+	def __init__(self):
+		self.typed = []
+
+	async def type(self, text):
+		self.typed.append(text)
+
+
+class FakePage:
+	url = 'https://example.com/'
+
+	def __init__(self):
+		self.keyboard = FakeKeyboard()
+
+
+class FakeCDPSessionPool:
+	def __init__(self, fail=False):
+		self.fail = fail
+		self.inserted = []
+
+	async def send(self, page, method, params=None):
+		if self.fail:
+			raise RuntimeError('CDP is not available')
+		assert method == 'Input.insertText'
+		self.inserted.append(params['text'])
+		return {}
+
+
+def _session(element_handle, cdp_sessions=None, **profile_kwargs):
+	page = FakePage()
+	browser_session = BrowserSession(browser_profile=BrowserProfile(**profile_kwargs))
+	browser_session._cdp_sessions = cdp_sessions or FakeCDPSessionPool()  # type: ignore[assignment]
+
+	async def get_current_page():
+		return page
+
+	async def get_locate_element(element_node):
+		return element_handle
+
+	object.__setattr__(browser_session, 'get_current_page', get_current_page)
+	object.__setattr__(browser_session, 'get_locate_element', get_locate_element)
+	return browser_session, page
+
+
+async def _input_text(browser_session, text):
+	element = DOMElementNode(tag_name='textarea', xpath='textarea', attributes={}, children=[], is_visible=True, parent=None)
+	await inspect.unwrap(BrowserSession._input_text_element_node)(browser_session, element, text)
+
+
+async def test_strategy_depends_on_length_and_element():
+	browser_session, _ = _session(None)
+	plain = FakeElementHandle()
+	assert await browser_session._choose_input_strategy(plain, 'short') == 'type'  # type: ignore[arg-type]
+	assert plain.probes == 0  # short texts don't need the probe
+	assert await browser_session._choose_input_strategy(plain, LONG_TEXT) == 'insert'  # type: ignore[arg-type]
+
+	autocomplete = FakeElementHandle(needs_keystrokes=True)
+	assert await browser_session._choose_input_strategy(autocomplete, LONG_TEXT) == 'type'  # type: ignore[arg-type]
+	date_input = FakeElementHandle(takes_text=False)
+	assert await browser_session._choose_input_strategy(date_input, LONG_TEXT) == 'type'  # type: ignore[arg-type]
+
+	always_type, _ = _session(None, bulk_text_input_threshold=None)
+	assert await always_type._choose_input_strategy(plain, LONG_TEXT) == 'type'  # type: ignore[arg-type]
+
+
+async def test_long_text_is_inserted_at_once():
+	browser_session, page = _session(FakeElementHandle())
+	await _input_text(browser_session, LONG_TEXT)
+	assert browser_session._cdp_sessions.inserted == [LONG_TEXT]  # type: ignore[attr-defined]
+	assert not page.keyboard.typed
+
+	browser_session, page = _session(FakeElementHandle())
+	await _input_text(browser_session, 'hello')
+	assert not browser_session._cdp_sessions.inserted  # type: ignore[attr-defined]
+	assert page.keyboard.typed == ['hello']
+
+
+async def test_insert_falls_back_without_cdp():
+	element_handle = FakeElementHandle()
+	browser_session, page = _session(element_handle, cdp_sessions=FakeCDPSessionPool(fail=True))
+	await _input_text(browser_session, LONG_TEXT)
+	assert element_handle.value == LONG_TEXT and not page.keyboard.typed
+
+	# contenteditables have no value setter, those are typed
+	editable = FakeElementHandle(input_element=False)
+	browser_session, page = _session(editable, cdp_sessions=FakeCDPSessionPool(fail=True))
+	await _input_text(browser_session, LONG_TEXT)
+	assert page.keyboard.typed == [LONG_TEXT]
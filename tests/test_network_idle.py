@@ -0,0 +1,155 @@
+"""
+Tests for the event-driven network idle detection behind BrowserSession._wait_for_stable_network.
+
+run with:
+python -m pytest tests/test_network_idle.py
+"""
+
+import asyncio
+
+from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.browser.session import NetworkIdleTracker
+
+IDLE_TIME = 0.05
+
+
+def _request(request_id, url, resource_type='Script', headers=None):
+	return {'requestId': request_id, 'type': resource_type, 'request': {'url': url, 'headers': headers or {}}}
+
+
+def _response(request_id, mime_type='application/javascript', headers=None):
+	return {'requestId': request_id, 'response': {'mimeType': mime_type, 'headers': headers or {}}}
+
+
+async def test_noise_is_never_tracked():
+	tracker = NetworkIdleTracker(idle_time=IDLE_TIME)
+	tracker.on_cdp_request(_request('1', 'https://www.Google-Analytics.com/collect'))
+	tracker.on_cdp_request(_request('2', 'https://example.com/feed', resource_type='XHR'))
+	tracker.on_cdp_request(_request('3', 'data:image/png;base64,AAAA', resource_type='Image'))
+	tracker.on_cdp_request(_request('4', 'https://example.com/next.html', 'Document', headers={'Purpose': 'prefetch'}))
+	assert not tracker.pending
+
+	await asyncio.wait_for(tracker.idle.wait(), timeout=1)
+
+
+async def test_idle_is_signalled_once_the_last_request_settles():
+	loop = asyncio.get_running_loop()
+	tracker = NetworkIdleTracker(idle_time=IDLE_TIME)
+	tracker.on_cdp_request(_request('1', 'https://example.com/app.js'))
+	tracker.on_cdp_request(_request('2', 'https://example.com/hero.png', resource_type='Image'))
+
+	await asyncio.sleep(IDLE_TIME * 2)
+	assert not tracker.idle.is_set()
+
+	tracker.on_cdp_response(_response('1'))
+	tracker.on_cdp_loading_failed({'requestId': '2'})
+	settled_at = loop.time()
+	await asyncio.wait_for(tracker.idle.wait(), timeout=1)
+	# no polling interval on top of the idle time
+	assert IDLE_TIME * 0.9 <= loop.time() - settled_at < IDLE_TIME + 0.04
+
+	# new activity re-arms the wait
+	tracker.on_cdp_request(_request('3', 'https://example.com/style.css', resource_type='Stylesheet'))
+	assert not tracker.idle.is_set()
+	tracker.close()
+
+
+class FakeCDPSession:
+	def __init__(self):
+		self.handlers = {}
+		self.sent = []
+		self.detached = False
+
+	def on(self, event, handler):
+		self.handlers[event] = handler
+
+	async def send(self, method, params=None):
+		self.sent.append(method)
+		return {}
+
+	def load_script(self, request_id):
+		# a script starts loading and finishes a bit later
+		self.handlers['Network.requestWillBeSent'](_request(request_id, 'https://example.com/app.js'))
+		asyncio.get_running_loop().call_later(IDLE_TIME, self.handlers['Network.responseReceived'], _response(request_id))
+
+	async def detach(self):
+		self.detached = True
+
+
+class FakeContext:
+	def __init__(self, cdp_session=None):
+		self.cdp_session = cdp_session
+
+	async def new_cdp_session(self, page):
+		if self.cdp_session is None:
+			raise RuntimeError('CDP is not supported')
+		return self.cdp_session
+
+
+class FakePage:
+	def __init__(self, context):
+		self.context = context
+		self.url = 'https://example.com/'
+		self.listeners = {}
+
+	def on(self, event, handler):
+		self.listeners[event] = handler
+
+	def remove_listener(self, event, handler):
+		assert self.listeners.pop(event) is handler
+
+	def is_closed(self):
+		return False
+
+
+def _session(monkeypatch, page, browser_context):
+	browser_session = BrowserSession(
+		browser_profile=BrowserProfile(wait_for_network_idle_page_load_time=IDLE_TIME, maximum_wait_page_load_time=1)
+	)
+	browser_session.browser_context = browser_context
+
+	async def get_current_page(self):
+		return page
+
+	monkeypatch.setattr(BrowserSession, 'get_current_page', get_current_page)
+	return browser_session
+
+
+async def test_waits_on_cdp_network_events(monkeypatch):
+	loop = asyncio.get_running_loop()
+	cdp_session = FakeCDPSession()
+	context = FakeContext(cdp_session)
+	page = FakePage(context)
+	browser_session = _session(monkeypatch, page, context)
+
+	# requests from before the wait don't count
+	await browser_session._cdp_sessions.get(page)  # type: ignore[arg-type]
+	await browser_session._cdp_sessions.add_attach_hook('network_idle', browser_session._track_network_events)
+	cdp_session.handlers['Network.requestWillBeSent'](_request('0', 'https://example.com/long-poll.js'))
+
+	for request_id in ('1', '2'):
+		started_at = loop.time()
+		waiting = asyncio.create_task(browser_session._wait_for_stable_network())
+		await asyncio.sleep(0)
+		cdp_session.load_script(request_id)
+		settle_time, timed_out = await waiting
+		assert loop.time() - started_at >= IDLE_TIME * 1.9
+		assert settle_time is not None and settle_time >= IDLE_TIME * 0.9 and not timed_out
+
+	# one long-lived, Network-enabled session for all the waits
+	assert cdp_session.sent == ['Network.enable'] and not cdp_session.detached
+	assert set(page.listeners) == {'close'}
+
+
+async def test_falls_back_to_page_events_without_cdp(monkeypatch):
+	context = FakeContext()
+	page = FakePage(context)
+	browser_session = _session(monkeypatch, page, context)
+
+	waiting = asyncio.create_task(browser_session._wait_for_stable_network())
+	await asyncio.sleep(IDLE_TIME / 5)
+	assert {'request', 'response', 'requestfailed'} <= set(page.listeners)
+
+	# nothing was requested, so there's no settle time to report
+	assert await asyncio.wait_for(waiting, timeout=1) == (None, False)
+	assert set(page.listeners) <= {'close'}
@@ -0,0 +1,150 @@
+"""
+Tests for the coalesced page responsiveness checks behind @require_healthy_browser.
+
+run with:
+python -m pytest tests/test_page_health.py
+"""
+
+import asyncio
+import logging
+
+from browser_use.browser.session import CDPSessionPool, PageHealthMonitor
+
+logger = logging.getLogger(__name__)
+
+
+class FakeCDPSession:
+	def __init__(self):
+		self.handlers = {}
+		self.sent = []
+
+	def on(self, event, handler):
+		self.handlers[event] = handler
+
+	async def send(self, method, params=None):
+		self.sent.append(method)
+		if method == 'Target.getTargetInfo':
+			return {'targetInfo': {'targetId': 'PAGE'}}
+		return {}
+
+
+class FakeContext:
+	def __init__(self):
+		self.cdp_session = FakeCDPSession()
+
+	async def new_cdp_session(self, page):
+		return self.cdp_session
+
+
+class FakePage:
+	url = 'https://example.com/'
+
+	def __init__(self, context=None):
+		self.context = context
+		self.handlers = {}
+		self.main_frame = object()
+
+	def on(self, event, handler):
+		self.handlers.setdefault(event, []).append(handler)
+
+	def emit(self, event, arg):
+		for handler in list(self.handlers.get(event, [])):
+			handler(arg)
+
+	def remove_listener(self, event, handler):
+		self.handlers[event].remove(handler)
+		if not self.handlers[event]:
+			del self.handlers[event]
+
+	def is_closed(self):
+		return False
+
+
+class Pinger:
+	def __init__(self, responsive=True, delay=0.0):
+		self.responsive = responsive
+		self.delay = delay
+		self.calls = 0
+
+	async def __call__(self, page):
+		self.calls += 1
+		await asyncio.sleep(self.delay)
+		return self.responsive
+
+
+async def test_recent_check_is_reused_within_ttl():
+	monitor, page, ping = PageHealthMonitor(), FakePage(), Pinger()
+	assert await monitor.check(page, ping, ttl=10)
+	assert await monitor.check(page, ping, ttl=10)
+	assert ping.calls == 1
+
+	# ttl=0 pings before every call, like before
+	assert await monitor.check(page, ping, ttl=0)
+	assert ping.calls == 2
+
+
+async def test_failed_checks_are_not_cached():
+	monitor, page, ping = PageHealthMonitor(), FakePage(), Pinger(responsive=False)
+	assert not await monitor.check(page, ping, ttl=10)
+	assert not await monitor.check(page, ping, ttl=10)
+	assert ping.calls == 2
+
+
+async def test_concurrent_checks_share_one_ping():
+	monitor, page, ping = PageHealthMonitor(), FakePage(), Pinger(delay=0.05)
+	results = await asyncio.gather(*(monitor.check(page, ping, ttl=0) for _ in range(5)))
+	assert results == [True] * 5
+	assert ping.calls == 1
+	assert not monitor.pings
+
+
+async def test_cdp_events_push_crashes_and_navigation_invalidates():
+	monitor, ping, context, cdp_sessions = PageHealthMonitor(), Pinger(), FakeContext(), CDPSessionPool()
+	page = FakePage(context)
+	monitor.watch(page, cdp_sessions, logger)  # type: ignore[arg-type]
+	monitor.watch(page, cdp_sessions, logger)  # type: ignore[arg-type]
+	await asyncio.gather(*monitor.background)
+	# subscribed on the page's pooled session, not one of its own
+	assert await cdp_sessions.get(page) is context.cdp_session  # type: ignore[arg-type]
+	assert context.cdp_session.sent == ['Target.getTargetInfo', 'Inspector.enable']
+	handlers = context.cdp_session.handlers
+
+	assert await monitor.check(page, ping, ttl=10)
+	# child targets detaching don't affect the page
+	handlers['Target.detachedFromTarget']({'sessionId': 'x', 'targetId': 'WORKER'})
+	assert await monitor.check(page, ping, ttl=10) and ping.calls == 1
+
+	# a crash is known immediately, without waiting for a ping to time out
+	handlers['Inspector.targetCrashed']({})
+	assert not await monitor.check(page, ping, ttl=10)
+	assert ping.calls == 1
+	handlers['Inspector.targetReloadedAfterCrash']({})
+	assert await monitor.check(page, ping, ttl=10) and ping.calls == 2
+
+	# navigating the main frame drops the cached result, subframes don't
+	page.emit('framenavigated', object())
+	assert await monitor.check(page, ping, ttl=10) and ping.calls == 2
+	page.emit('framenavigated', page.main_frame)
+	assert await monitor.check(page, ping, ttl=10) and ping.calls == 3
+
+	handlers['Target.detachedFromTarget']({'sessionId': 'y', 'targetId': 'PAGE'})
+	assert not await monitor.check(page, ping, ttl=10)
+
+	page.emit('close', page)
+	assert id(page) not in monitor.crashed and id(page) not in monitor.watched
+	assert not page.handlers
+
+
+async def test_clear_unsubscribes_from_pages():
+	monitor, cdp_sessions, context = PageHealthMonitor(), CDPSessionPool(), FakeContext()
+	page = FakePage(context)
+	monitor.watch(page, cdp_sessions, logger)  # type: ignore[arg-type]
+	await asyncio.gather(*monitor.background)
+	assert set(page.handlers) == {'close', 'framenavigated'}
+
+	monitor.clear()
+	cdp_sessions.clear()
+	assert not monitor.watched and not page.handlers
+
+	monitor.watch(page, cdp_sessions, logger)  # type: ignore[arg-type]
+	assert [len(handlers) for handlers in page.handlers.values()] == [1, 1]
@@ -0,0 +1,211 @@
+"""
+Tests for the resource blocking options of BrowserProfile.
+
+run with:
+python -m pytest tests/test_resource_blocking.py
+"""
+
+from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.browser.resource_blocking import (
+	AD_TRACKER_DOMAINS,
+	ResourceBlocker,
+	compile_domains,
+	domain_is_blocked,
+	load_domains_file,
+)
+
+
+class FakeFrame:
+	def __init__(self, parent_frame=None):
+		self.parent_frame = parent_frame
+
+
+class FakeRequest:
+	def __init__(self, url, resource_type='script', navigation=False, frame=None):
+		self.url = url
+		self.resource_type = resource_type
+		self.navigation = navigation
+		self.frame = frame or FakeFrame()
+
+	def is_navigation_request(self):
+		return self.navigation
+
+
+class FakeRoute:
+	def __init__(self, request):
+		self.request = request
+		self.outcome = None
+
+	async def abort(self, error_code=None):
+		self.outcome = 'aborted'
+
+	async def fallback(self):
+		self.outcome = 'continued'
+
+
+async def _route(blocker, request):
+	route = FakeRoute(request)
+	await blocker.handle_route(route)
+	return route.outcome
+
+
+def test_compiled_domains_cover_subdomains():
+	domains = compile_domains(['Ads.Example.com', '*.example.com', '.tracker.net', 'cdn.tracker.net', ''])
+	assert domains == {'example.com', 'tracker.net'}
+
+	assert domain_is_blocked('example.com', domains)
+	assert domain_is_blocked('a.b.ads.example.com', domains)
+	assert not domain_is_blocked('notexample.com', domains)
+	assert not domain_is_blocked('com', domains)
+
+
+def test_domains_file_accepts_hosts_format(tmp_path):
+	path = tmp_path / 'blocklist.txt'
+	path.write_text('# comment\n0.0.0.0 ads.example.com\n127.0.0.1 localhost\n\ntracker.net  # inline comment\n')
+	assert load_domains_file(path) == {'ads.example.com', 'tracker.net'}
+
+
+def test_presets():
+	assert ResourceBlocker.from_profile('off') is None
+
+	safe = ResourceBlocker.from_profile('safe', domains=['example.org'])
+	assert safe is not None and not safe.resource_types
+	assert safe.domains == AD_TRACKER_DOMAINS | {'example.org'}
+
+	lean = ResourceBlocker.from_profile('lean', resource_types=['image'])
+	assert lean is not None and lean.resource_types == {'media', 'font', 'image'}
+
+
+async def test_route_blocks_and_counts():
+	blocker = ResourceBlocker.from_profile('off', resource_types=['font'], domains=['doubleclick.net'])
+	assert blocker is not None
+
+	assert await _route(blocker, FakeRequest('https://securepubads.g.doubleclick.net/tag.js')) == 'aborted'
+	assert await _route(blocker, FakeRequest('https://fonts.example.com/a.woff2', 'font')) == 'aborted'
+	assert await _route(blocker, FakeRequest('https://example.com/app.js')) == 'continued'
+	assert await _route(blocker, FakeRequest('data:font/woff2;base64,AAAA', 'image')) == 'continued'
+
+	# navigating to a blocked domain is up to allowed_domains, its iframes are still blocked
+	assert await _route(blocker, FakeRequest('https://doubleclick.net/', 'document', navigation=True)) == 'continued'
+	iframe = FakeRequest('https://doubleclick.net/ad', 'document', navigation=True, frame=FakeFrame(FakeFrame()))
+	assert await _route(blocker, iframe) == 'aborted'
+
+	assert blocker.stats.blocked_requests == 3
+	assert blocker.stats.blocked_by_type == {'script': 1, 'font': 1, 'document': 1}
+	assert blocker.stats.estimated_bytes_saved > 0
+
+
+class FakeCDPSession:
+	def __init__(self):
+		self.handlers = {}
+		self.sent = []
+
+	def on(self, event, handler):
+		self.handlers[event] = handler
+
+	async def send(self, method, params=None):
+		self.sent.append((method, params))
+		if method == 'Page.getFrameTree':
+			return {'frameTree': {'frame': {'id': 'MAIN'}}}
+		return {}
+
+	async def pause(self, request_id, url, resource_type='Script', frame_id='MAIN'):
+		event = {'requestId': request_id, 'request': {'url': url}, 'resourceType': resource_type, 'frameId': frame_id}
+		await self.handlers['Fetch.requestPaused'](event)
+		method, params = self.sent[-1]
+		return 'aborted' if method == 'Fetch.failRequest' else 'continued'
+
+
+class FakePage:
+	def __init__(self, context):
+		self.context = context
+		self.url = 'about:blank'
+		self.handlers = {}
+
+	def on(self, event, handler):
+		self.handlers.setdefault(event, []).append(handler)
+
+	def remove_listener(self, event, handler):
+		self.handlers[event].remove(handler)
+
+
+class FakeContext:
+	def __init__(self, cdp=True):
+		self.cdp = cdp
+		self.cdp_sessions = []
+		self.routes = []
+		self.handlers = {}
+		self.pages = [FakePage(self)]
+
+	async def new_cdp_session(self, page):
+		if not self.cdp:
+			raise RuntimeError('CDP session is only available in Chromium')
+		self.cdp_sessions.append(FakeCDPSession())
+		return self.cdp_sessions[-1]
+
+	async def route(self, url, handler):
+		self.routes.append((url, handler))
+
+	def on(self, event, handler):
+		self.handlers[event] = handler
+
+
+async def test_only_blockable_requests_are_intercepted():
+	blocker = ResourceBlocker.from_profile('off', resource_types=['font', 'xhr'], domains=['doubleclick.net'])
+	assert blocker is not None
+	assert blocker.fetch_patterns() == [
+		{'urlPattern': '*', 'resourceType': 'Font'},
+		{'urlPattern': '*', 'resourceType': 'XHR'},
+		{'urlPattern': '*://doubleclick.net/*'},
+		{'urlPattern': '*://*.doubleclick.net/*'},
+	]
+
+	context = FakeContext()
+	cdp_session = await context.new_cdp_session(context.pages[0])
+	await blocker.attach(context.pages[0], cdp_session)
+	assert cdp_session.sent[-1] == ('Fetch.enable', {'patterns': blocker.fetch_patterns()})
+
+	assert await cdp_session.pause('1', 'https://securepubads.g.doubleclick.net/tag.js') == 'aborted'
+	assert await cdp_session.pause('2', 'https://fonts.example.com/a.woff2', 'Font') == 'aborted'
+	# the domain pattern also matches query strings, those requests are let through
+	assert await cdp_session.pause('3', 'https://example.com/?ref=https://doubleclick.net/x') == 'continued'
+	# top-level navigations are up to allowed_domains, iframes are still blocked
+	assert await cdp_session.pause('4', 'https://doubleclick.net/', 'Document') == 'continued'
+	assert await cdp_session.pause('5', 'https://doubleclick.net/ad', 'Document', frame_id='CHILD') == 'aborted'
+	assert blocker.stats.blocked_by_type == {'script': 1, 'font': 1, 'document': 1}
+
+
+async def test_session_blocks_over_cdp_and_falls_back_to_a_route():
+	browser_session = BrowserSession(browser_profile=BrowserProfile(resource_blocking='safe'))
+	assert browser_session.resource_blocking_stats is None
+	context = FakeContext()
+	browser_session.browser_context = context  # type: ignore[assignment]
+
+	await browser_session._setup_resource_blocking()
+	assert not context.routes and len(context.cdp_sessions) == 1
+	assert browser_session.resource_blocking_stats is not None
+	assert browser_session.resource_blocking_stats.blocked_requests == 0
+
+	# tabs opened later are attached too, on the pooled session the other CDP users share
+	new_page = FakePage(context)
+	await context.handlers['page'](new_page)
+	assert len(context.cdp_sessions) == 2
+	assert await browser_session._cdp_sessions.get(new_page) is context.cdp_sessions[1]  # type: ignore[arg-type]
+	assert context.cdp_sessions[1].sent[-1][0] == 'Fetch.enable'
+	assert len(context.cdp_sessions) == 2
+
+	# a re-attached session is intercepting again
+	browser_session._cdp_sessions.invalidate(new_page)  # type: ignore[arg-type]
+	await browser_session._cdp_sessions.get(new_page)  # type: ignore[arg-type]
+	assert context.cdp_sessions[2].sent[-1][0] == 'Fetch.enable'
+
+	# without CDP every request goes through a route
+	no_cdp_session = BrowserSession(browser_profile=BrowserProfile(resource_blocking='safe'))
+	no_cdp_session.browser_context = FakeContext(cdp=False)  # type: ignore[assignment]
+	await no_cdp_session._setup_resource_blocking()
+	assert [url for url, _ in no_cdp_session.browser_context.routes] == ['**/*']  # type: ignore[union-attr]
+
+	unblocked_session = BrowserSession(browser_profile=BrowserProfile())
+	unblocked_session.browser_context = FakeContext()  # type: ignore[assignment]
+	await unblocked_session._setup_resource_blocking()
+	assert not unblocked_session.browser_context.routes and not unblocked_session.browser_context.cdp_sessions  # type: ignore[union-attr]
@@ -0,0 +1,119 @@
+"""
+Tests for the perceptual comparison of consecutive screenshots.
+
+run with:
+python -m pytest tests/test_screenshot_diff.py
+"""
+
+import base64
+import io
+
+import pytest
+
+from browser_use.agent import prompts, screenshot_diff
+from browser_use.agent.message_manager.service import MessageManager
+from browser_use.agent.prompts import AgentMessagePrompt
+from browser_use.agent.screenshot_diff import UNCHANGED_SCREENSHOT_REGION, screenshots_look_same
+from browser_use.browser.views import BrowserStateSummary
+from browser_use.dom.views import DOMElementNode
+from browser_use.llm.messages import ContentPartImageParam, SystemMessage
+
+
+def _png(size=(640, 480), boxes=()):
+	pytest.importorskip('numpy')
+	Image = pytest.importorskip('PIL.Image')
+	ImageDraw = pytest.importorskip('PIL.ImageDraw')
+	image = Image.new('RGB', size, 'white')
+	draw = ImageDraw.Draw(image)
+	for box in boxes:
+		draw.rectangle(box, fill='black')
+	buffer = io.BytesIO()
+	image.save(buffer, format='PNG')
+	return base64.b64encode(buffer.getvalue()).decode()
+
+
+def _state(**kwargs):
+	tree = DOMElementNode(tag_name='body', xpath='/body', attributes={}, children=[], is_visible=True, parent=None)
+	return BrowserStateSummary(element_tree=tree, selector_map={}, url='https://example.com', title='', tabs=[], **kwargs)
+
+
+class FakeHistory:
+	def __init__(self, screenshots):
+		self._screenshots = screenshots
+
+	def screenshots(self, n_last=None, return_none_if_not_screenshot=True):
+		return self._screenshots[-n_last:]
+
+
+def _prompt(**kwargs):
+	state = _state()
+	return AgentMessagePrompt(browser_state_summary=state, file_system=None, **kwargs)  # type: ignore[arg-type]
+
+
+def test_only_identical_pixels_are_the_same_by_default():
+	page = _png(boxes=[(20, 20, 300, 60)])
+	with_dialog = _png(boxes=[(20, 20, 300, 60), (100, 150, 500, 400)])
+	# a single changed character, e.g. a counter going from 1 to 2
+	with_character = _png(boxes=[(20, 20, 300, 60), (600, 400, 605, 409)])
+
+	assert screenshots_look_same(page, _png(boxes=[(20, 20, 300, 60)]))
+	assert not screenshots_look_same(page, with_character)
+	assert not screenshots_look_same(page, with_dialog)
+	# a resized viewport is always a change, even with a region allowed
+	resized = _png(size=(800, 600), boxes=[(20, 20, 300, 60)])
+	assert not screenshots_look_same(page, resized, max_changed_region=UNCHANGED_SCREENSHOT_REGION)
+
+
+def test_changes_within_the_allowed_region_are_ignored():
+	page = _png(boxes=[(20, 20, 300, 60)])
+	with_caret = _png(boxes=[(20, 20, 300, 60), (320, 100, 321, 116)])
+	# two carets far apart don't fit one region even though few pixels changed
+	with_two_carets = _png(boxes=[(20, 20, 300, 60), (320, 100, 321, 116), (20, 400, 21, 416)])
+	with_dialog = _png(boxes=[(20, 20, 300, 60), (100, 150, 500, 400)])
+
+	assert not screenshots_look_same(page, with_caret)
+	assert screenshots_look_same(page, with_caret, max_changed_region=UNCHANGED_SCREENSHOT_REGION)
+	assert not screenshots_look_same(page, with_two_carets, max_changed_region=UNCHANGED_SCREENSHOT_REGION)
+	assert not screenshots_look_same(page, with_dialog, max_changed_region=UNCHANGED_SCREENSHOT_REGION)
+
+
+def test_falls_back_to_exact_comparison_without_numpy(monkeypatch):
+	monkeypatch.setattr(screenshot_diff, 'np', None)
+	assert screenshots_look_same('abc', 'abc')
+	assert not screenshots_look_same('abc', 'abd')
+
+
+def test_undecodable_screenshots_are_never_the_same():
+	pytest.importorskip('numpy')
+	pytest.importorskip('PIL')
+	assert not screenshots_look_same('bm90IGFuIGltYWdl', 'YWxzbyBub3QgYW4gaW1hZ2U=')
+
+
+def test_deduplication_keeps_the_most_recent_lookalike(monkeypatch):
+	monkeypatch.setattr(prompts, 'screenshots_look_same', lambda a, b: a.rstrip('*') == b.rstrip('*'))
+	deduplicated = _prompt()._deduplicate_screenshots(['a', 'a*', 'b', 'b*', 'a'])
+	assert deduplicated == ['a*', 'b*', 'a']
+
+
+def test_omitted_screenshot_is_noted():
+	assert 'Screenshot omitted' in _prompt(screen_unchanged=True)._get_browser_state_description()
+	assert 'Screenshot omitted' not in _prompt()._get_browser_state_description()
+
+
+def test_reused_screenshot_only_replaces_the_message_image():
+	previous = _png(boxes=[(20, 20, 300, 60)])
+	with_caret = _png(boxes=[(20, 20, 300, 60), (320, 100, 321, 116)])
+	state = _state(screenshot=with_caret)
+	message_manager = MessageManager(
+		task='task',
+		system_message=SystemMessage(content='system'),
+		file_system=None,  # type: ignore[arg-type]
+		unchanged_screenshots='reuse',
+	)
+	message_manager.add_state_message(state, agent_history_list=FakeHistory([previous]))  # type: ignore[arg-type]
+
+	message = message_manager.state.history.state_message
+	images = [part for part in message.content if isinstance(part, ContentPartImageParam)]  # type: ignore[union-attr]
+	assert [image.image_url.url for image in images] == [f'data:image/png;base64,{previous}']
+	# history and gif generation read the summary, it keeps the real screenshot
+	assert state.screenshot == with_caret
@@ -0,0 +1,83 @@
+"""
+Tests for the screenshot_* BrowserProfile options and how the screenshot format reaches the LLM serializers.
+
+run with:
+python -m pytest tests/test_screenshot_options.py
+"""
+
+import base64
+
+from browser_use.agent.prompts import AgentMessagePrompt
+from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.browser.views import BrowserStateSummary
+from browser_use.dom.views import DOMElementNode
+from browser_use.llm.anthropic.serializer import AnthropicMessageSerializer
+from browser_use.llm.google.serializer import GoogleMessageSerializer
+from browser_use.llm.messages import ContentPartImageParam, get_base64_image_media_type
+
+JPEG_B64 = base64.b64encode(b'\xff\xd8\xff\xe0' + b'\x00' * 16).decode()
+WEBP_B64 = base64.b64encode(b'RIFF\x00\x00\x00\x00WEBPVP8 ').decode()
+PNG_B64 = base64.b64encode(b'\x89PNG\r\n\x1a\n' + b'\x00' * 16).decode()
+
+LAYOUT_METRICS = {
+	'cssVisualViewport': {'pageX': 0, 'pageY': 300, 'clientWidth': 1280, 'clientHeight': 720},
+	'visualViewport': {'pageX': 0, 'pageY': 600, 'clientWidth': 2560, 'clientHeight': 1440},
+}
+
+
+class FakeCDPSessionPool:
+	async def send(self, page, method, params=None):
+		assert method == 'Page.getLayoutMetrics'
+		return LAYOUT_METRICS
+
+
+async def _params(**profile_kwargs):
+	browser_session = BrowserSession(browser_profile=BrowserProfile(**profile_kwargs))
+	browser_session._cdp_sessions = FakeCDPSessionPool()  # type: ignore[assignment]
+	return await browser_session._get_screenshot_params(page=None)  # type: ignore[arg-type]
+
+
+async def test_default_is_an_unclipped_png():
+	assert await _params() == {'captureBeyondViewport': False, 'fromSurface': True, 'format': 'png'}
+	# quality only applies to lossy formats
+	assert 'quality' not in await _params(screenshot_quality=50)
+	assert (await _params(screenshot_format='jpeg', screenshot_quality=50))['quality'] == 50
+
+
+async def test_max_dimension_downscales_in_device_pixels():
+	params = await _params(screenshot_format='webp', screenshot_max_dimension=1280)
+	# 1280 css px at devicePixelRatio=2 are 2560 device px, so halve them
+	assert params['clip'] == {'x': 0, 'y': 300, 'width': 1280, 'height': 720, 'scale': 0.5}
+
+	# never upscale
+	assert (await _params(screenshot_max_dimension=4000))['clip']['scale'] == 1.0
+
+
+async def test_clip_to_viewport():
+	params = await _params(screenshot_clip_to_viewport=True)
+	assert params['clip'] == {'x': 0, 'y': 300, 'width': 1280, 'height': 720, 'scale': 1.0}
+
+
+def test_media_type_detection():
+	assert get_base64_image_media_type(PNG_B64) == 'image/png'
+	assert get_base64_image_media_type(JPEG_B64) == 'image/jpeg'
+	assert get_base64_image_media_type(WEBP_B64) == 'image/webp'
+	assert get_base64_image_media_type('not an image') == 'image/png'
+
+
+def test_screenshot_format_reaches_the_serializers():
+	tree = DOMElementNode(tag_name='body', xpath='/body', attributes={}, children=[], is_visible=True, parent=None)
+	state = BrowserStateSummary(element_tree=tree, selector_map={}, url='https://example.com', title='', tabs=[])
+	message = AgentMessagePrompt(
+		browser_state_summary=state,
+		file_system=None,  # type: ignore[arg-type]
+		screenshots=[PNG_B64, JPEG_B64],
+	).get_user_message(use_vision=True)
+
+	images = [part for part in message.content if isinstance(part, ContentPartImageParam)]  # type: ignore[union-attr]
+	assert [image.image_url.media_type for image in images] == ['image/png', 'image/jpeg']
+	assert images[1].image_url.url.startswith('data:image/jpeg;base64,')
+
+	assert AnthropicMessageSerializer._serialize_content_part_image(images[1])['source']['media_type'] == 'image/jpeg'  # type: ignore[index]
+	contents, _ = GoogleMessageSerializer.serialize_messages([message])
+	assert [part.inline_data.mime_type for part in contents[0].parts if part.inline_data] == ['image/png', 'image/jpeg']  # type: ignore[union-attr]
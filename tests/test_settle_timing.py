@@ -0,0 +1,119 @@
+"""
+Tests for the per-origin page settle statistics behind BrowserProfile(adaptive_page_load_timing=True).
+
+run with:
+python -m pytest tests/test_settle_timing.py
+"""
+
+import json
+
+from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.browser.settle_timing import (
+	MAX_ADAPTIVE_WAIT,
+	MIN_SETTLE_SAMPLES,
+	SETTLE_SAMPLES_PER_ORIGIN,
+	PageSettleStore,
+	get_page_settle_store,
+)
+
+MINIMUM, MAXIMUM = 0.25, 5.0
+
+
+def test_waits_are_global_until_an_origin_has_history():
+	store = PageSettleStore()
+	for _ in range(MIN_SETTLE_SAMPLES - 1):
+		store.record('https://fast.example.com/page', 0.05)
+	assert store.waits_for('https://fast.example.com/other', MINIMUM, MAXIMUM) == (MINIMUM, MAXIMUM)
+
+	store.record('https://fast.example.com/page', 0.05)
+	# fast sites stop sleeping the fixed minimum, the maximum never drops below the profile's
+	assert store.waits_for('https://fast.example.com/other', MINIMUM, MAXIMUM) == (0.05, MAXIMUM)
+	# other origins are unaffected
+	assert store.waits_for('http://fast.example.com/', MINIMUM, MAXIMUM) == (MINIMUM, MAXIMUM)
+
+
+def test_slow_origins_get_more_time_than_the_global_maximum():
+	store = PageSettleStore()
+	for settle_time in [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]:
+		store.record('https://slow.example.com/', settle_time, timed_out=settle_time >= 9)
+	assert store.settle_percentile('https://slow.example.com/') == 9
+	assert store.waits_for('https://slow.example.com/', MINIMUM, MAXIMUM) == (MINIMUM, 18)
+
+	for _ in range(SETTLE_SAMPLES_PER_ORIGIN):
+		store.record('https://slow.example.com/', 60)
+	assert store.waits_for('https://slow.example.com/', MINIMUM, MAXIMUM)[1] == MAX_ADAPTIVE_WAIT
+	assert len(store.samples['https://slow.example.com']) == SETTLE_SAMPLES_PER_ORIGIN
+
+
+def test_origins_that_never_settle_keep_the_global_maximum():
+	store = PageSettleStore()
+	for _ in range(MIN_SETTLE_SAMPLES):
+		store.record('https://chat.example.com/', MAXIMUM, timed_out=True)
+	assert store.waits_for('https://chat.example.com/', MINIMUM, MAXIMUM) == (MINIMUM, MAXIMUM)
+
+
+async def test_store_round_trips_through_disk(tmp_path):
+	path = tmp_path / 'timings.json'
+	store = PageSettleStore.load(path)
+	store.record('https://Example.com/a', 1.5)
+	store.record('about:blank', 1.0)
+	await store.save()  # throttled
+	assert not path.exists()
+	await store.save(force=True)
+
+	assert json.loads(path.read_text()) == {'https://example.com': [[1.5, 0.0]]}
+	assert PageSettleStore.load(path).samples == store.samples
+	path.write_text('not json')
+	assert PageSettleStore.load(path).samples == {}
+
+
+async def test_store_is_in_memory_unless_a_path_is_set(tmp_path, monkeypatch):
+	monkeypatch.chdir(tmp_path)
+	store = get_page_settle_store()
+	assert store is get_page_settle_store(None) and store.path is None
+	store.record('https://example.com/', 1.0)
+	await store.save(force=True)
+	assert not list(tmp_path.iterdir())
+
+	browser_session = BrowserSession(browser_profile=BrowserProfile(adaptive_page_load_timing=True))
+	assert browser_session._get_page_settle_store() is store
+
+
+async def test_session_adapts_the_page_load_waits(tmp_path, monkeypatch):
+	path = tmp_path / 'timings.json'
+	store = get_page_settle_store(path)
+	for _ in range(MIN_SETTLE_SAMPLES):
+		store.record('https://example.com/', 0.02)
+
+	class FakePage:
+		url = 'https://example.com/'
+
+	async def get_current_page(self):
+		return FakePage()
+
+	waits = []
+	settle_times = [0.01, None]
+
+	async def wait_for_stable_network(self, maximum_wait=None):
+		waits.append(maximum_wait)
+		return settle_times[len(waits) - 1], False
+
+	async def check_and_handle_navigation(self, page):
+		pass
+
+	monkeypatch.setattr(BrowserSession, 'get_current_page', get_current_page)
+	monkeypatch.setattr(BrowserSession, '_wait_for_stable_network', wait_for_stable_network)
+	monkeypatch.setattr(BrowserSession, '_check_and_handle_navigation', check_and_handle_navigation)
+
+	browser_session = BrowserSession(
+		browser_profile=BrowserProfile(adaptive_page_load_timing=True, page_load_timing_path=path, minimum_wait_page_load_time=10)
+	)
+	# finishes in far less than the 10s fixed minimum
+	await browser_session._wait_for_page_and_frames_load()
+	assert waits == [MAXIMUM]
+	assert store.samples['https://example.com'][-1] == [0.01, 0.0]
+
+	# nothing was loading during the next wait (e.g. a click that didn't navigate), that's no sample
+	samples = len(store.samples['https://example.com'])
+	await browser_session._wait_for_page_and_frames_load()
+	assert len(store.samples['https://example.com']) == samples
@@ -0,0 +1,120 @@
+"""
+Tests for SharedBrowser, many BrowserSessions with isolated contexts in one browser process.
+
+run with:
+python -m pytest tests/test_shared_browser.py
+"""
+
+import asyncio
+
+from browser_use.browser import BrowserProfile, BrowserSession, SharedBrowser
+
+
+class FakeContext:
+	def __init__(self, browser):
+		self.browser = browser
+		self.handlers = {}
+		self.pages = []
+		self.closed = False
+
+	def on(self, event, handler):
+		self.handlers[event] = handler
+
+	async def close(self):
+		self.closed = True
+		self.handlers['close'](self)
+
+
+class FakeBrowser:
+	def __init__(self):
+		self.handlers = {}
+		self.connected = True
+		self.contexts = []
+
+	def is_connected(self):
+		return self.connected
+
+	def on(self, event, handler):
+		self.handlers[event] = handler
+
+	async def new_context(self, **kwargs):
+		await asyncio.sleep(0.01)
+		context = FakeContext(self)
+		self.contexts.append(context)
+		return context
+
+	async def close(self):
+		self.crash()
+
+	def crash(self):
+		self.connected = False
+		self.handlers['disconnected'](self)
+
+
+class FakeChromium:
+	def __init__(self):
+		self.launched = []
+
+	async def launch(self, **kwargs):
+		await asyncio.sleep(0.01)
+		browser = FakeBrowser()
+		self.launched.append(browser)
+		return browser
+
+
+class FakePlaywright:
+	def __init__(self):
+		self.chromium = FakeChromium()
+
+
+async def test_contexts_are_spread_over_shards():
+	playwright, shared_browser = FakePlaywright(), SharedBrowser(max_contexts_per_browser=2)
+	opened = await asyncio.gather(*(shared_browser.new_context(playwright, BrowserProfile()) for _ in range(3)))  # type: ignore[arg-type]
+
+	assert len(playwright.chromium.launched) == 2
+	assert sorted(len(browser.contexts) for browser in playwright.chromium.launched) == [1, 2]
+	assert len({context for _, context in opened}) == 3
+	assert shared_browser.contexts_in_use == 3
+
+	# idle extra browsers are closed, the last one is kept warm
+	for _, context in opened:
+		await context.close()
+	await asyncio.sleep(0)
+	assert len(shared_browser.shards) == 1
+	assert [browser.is_connected() for browser in playwright.chromium.launched].count(True) == 1
+
+	await shared_browser.close()
+	assert not any(browser.is_connected() for browser in playwright.chromium.launched)
+
+
+async def test_crashed_browser_is_replaced():
+	playwright, shared_browser = FakePlaywright(), SharedBrowser()
+	first_browser, _ = await shared_browser.new_context(playwright, BrowserProfile())  # type: ignore[arg-type]
+	first_browser.crash()
+	assert not shared_browser.shards
+
+	second_browser, _ = await shared_browser.new_context(playwright, BrowserProfile())  # type: ignore[arg-type]
+	assert second_browser is not first_browser
+	assert len(shared_browser.shards) == 1
+
+
+async def test_stop_only_closes_the_sessions_own_context():
+	playwright, shared_browser = FakePlaywright(), SharedBrowser()
+	sessions = [BrowserSession(shared_browser=shared_browser) for _ in range(2)]
+	for browser_session in sessions:
+		browser_session.playwright = playwright  # type: ignore[assignment]
+		await browser_session.setup_browser_via_shared_browser()
+	browser = sessions[0].browser
+	assert browser is sessions[1].browser
+	first_context = sessions[0].browser_context
+
+	await sessions[0].stop()
+	assert first_context.closed  # type: ignore[union-attr]
+	assert browser.is_connected()  # type: ignore[union-attr]
+	assert not sessions[1].browser_context.closed  # type: ignore[union-attr]
+	assert shared_browser.contexts_in_use == 1
+
+	# keep_alive applies to the session's context only
+	sessions[1].browser_profile.keep_alive = True
+	await sessions[1].stop()
+	assert not sessions[1].browser_context.closed  # type: ignore[union-attr]
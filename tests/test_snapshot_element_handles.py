@@ -0,0 +1,144 @@
+"""
+Tests for resolving the elements of the current DOM snapshot without CSS selectors.
+
+run with:
+python -m pytest tests/test_snapshot_element_handles.py
+"""
+
+from browser_use.browser import BrowserSession
+from browser_use.browser.session import REGISTER_SNAPSHOT_ELEMENT_JS, RESOLVE_SNAPSHOT_ELEMENT_JS
+from browser_use.browser.views import BrowserStateSummary
+from browser_use.dom.views import DOMElementNode
+
+
+class FakeElementHandle:
+	def __init__(self):
+		self.connected = True
+		self.evaluations = 0
+
+	async def evaluate(self, expression):
+		self.evaluations += 1
+		return self.connected
+
+
+class FakeJSHandle:
+	def __init__(self, element):
+		self.element = element
+
+	def as_element(self):
+		return self.element
+
+
+class FakePage:
+	def __init__(self):
+		self.registry = {}  # highlight index -> handle, what window.__browserUseElements holds for the current token
+		self.lookups = []
+
+	async def evaluate_handle(self, expression, arg):
+		assert expression == RESOLVE_SNAPSHOT_ELEMENT_JS
+		self.lookups.append(arg)
+		_, index, _ = arg
+		return FakeJSHandle(self.registry.get(index))
+
+
+class FakeCDPSessionPool:
+	def __init__(self, page):
+		self.page = page
+		self.sent = []
+
+	async def send(self, page, method, params=None):
+		self.sent.append((method, params))
+		if method == 'DOM.resolveNode':
+			return {'object': {'objectId': f'node-{params["backendNodeId"]}'}}
+		assert params['functionDeclaration'] == REGISTER_SNAPSHOT_ELEMENT_JS
+		index = params['arguments'][1]['value']
+		page.registry[index] = FakeElementHandle()
+		return {}
+
+
+def _element(tag_name, parent, index=None, **kwargs):
+	element = DOMElementNode(
+		tag_name=tag_name,
+		xpath=tag_name,
+		attributes={},
+		children=[],
+		is_visible=True,
+		parent=parent,
+		highlight_index=index,
+		**kwargs,
+	)
+	if parent is not None:
+		parent.children.append(element)
+	return element
+
+
+def _session(page, root, selector_map):
+	browser_session = BrowserSession()
+	browser_session._cached_browser_state_summary = BrowserStateSummary(
+		element_tree=root, selector_map=selector_map, url='https://example.com', title='', tabs=[]
+	)
+	browser_session._snapshot_elements.reset(page)  # type: ignore[arg-type]
+	return browser_session
+
+
+async def test_registry_lookup_then_cached_handle():
+	page = FakePage()
+	root = _element('body', None)
+	button = _element('button', root, 0)
+	iframe = _element('iframe', root)
+	frame_input = _element('input', _element('body', iframe), 1)
+	browser_session = _session(page, root, {0: button, 1: frame_input})
+	page.registry[0] = FakeElementHandle()
+
+	handle = await browser_session._get_snapshot_element_handle(page, button)  # type: ignore[arg-type]
+	assert handle is page.registry[0]
+	assert page.lookups == [[browser_session._snapshot_elements.token, 0, 'button']]
+
+	# the second resolution reuses the handle, only checking it's still attached (and scrolling to it)
+	assert await browser_session._get_snapshot_element_handle(page, button) is handle  # type: ignore[arg-type]
+	assert len(page.lookups) == 1 and handle.evaluations == 1  # type: ignore[union-attr]
+
+	# detached elements and elements inside iframes are left to the selector fallback
+	handle.connected = False  # type: ignore[union-attr]
+	assert await browser_session._get_snapshot_element_handle(page, button) is None  # type: ignore[arg-type]
+	assert await browser_session._get_snapshot_element_handle(page, frame_input) is None  # type: ignore[arg-type]
+	assert len(page.lookups) == 1
+
+
+async def test_elements_of_other_snapshots_are_not_resolved():
+	page = FakePage()
+	root = _element('body', None)
+	button = _element('button', root, 0)
+	browser_session = _session(page, root, {0: button})
+	page.registry[0] = FakeElementHandle()
+	first_token = browser_session._snapshot_elements.token
+
+	# an element with the same index from an older snapshot
+	stale_button = _element('button', _element('body', None), 0)
+	assert await browser_session._get_snapshot_element_handle(page, stale_button) is None  # type: ignore[arg-type]
+	# another page than the one the snapshot was taken on
+	assert await browser_session._get_snapshot_element_handle(FakePage(), button) is None  # type: ignore[arg-type]
+	assert not page.lookups
+
+	await browser_session._get_snapshot_element_handle(page, button)  # type: ignore[arg-type]
+	assert browser_session._snapshot_elements.reset(page) != first_token  # type: ignore[arg-type]
+	assert not browser_session._snapshot_elements.handles
+
+
+async def test_backend_node_ids_are_resolved_over_cdp():
+	page = FakePage()
+	root = _element('body', None, frame_id='MAIN')
+	button = _element('button', root, 0, backend_node_id=42, frame_id='MAIN')
+	frame_input = _element('input', _element('iframe', root, frame_id='MAIN'), 1, backend_node_id=43, frame_id='FRAME')
+	browser_session = _session(page, root, {0: button, 1: frame_input})
+	cdp_sessions = FakeCDPSessionPool(page)
+	browser_session._cdp_sessions = cdp_sessions  # type: ignore[assignment]
+
+	handle = await browser_session._get_snapshot_element_handle(page, button)  # type: ignore[arg-type]
+	assert handle is page.registry[0]
+	assert [method for method, _ in cdp_sessions.sent] == ['DOM.resolveNode', 'Runtime.callFunctionOn']
+	assert cdp_sessions.sent[0][1] == {'backendNodeId': 42}
+	assert cdp_sessions.sent[1][1]['objectId'] == 'node-42'
+
+	assert await browser_session._get_snapshot_element_handle(page, frame_input) is None  # type: ignore[arg-type]
+	assert len(cdp_sessions.sent) == 2
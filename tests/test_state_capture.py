@@ -0,0 +1,154 @@
+"""
+Tests for the concurrent state capture pipeline in BrowserSession._get_updated_state.
+
+run with:
+python -m pytest tests/test_state_capture.py
+"""
+
+import asyncio
+
+import pytest
+
+from browser_use.browser import BrowserSession
+from browser_use.browser.session import STATE_PROBE_JS
+from browser_use.browser.views import BrowserError, StateCaptureSpec, TabInfo
+from browser_use.dom.service import DomService
+from browser_use.dom.views import DOMElementNode, DOMState
+
+PAGE_STATE = {
+	'viewport_width': 1280,
+	'viewport_height': 720,
+	'page_width': 1280,
+	'page_height': 3000,
+	'scroll_x': 0,
+	'scroll_y': 500.5,
+	'document_height': 2800,
+	'title': 'Example Domain',
+	'is_pdf': False,
+}
+
+
+class FakePage:
+	url = 'https://example.com/'
+
+	def __init__(self, page_state=None):
+		self.page_state = page_state
+		self.evaluated: list[str] = []
+
+	async def evaluate(self, script, *args):
+		self.evaluated.append(script)
+		if self.page_state is None:
+			raise RuntimeError('Target page, context or browser has been closed')
+		return self.page_state
+
+
+@pytest.fixture
+def session(monkeypatch):
+	events: list[str] = []
+	dom_started = asyncio.Event()
+	tabs_done = asyncio.Event()
+
+	async def get_clickable_elements(self, **kwargs):
+		events.append('dom start')
+		dom_started.set()
+		# the tabs stage runs alongside the DOM extraction instead of after it
+		await asyncio.wait_for(tabs_done.wait(), timeout=1)
+		events.append('dom end')
+		tree = DOMElementNode(tag_name='body', xpath='/body', attributes={}, children=[], is_visible=True, parent=None)
+		button = DOMElementNode(tag_name='button', xpath='body/button', attributes={}, children=[], is_visible=True, parent=tree)
+		tree.children.append(button)
+		return DOMState(element_tree=tree, selector_map={0: button})
+
+	async def get_tabs_info(self):
+		await asyncio.wait_for(dom_started.wait(), timeout=1)
+		events.append('tabs')
+		tabs_done.set()
+		return [TabInfo(page_id=0, url=FakePage.url, title='Example Domain')]
+
+	async def take_screenshot(self, full_page=False):
+		events.append('screenshot')
+		return 'c2NyZWVuc2hvdA=='
+
+	monkeypatch.setattr(DomService, 'get_clickable_elements', get_clickable_elements)
+	monkeypatch.setattr(BrowserSession, 'get_tabs_info', get_tabs_info)
+	monkeypatch.setattr(BrowserSession, 'take_screenshot', take_screenshot)
+
+	browser_session = BrowserSession()
+	browser_session._events = events  # type: ignore[attr-defined]
+	return browser_session
+
+
+def _use_page(monkeypatch, page):
+	async def get_current_page(self):
+		return page
+
+	monkeypatch.setattr(BrowserSession, 'get_current_page', get_current_page)
+
+
+async def test_stages_run_concurrently_with_a_single_probe(session, monkeypatch):
+	page = FakePage(PAGE_STATE)
+	_use_page(monkeypatch, page)
+
+	state = await session._get_updated_state()
+
+	# accessibility check, highlight removal, page info, scroll info, title and PDF detection in one round trip
+	assert page.evaluated == [STATE_PROBE_JS]
+	assert session._events == ['dom start', 'tabs', 'dom end', 'screenshot']
+
+	assert state.title == 'Example Domain'
+	assert state.screenshot == 'c2NyZWVuc2hvdA=='
+	assert [tab.title for tab in state.tabs] == ['Example Domain']
+	assert list(state.selector_map) == [0]
+	assert state.page_info is not None
+	assert (state.page_info.scroll_y, state.page_info.pixels_below) == (500, 3000 - 500 - 720)
+	assert (state.pixels_above, state.pixels_below) == (500, int(2800 - 500.5 - 720))
+	assert set(state.capture_timings) == {'probe', 'dom', 'screenshot', 'tabs', 'pdf', 'total'}
+	assert state.capture_timings['total'] >= state.capture_timings['dom']
+
+
+async def test_pdf_download_reuses_probe_result(session, monkeypatch):
+	page = FakePage({**PAGE_STATE, 'is_pdf': True})
+	_use_page(monkeypatch, page)
+	seen = []
+
+	async def auto_download_pdf_if_needed(self, page, is_pdf_viewer=None):
+		seen.append(is_pdf_viewer)
+		return None
+
+	monkeypatch.setattr(BrowserSession, '_auto_download_pdf_if_needed', auto_download_pdf_if_needed)
+
+	await session._get_updated_state()
+	assert seen == [True]
+	assert page.evaluated == [STATE_PROBE_JS]
+
+
+async def test_inaccessible_page_raises(session, monkeypatch):
+	_use_page(monkeypatch, FakePage(None))
+	with pytest.raises(BrowserError, match='Page is not accessible'):
+		await session._get_updated_state()
+	assert session._events == []
+
+
+async def test_capture_spec_skips_unused_stages(session, monkeypatch):
+	_use_page(monkeypatch, FakePage(PAGE_STATE))
+	highlight_flags = []
+
+	async def get_clickable_elements(self, **kwargs):
+		highlight_flags.append(kwargs['highlight_elements'])
+		tree = DOMElementNode(tag_name='body', xpath='/body', attributes={}, children=[], is_visible=True, parent=None)
+		return DOMState(element_tree=tree, selector_map={})
+
+	async def get_tabs_info(self):
+		raise AssertionError('tabs were not requested')
+
+	monkeypatch.setattr(DomService, 'get_clickable_elements', get_clickable_elements)
+	monkeypatch.setattr(BrowserSession, 'get_tabs_info', get_tabs_info)
+
+	state = await session._get_updated_state(
+		capture=StateCaptureSpec(screenshot=False, highlights=False, tabs=False, page_info=False)
+	)
+
+	assert highlight_flags == [False]
+	assert 'screenshot' not in session._events
+	assert state.screenshot is None and state.tabs == [] and state.page_info is None
+	assert set(state.capture_timings) == {'probe', 'dom', 'pdf', 'total'}
@@ -0,0 +1,158 @@
+"""
+Tests for the event-maintained tab titles behind BrowserSession.get_tabs_info.
+
+run with:
+python -m pytest tests/test_tab_cache.py
+"""
+
+import asyncio
+import time
+
+from browser_use.browser import BrowserSession
+from browser_use.browser.session import TabInfoCache
+
+
+class FakePage:
+	def __init__(self, url='https://example.com/', title='Example', delay=0.0, responsive=True):
+		self.url = url
+		self._title = title
+		self.delay = delay
+		self.responsive = responsive
+		self.handlers = {}
+		self.main_frame = object()
+		self.title_calls = 0
+		self.closed = False
+		self.context = None
+
+	def on(self, event, handler):
+		self.handlers.setdefault(event, []).append(handler)
+
+	def remove_listener(self, event, handler):
+		self.handlers[event].remove(handler)
+
+	def emit(self, event, payload=None):
+		for handler in self.handlers.get(event, []):
+			handler(payload if payload is not None else self)
+
+	def is_closed(self):
+		return self.closed
+
+	async def title(self):
+		self.title_calls += 1
+		await asyncio.sleep(self.delay)
+		return self._title
+
+	async def evaluate(self, expression):
+		if not self.responsive:
+			await asyncio.sleep(60)
+		return 1
+
+	async def close(self):
+		self.closed = True
+		if self.context is not None:
+			self.context.pages.remove(self)
+		self.emit('close')
+
+
+class FakeContext:
+	def __init__(self, pages):
+		self.pages = pages
+		for page in pages:
+			page.context = self
+
+
+def _session(pages):
+	browser_session = BrowserSession()
+	browser_session.initialized = True
+	browser_session.browser_context = FakeContext(pages)  # type: ignore[assignment]
+	browser_session.agent_current_page = pages[0]
+	return browser_session
+
+
+async def test_events_keep_titles_fresh():
+	cache, page = TabInfoCache(), FakePage()
+	cache.watch(page)
+	cache.watch(page)
+	assert len(page.handlers['load']) == 1
+
+	assert cache.cached_title(page, max_age=30) is None
+	page.emit('load')
+	await asyncio.sleep(0.01)
+	assert cache.cached_title(page, max_age=30) == 'Example'
+
+	# a main frame navigation drops the entry, a subframe one doesn't
+	page.emit('framenavigated', object())
+	assert cache.cached_title(page, max_age=30) == 'Example'
+	page.emit('framenavigated', page.main_frame)
+	assert cache.cached_title(page, max_age=30) is None
+
+	# entries are only valid for the url they were read on
+	cache.update(page, 'Example')
+	page.url = 'https://example.com/other'
+	assert cache.cached_title(page, max_age=30) is None
+
+	page.emit('close')
+	assert id(page) not in cache.watched
+	assert not any(page.handlers.values())
+
+
+async def test_clear_unsubscribes_from_pages():
+	cache, page = TabInfoCache(), FakePage()
+	cache.watch(page)
+	# a reconnect clears the cache and watches the same pages again
+	cache.clear()
+	assert not any(page.handlers.values())
+	cache.watch(page)
+	assert all(len(handlers) == 1 for handlers in page.handlers.values())
+
+
+async def test_concurrent_refreshes_share_one_probe():
+	cache, page = TabInfoCache(), FakePage(delay=0.05)
+	titles = await asyncio.gather(*(cache.refresh(page) for _ in range(5)))
+	assert titles == ['Example'] * 5
+	assert page.title_calls == 1
+
+
+async def test_stale_tabs_are_probed_in_parallel():
+	pages = [FakePage(url=f'https://example.com/{i}', title=f'Tab {i}', delay=0.2) for i in range(10)]
+	browser_session = _session(pages)
+
+	start = time.monotonic()
+	tabs = await browser_session.get_tabs_info()
+	assert time.monotonic() - start < 1.0
+	assert [tab.title for tab in tabs] == [f'Tab {i}' for i in range(10)]
+
+	# the second call is served from the cache
+	tabs = await browser_session.get_tabs_info()
+	assert [tab.title for tab in tabs] == [f'Tab {i}' for i in range(10)]
+	assert all(page.title_calls == 1 for page in pages)
+
+
+async def test_unresponsive_tabs_are_closed_before_the_next_list():
+	alive = FakePage()
+	hung = FakePage(url='https://hung.example.com/', delay=60, responsive=False)
+	blank = FakePage(url='about:blank', delay=60)
+	browser_session = _session([alive, hung, blank])
+
+	async def is_page_responsive(page, timeout=5.0):
+		return page.responsive
+
+	browser_session._is_page_responsive = is_page_responsive  # type: ignore[method-assign]
+	browser_session._tab_cache.probe_timeout = 0.05
+	tabs = await browser_session.get_tabs_info()
+
+	# the hung tab is still listed with its real url, and stays open while the LLM uses this list's page_ids
+	assert [(tab.url, tab.title) for tab in tabs] == [
+		('https://example.com/', 'Example'),
+		('https://hung.example.com/', '(title unavailable, page possibly crashed / unresponsive)'),
+		('about:blank', 'ignore this tab and do not use it'),
+	]
+	await asyncio.sleep(0.05)
+	assert not hung.closed
+	assert list(browser_session._tab_cache.unresponsive.values()) == [hung]
+
+	# the next list is built without it
+	tabs = await browser_session.get_tabs_info()
+	assert hung.closed and not browser_session._tab_cache.unresponsive
+	assert [tab.url for tab in tabs] == ['https://example.com/', 'about:blank']
+	assert not alive.closed and not blank.closed